@@ -0,0 +1,275 @@
+import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from api_client.json_decoder import Json_Decoder
+from api_client.rate_limiter import Rate_Limit_Registry
+from instrumentation.instrumentation import Instrumentation
+from instrumentation.metrics import Metrics_Registry
+
+if TYPE_CHECKING:
+    # кэш ответов (и с ним sqlite3) загружается при создании общего клиента, см. get_shared
+    from api_client.response_cache import Response_Cache
+
+
+class API_Client:
+    """
+    HTTP-клиент для обращения к API сайтов (hh.ru, ЦБР).
+
+    Использует одну сессию requests.Session с пулом постоянных соединений (keep-alive),
+    поэтому повторные запросы к одному и тому же хосту не открывают новое TCP/TLS соединение.
+    Повторяет запрос с экспоненциальной задержкой и случайным разбросом (jitter)
+    при сетевых ошибках и ответах 429/5xx, учитывая заголовок Retry-After.
+    Каждая попытка запроса проходит через общий реестр ограничителей частоты (Rate_Limit_Registry),
+    который не даёт превысить лимиты хоста и бюджет запросов на один запуск.
+    Длительность и код ответа каждой попытки записываются в метрики (Metrics_Registry),
+    повторы записываются в журнал.
+
+    Если передан кэш ответов, актуальные ответы берутся из него без обращения к сети.
+    В автономном режиме (offline) ответы берутся только из кэша независимо от срока их жизни
+    """
+
+    # коды ответа, при получении которых запрос будет повторён
+    retry_statuses = (429, 500, 502, 503, 504)
+
+    # заголовки, которые отправляются с каждым запросом
+    headers = {"User-Agent": "Job_Parser_DB/0.1"}
+
+    # переменная окружения, при значении "1" общий клиент работает в автономном режиме
+    offline_variable = "JOB_PARSER_OFFLINE"
+
+    # журнал клиента
+    logger = Instrumentation.get_logger("api_client")
+
+    # общий для всей программы объект клиента
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self,
+                 pool_size: int = 10,
+                 timeout: float | tuple[float, float] = (5, 30),
+                 max_retries: int = 5,
+                 backoff_base: float = 0.5,
+                 backoff_max: float = 30,
+                 cache: "Response_Cache | None" = None,
+                 offline: bool = False,
+                 limits: Rate_Limit_Registry | None = None) -> None:
+        """
+        Инициализатор объектов класса, создаёт сессию с пулом соединений
+
+        :param pool_size: максимальное количество постоянных соединений с одним хостом
+        :param timeout: время ожидания ответа в секундах, можно передать кортеж (подключение, чтение)
+        :param max_retries: максимальное количество повторных попыток запроса
+        :param backoff_base: начальная задержка перед повтором в секундах, удваивается с каждой попыткой
+        :param backoff_max: максимальная задержка перед повтором в секундах
+        :param cache: кэш ответов, по умолчанию ответы не кэшируются
+        :param offline: автономный режим, ответы берутся только из кэша
+        :param limits: реестр ограничителей частоты запросов, по умолчанию общий для всей программы
+        """
+
+        if offline and cache is None:
+            raise ValueError("Автономный режим работы возможен только с кэшем ответов")
+
+        self.cache = cache
+        self.offline = offline
+        self.limits = limits or Rate_Limit_Registry.get_shared()
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    @classmethod
+    def get_shared(cls) -> "API_Client":
+        """
+        Возвращает общий для всей программы объект клиента с кэшем ответов,
+        создавая его при первом обращении
+        """
+
+        with cls._shared_lock:
+            if cls._shared is None:
+                from api_client.response_cache import Response_Cache
+
+                cls._shared = cls(cache=Response_Cache(), offline=os.environ.get(cls.offline_variable) == "1")
+            return cls._shared
+
+    def get_json(self, url: str, parameters: None | dict = None) -> list[dict] | dict:
+        """
+        Отправляет GET-запрос и возвращает тело ответа, преобразованное из формата JSON
+        (тело разбирается из байтов самой быстрой из установленных библиотек, см. Json_Decoder).
+
+        Ответы с кодами, при которых запрос не повторяется (например, 404), возвращаются как есть,
+        чтобы вызывающий код мог обработать описание ошибки из тела ответа
+
+        :param url: ссылка на ресурс
+        :param parameters: параметры запроса
+
+        :raises requests.RequestException: если все попытки запроса завершились ошибкой
+        """
+
+        return Json_Decoder.loads(self.get_content(url, parameters))
+
+    def get_content(self, url: str, parameters: None | dict = None) -> bytes:
+        """
+        Отправляет GET-запрос и возвращает тело ответа в байтах без преобразования,
+        например для разбора сразу в типизированные структуры (HH_Decoder)
+
+        :param url: ссылка на ресурс
+        :param parameters: параметры запроса
+
+        :raises requests.RequestException: если все попытки запроса завершились ошибкой
+        """
+
+        return self.get(url, parameters).content
+
+    def get(self, url: str, parameters: None | dict = None) -> requests.Response:
+        """
+        Отправляет GET-запрос и возвращает объект ответа.
+        Если в кэше есть актуальный ответ, запрос не отправляется;
+        если ответ устарел, сервер проверяет его актуальность по ETag / Last-Modified
+
+        :param url: ссылка на ресурс
+        :param parameters: параметры запроса
+
+        :raises requests.RequestException: если все попытки запроса завершились ошибкой
+                                           или в автономном режиме ответа нет в кэше
+        """
+
+        if self.cache is None:
+            return self._send(url, parameters)
+
+        key = self.cache.make_key(url, parameters)
+        cached = self.cache.get(key)
+
+        if cached is not None:
+            cached_response, is_fresh = cached
+            if is_fresh or self.offline:
+                self.cache.record("hits", len(cached_response.content))
+                return cached_response
+
+        if self.offline:
+            raise requests.ConnectionError(f"Автономный режим: ответ на запрос {key} отсутствует в кэше")
+
+        headers = self.cache.get_conditional_headers(cached[0]) if cached else None
+        response = self._send(url, parameters, headers)
+
+        if response.status_code == 304 and cached:
+            self.cache.refresh(key)
+            self.cache.record("revalidated", len(cached[0].content))
+            return cached[0]
+
+        self.cache.record("misses")
+        if response.status_code == 200:
+            self.cache.store(key, response)
+
+        return response
+
+    def _send(self, url: str, parameters: None | dict = None, headers: None | dict = None) -> requests.Response:
+        """
+        Отправляет GET-запрос с повторами и возвращает объект ответа
+
+        :param url: ссылка на ресурс
+        :param parameters: параметры запроса
+        :param headers: дополнительные заголовки запроса
+
+        :raises requests.RequestException: если все попытки запроса завершились ошибкой
+                                           или исчерпан бюджет запросов (Request_Budget_Exceeded)
+        """
+
+        attempt = 0
+
+        while True:
+            self.limits.acquire(url)
+            start = time.perf_counter()
+            try:
+                response = self.session.get(url, params=parameters, headers=headers, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout) as error:
+                self.record_request(url, "error", time.perf_counter() - start)
+                if attempt >= self.max_retries:
+                    raise
+                delay = self._get_backoff(attempt)
+                self.logger.warning("Повтор запроса %s через %.2f с: %s", url, delay, error)
+            else:
+                self.record_request(url, response.status_code, time.perf_counter() - start)
+                delay = self._get_retry_after(response)
+                self.limits.report(url, response.status_code, delay)
+
+                if response.status_code not in self.retry_statuses:
+                    return response
+                if attempt >= self.max_retries:
+                    response.raise_for_status()
+                if delay is None:
+                    delay = self._get_backoff(attempt)
+                self.logger.warning("Повтор запроса %s через %.2f с: ответ %s", url, delay, response.status_code)
+                response.close()
+
+            attempt += 1
+            time.sleep(delay)
+
+    def close(self) -> None:
+        """Закрывает сессию и все открытые соединения"""
+
+        self.session.close()
+
+    @staticmethod
+    def record_request(url: str, status: int | str, seconds: float) -> None:
+        """
+        Записывает в метрики одну попытку запроса: количество запросов по хосту и коду ответа
+        и гистограмму длительности по хосту
+
+        :param url: ссылка на ресурс
+        :param status: код ответа или "error", если ответ не получен
+        :param seconds: длительность попытки в секундах
+        """
+
+        metrics = Metrics_Registry.get_shared()
+        host = urlsplit(url).hostname or ""
+        metrics.increment("http_requests_total", labels={"host": host, "status": status},
+                          description="Количество HTTP-запросов по хосту и коду ответа")
+        metrics.observe("http_request_duration_seconds", seconds, labels={"host": host},
+                        description="Длительность HTTP-запросов в секундах")
+
+    def _get_backoff(self, attempt: int) -> float:
+        """
+        Возвращает задержку перед повтором запроса: экспоненциальный рост
+        с полным случайным разбросом (full jitter)
+
+        :param attempt: номер попытки, начиная с 0
+        """
+
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def _get_retry_after(self, response: requests.Response) -> float | None:
+        """
+        Возвращает задержку в секундах из заголовка Retry-After или None, если заголовка нет.
+        Заголовок может содержать число секунд или дату в формате HTTP
+
+        :param response: ответ сервера
+        """
+
+        retry_after = response.headers.get("Retry-After")
+        if not retry_after:
+            return None
+
+        try:
+            delay = float(retry_after)
+        except ValueError:
+            try:
+                delay = (parsedate_to_datetime(retry_after) - datetime.now(timezone.utc)).total_seconds()
+            except (TypeError, ValueError):
+                return None
+
+        return min(max(delay, 0), self.backoff_max)
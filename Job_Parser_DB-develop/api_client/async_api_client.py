@@ -0,0 +1,148 @@
+import asyncio
+import time
+
+import requests
+
+try:
+    import aiohttp
+except ImportError:
+    # aiohttp - необязательная зависимость, нужна только для асинхронной загрузки данных
+    aiohttp = None
+
+from api_client.api_client import API_Client
+from api_client.rate_limiter import Rate_Limit_Registry
+
+
+class Async_API_Client:
+    """
+    Асинхронный HTTP-клиент для обращения к API сайтов на основе aiohttp.
+
+    Все запросы отправляются через одну сессию aiohttp.ClientSession с пулом постоянных соединений.
+    Количество одновременных запросов ограничено семафором, частота запросов и бюджет на один запуск -
+    общим реестром ограничителей Rate_Limit_Registry.
+    Повторы при сетевых ошибках и ответах 429/5xx и запись метрик запросов работают так же, как в API_Client.
+
+    Ошибки соединения приводятся к исключениям requests, чтобы вызывающий код
+    обрабатывал их одинаково для синхронного и асинхронного клиента
+    """
+
+    # коды ответа, при получении которых запрос будет повторён
+    retry_statuses = API_Client.retry_statuses
+
+    # заголовки, которые отправляются с каждым запросом
+    headers = API_Client.headers
+
+    # журнал клиента
+    logger = API_Client.logger
+
+    def __init__(self,
+                 max_concurrency: int = 20,
+                 limits: Rate_Limit_Registry | None = None,
+                 timeout: float = 30,
+                 max_retries: int = 5,
+                 backoff_base: float = 0.5,
+                 backoff_max: float = 30) -> None:
+        """
+        Инициализатор объектов класса. Сессия создаётся при первом запросе,
+        так как ей нужен запущенный цикл событий
+
+        :param max_concurrency: максимальное количество одновременно отправленных запросов
+        :param limits: реестр ограничителей частоты запросов, по умолчанию общий для всей программы
+        :param timeout: общее время ожидания ответа в секундах
+        :param max_retries: максимальное количество повторных попыток запроса
+        :param backoff_base: начальная задержка перед повтором в секундах, удваивается с каждой попыткой
+        :param backoff_max: максимальная задержка перед повтором в секундах
+        """
+
+        if aiohttp is None:
+            raise ImportError("Для асинхронной загрузки данных необходимо установить aiohttp")
+
+        self.max_concurrency = max(1, max_concurrency)
+        self.limits = limits or Rate_Limit_Registry.get_shared()
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self.session = None
+        self._semaphore = None
+
+    async def __aenter__(self) -> "Async_API_Client":
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
+
+    async def get_json(self, url: str, parameters: None | dict = None) -> list[dict] | dict:
+        """
+        Отправляет GET-запрос и возвращает тело ответа, преобразованное из формата JSON.
+        Ответы с кодами, при которых запрос не повторяется (например, 404), возвращаются как есть
+
+        :param url: ссылка на ресурс
+        :param parameters: параметры запроса
+
+        :raises requests.RequestException: если все попытки запроса завершились ошибкой
+        """
+
+        if self.session is None:
+            self.session = aiohttp.ClientSession(
+                headers=self.headers,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                connector=aiohttp.TCPConnector(limit=self.max_concurrency),
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async with self._semaphore:
+            return await self._send(url, parameters)
+
+    async def _send(self, url: str, parameters: None | dict = None) -> list[dict] | dict:
+        """
+        Отправляет GET-запрос с повторами и возвращает тело ответа
+
+        :param url: ссылка на ресурс
+        :param parameters: параметры запроса
+
+        :raises requests.RequestException: если все попытки запроса завершились ошибкой
+                                           или исчерпан бюджет запросов (Request_Budget_Exceeded)
+        """
+
+        parameters = {name: str(value) for name, value in (parameters or {}).items()}
+        attempt = 0
+
+        while True:
+            await self.limits.acquire_async(url)
+            start = time.perf_counter()
+            try:
+                async with self.session.get(url, params=parameters) as response:
+                    self.record_request(url, response.status, time.perf_counter() - start)
+                    delay = self._get_retry_after(response)
+                    self.limits.report(url, response.status, delay)
+
+                    if response.status not in self.retry_statuses:
+                        return await response.json(content_type=None)
+                    if attempt >= self.max_retries:
+                        raise requests.HTTPError(f"{response.status} для ссылки {response.url}")
+                    if delay is None:
+                        delay = self._get_backoff(attempt)
+                    self.logger.warning("Повтор запроса %s через %.2f с: ответ %s", url, delay, response.status)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as error:
+                self.record_request(url, "error", time.perf_counter() - start)
+                if attempt >= self.max_retries:
+                    raise requests.ConnectionError(str(error) or url) from error
+                delay = self._get_backoff(attempt)
+                self.logger.warning("Повтор запроса %s через %.2f с: %s", url, delay, error)
+
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def close(self) -> None:
+        """Закрывает сессию и все открытые соединения"""
+
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    # расчёт задержек перед повтором и запись метрик такие же, как у синхронного клиента
+    record_request = staticmethod(API_Client.record_request)
+    _get_backoff = API_Client._get_backoff
+    _get_retry_after = API_Client._get_retry_after
@@ -0,0 +1,66 @@
+import json
+from typing import Any
+
+# msgspec и orjson - необязательные зависимости для быстрого разбора ответов в формате JSON
+# (orjson используется, если msgspec не установлен), поэтому они загружаются
+# при разборе первого ответа, а не при запуске программы
+msgspec = None
+orjson = None
+_backends_imported = False
+
+
+def import_backends() -> None:
+    """Загружает установленные библиотеки разбора JSON при первом обращении"""
+
+    global msgspec, orjson, _backends_imported
+    if _backends_imported:
+        return
+
+    try:
+        import msgspec
+    except ImportError:
+        pass
+
+    try:
+        import orjson
+    except ImportError:
+        pass
+
+    _backends_imported = True
+
+
+class Json_Decoder:
+    """
+    Разбор тела ответа в формате JSON из байтов без промежуточной строки.
+
+    Используется самая быстрая из установленных библиотек: msgspec, orjson
+    или стандартный модуль json, если ни одна из них не установлена.
+    Результат одинаков для всех библиотек: словари, списки, строки и числа
+    """
+
+    @staticmethod
+    def get_backend() -> str:
+        """Возвращает название библиотеки, которая используется для разбора"""
+
+        import_backends()
+        return "msgspec" if msgspec is not None else "orjson" if orjson is not None else "json"
+
+    @classmethod
+    def loads(cls, content: bytes) -> Any:
+        """
+        Разбирает тело ответа в формате JSON
+
+        :param content: тело ответа в байтах в кодировке UTF-8
+
+        :raises ValueError: если тело ответа не является корректным JSON
+        """
+
+        import_backends()
+        if msgspec is not None:
+            try:
+                return msgspec.json.decode(content)
+            except msgspec.DecodeError as error:
+                raise ValueError(str(error)) from error
+        if orjson is not None:
+            return orjson.loads(content)
+        return json.loads(content)
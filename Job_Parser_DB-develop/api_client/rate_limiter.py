@@ -0,0 +1,263 @@
+import os
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+
+
+class Request_Budget_Exceeded(requests.RequestException):
+    """Исключение, которое возникает, когда исчерпан лимит запросов на один запуск программы"""
+
+
+class Rate_Limiter:
+    """
+    Ограничитель частоты запросов по алгоритму "ведро с токенами" (token bucket).
+
+    Ведро вмещает не больше burst токенов и пополняется со скоростью rate токенов в секунду,
+    каждый запрос забирает один токен. Пока в ведре есть токены, запросы уходят сразу
+    (короткий всплеск), затем - не чаще rate раз в секунду.
+
+    Частота подстраивается под ответы сервера: после ответа 429 или заголовка Retry-After
+    она уменьшается (slow_down), а после успешных ответов постепенно возвращается
+    к исходной (speed_up).
+    Один объект можно использовать одновременно из потоков (acquire) и корутин (acquire_async)
+    """
+
+    # во сколько раз уменьшается частота после ответа 429
+    decrease_factor = 0.5
+    # доля исходной частоты, на которую частота увеличивается после каждого успешного ответа
+    increase_step = 0.05
+    # минимальная доля исходной частоты, ниже которой частота не опускается
+    min_rate_share = 0.1
+
+    def __init__(self, rate: float, burst: int = 1) -> None:
+        """
+        Инициализатор объектов класса, ведро создаётся заполненным
+
+        :param rate: количество запросов в секунду
+        :param burst: максимальное количество запросов, которые можно отправить подряд без ожидания
+        """
+
+        if rate <= 0:
+            raise ValueError("Частота запросов должна быть больше нуля")
+
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = max(1, burst)
+
+        self._tokens = float(self.burst)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Забирает токен из ведра, при необходимости блокируя поток до его появления"""
+
+        delay = self._reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self) -> None:
+        """Забирает токен из ведра, при необходимости приостанавливая корутину до его появления"""
+
+        # asyncio загружается только асинхронным клиентом, а не при запуске программы
+        import asyncio
+
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def slow_down(self, delay: float | None = None) -> None:
+        """
+        Уменьшает частоту запросов в decrease_factor раз и опустошает ведро.
+        Если сервер указал, через сколько секунд можно повторить запрос,
+        ведро не пополняется до истечения этого времени
+
+        :param delay: время в секундах из заголовка Retry-After
+        """
+
+        with self._lock:
+            self.rate = max(self.max_rate * self.min_rate_share, self.rate * self.decrease_factor)
+            self._tokens = min(self._tokens, 0)
+            self._updated_at = max(self._updated_at, time.monotonic() + (delay or 0))
+
+    def speed_up(self) -> None:
+        """Увеличивает частоту запросов на increase_step от исходной, но не выше исходной"""
+
+        if self.rate < self.max_rate:
+            with self._lock:
+                self.rate = min(self.max_rate, self.rate + self.max_rate * self.increase_step)
+
+    def _reserve(self) -> float:
+        """
+        Забирает токен (баланс может уйти в минус - это очередь ожидающих)
+        и возвращает время в секундах, через которое токен будет доступен
+        """
+
+        with self._lock:
+            now = time.monotonic()
+            # момент последнего пополнения может быть в будущем, если сервер попросил подождать
+            if now > self._updated_at:
+                self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+                self._updated_at = now
+
+            self._tokens -= 1
+            delay = self._updated_at - now
+            if self._tokens < 0:
+                delay += -self._tokens / self.rate
+            return delay
+
+
+class Rate_Limit_Registry:
+    """
+    Общий реестр ограничителей частоты запросов: для каждого хоста создаётся свой Rate_Limiter
+    с частотой и всплеском из limits. Через реестр проходят все HTTP-запросы программы.
+
+    Реестр также ведёт бюджет запросов на один запуск: когда отправлено max_requests запросов,
+    следующий вызов acquire вызывает исключение Request_Budget_Exceeded,
+    и загрузка данных останавливается без отправки лишних запросов
+    """
+
+    # частота (запросов в секунду) и всплеск для хостов.
+    # hh.ru не публикует точные лимиты, но при частых запросах отвечает 429 или просит пройти капчу
+    limits = {
+        "api.hh.ru": (5, 10),
+        "www.cbr-xml-daily.ru": (2, 2),
+    }
+    # частота и всплеск для остальных хостов
+    default_limit = (10, 10)
+
+    # переменная окружения с бюджетом запросов для общего реестра
+    budget_variable = "JOB_PARSER_REQUEST_BUDGET"
+
+    # общий для всей программы объект реестра
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self,
+                 limits: dict[str, tuple[float, int]] | None = None,
+                 default_limit: tuple[float, int] | None = None,
+                 max_requests: int | None = None) -> None:
+        """
+        Инициализатор объектов класса
+
+        :param limits: частота и всплеск для хостов в формате 'хост: (запросов в секунду, всплеск)'
+        :param default_limit: частота и всплеск для остальных хостов
+        :param max_requests: бюджет запросов на один запуск, по умолчанию без ограничения
+        """
+
+        if limits is not None:
+            self.limits = limits
+        if default_limit is not None:
+            self.default_limit = default_limit
+
+        self.max_requests = max_requests
+        self.spent = 0
+        self.throttled = 0
+
+        self._limiters = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def get_shared(cls) -> "Rate_Limit_Registry":
+        """
+        Возвращает общий для всей программы реестр, создавая его при первом обращении.
+        Бюджет запросов берётся из переменной окружения budget_variable
+        """
+
+        with cls._shared_lock:
+            if cls._shared is None:
+                budget = os.environ.get(cls.budget_variable)
+                cls._shared = cls(max_requests=int(budget) if budget and budget.isdigit() else None)
+            return cls._shared
+
+    def get_limiter(self, url: str) -> Rate_Limiter:
+        """
+        Возвращает ограничитель частоты для хоста из ссылки, создавая его при первом обращении
+
+        :param url: ссылка на ресурс
+        """
+
+        host = urlsplit(url).hostname or ""
+        limiter = self._limiters.get(host)
+        if limiter is None:
+            with self._lock:
+                limiter = self._limiters.get(host)
+                if limiter is None:
+                    limiter = self._limiters[host] = Rate_Limiter(*self.limits.get(host, self.default_limit))
+        return limiter
+
+    def set_budget(self, max_requests: int | None) -> None:
+        """
+        Задаёт новый бюджет запросов и обнуляет счётчик отправленных запросов
+
+        :param max_requests: бюджет запросов, None - без ограничения
+        """
+
+        with self._lock:
+            self.max_requests = max_requests
+            self.spent = 0
+
+    def acquire(self, url: str) -> None:
+        """
+        Учитывает запрос в бюджете и ждёт разрешения ограничителя хоста
+
+        :param url: ссылка на ресурс
+
+        :raises Request_Budget_Exceeded: если бюджет запросов исчерпан
+        """
+
+        self._spend()
+        self.get_limiter(url).acquire()
+
+    async def acquire_async(self, url: str) -> None:
+        """
+        Учитывает запрос в бюджете и ждёт разрешения ограничителя хоста, не блокируя цикл событий
+
+        :param url: ссылка на ресурс
+
+        :raises Request_Budget_Exceeded: если бюджет запросов исчерпан
+        """
+
+        self._spend()
+        await self.get_limiter(url).acquire_async()
+
+    def report(self, url: str, status: int, retry_after: float | None = None) -> None:
+        """
+        Сообщает ограничителю хоста результат запроса: после ответа 429 или заголовка Retry-After
+        частота уменьшается, после успешного ответа - постепенно восстанавливается
+
+        :param url: ссылка на ресурс
+        :param status: код ответа
+        :param retry_after: время в секундах из заголовка Retry-After
+        """
+
+        limiter = self.get_limiter(url)
+        if status == 429 or retry_after is not None:
+            with self._lock:
+                self.throttled += 1
+            limiter.slow_down(retry_after)
+        elif status < 400:
+            limiter.speed_up()
+
+    def get_stats(self) -> dict:
+        """Возвращает количество отправленных запросов, бюджет, число замедлений и текущую частоту для хостов"""
+
+        return {
+            "requests": self.spent,
+            "max_requests": self.max_requests,
+            "throttled": self.throttled,
+            "rates": {host: round(limiter.rate, 2) for host, limiter in self._limiters.items()},
+        }
+
+    def _spend(self) -> None:
+        """
+        Учитывает один запрос в бюджете
+
+        :raises Request_Budget_Exceeded: если бюджет запросов исчерпан
+        """
+
+        with self._lock:
+            if self.max_requests is not None and self.spent >= self.max_requests:
+                raise Request_Budget_Exceeded(f"Исчерпан лимит запросов на один запуск ({self.max_requests})")
+            self.spent += 1
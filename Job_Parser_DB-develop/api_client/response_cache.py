@@ -0,0 +1,236 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+
+class Response_Cache:
+    """
+    Постоянный кэш ответов API, хранящийся в файле SQLite.
+
+    Ключ записи - ссылка вместе с отсортированными параметрами запроса.
+    Время жизни записи зависит от ресурса (ttls), размер кэша ограничен (max_bytes),
+    при превышении удаляются записи, к которым дольше всего не обращались (LRU).
+    Для устаревших записей запрос отправляется с заголовками If-None-Match / If-Modified-Since,
+    и при ответе 304 тело ответа берётся из кэша
+    """
+
+    # файл кэша в директории cache в корне проекта
+    cache_file = "http_cache.sqlite"
+
+    # время жизни записей в секундах для ссылок, начинающихся с указанной строки
+    ttls = {
+        "https://api.hh.ru/employers": 24 * 60 * 60,
+        "https://api.hh.ru/vacancies": 15 * 60,
+        "https://www.cbr-xml-daily.ru": 60 * 60,
+    }
+    # время жизни записей для остальных ссылок
+    default_ttl = 5 * 60
+
+    # максимальный суммарный размер тел ответов в кэше
+    max_bytes = 50 * 1024 * 1024
+
+    def __init__(self,
+                 path_to_cache: str | None = None,
+                 ttls: dict[str, int] | None = None,
+                 max_bytes: int | None = None) -> None:
+        """
+        Инициализатор объектов класса, открывает (или создаёт) файл кэша
+
+        :param path_to_cache: путь к файлу SQLite, по умолчанию cache/http_cache.sqlite в корне проекта
+        :param ttls: время жизни записей в секундах для ссылок, начинающихся с указанной строки
+        :param max_bytes: максимальный суммарный размер тел ответов в кэше
+        """
+
+        if ttls is not None:
+            self.ttls = ttls
+        if max_bytes is not None:
+            self.max_bytes = max_bytes
+
+        self.path_to_cache = path_to_cache or self._build_path_to_cache(self.cache_file)
+        os.makedirs(os.path.dirname(self.path_to_cache), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path_to_cache, check_same_thread=False)
+        self._conn.execute("""
+                           CREATE TABLE IF NOT EXISTS responses (
+                               key TEXT PRIMARY KEY,
+                               url TEXT NOT NULL,
+                               status INTEGER NOT NULL,
+                               headers TEXT NOT NULL,
+                               body BLOB NOT NULL,
+                               size INTEGER NOT NULL,
+                               expires_at REAL NOT NULL,
+                               last_access REAL NOT NULL
+                           )
+                           """)
+        self._conn.commit()
+
+        self.stats = {"hits": 0, "misses": 0, "revalidated": 0, "bytes_saved": 0}
+
+    @staticmethod
+    def make_key(url: str, parameters: None | dict = None) -> str:
+        """
+        Возвращает ключ записи: ссылку, параметры которой (включая переданные отдельно)
+        отсортированы, чтобы один и тот же запрос всегда давал один и тот же ключ
+
+        :param url: ссылка на ресурс
+        :param parameters: параметры запроса
+        """
+
+        parts = urlsplit(url)
+        query = parse_qsl(parts.query)
+        for name, value in (parameters or {}).items():
+            values = value if isinstance(value, (list, tuple)) else [value]
+            query.extend((name, str(item)) for item in values)
+
+        return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(sorted(query)), ""))
+
+    def get(self, key: str) -> tuple[requests.Response, bool] | None:
+        """
+        Возвращает сохранённый ответ и признак того, что срок его жизни не истёк,
+        или None, если записи нет
+
+        :param key: ключ записи (make_key)
+        """
+
+        with self._lock:
+            row = self._conn.execute("SELECT url, status, headers, body, expires_at FROM responses WHERE key = ?",
+                                     (key,)).fetchone()
+            if row is None:
+                return None
+
+            self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+
+        url, status, headers, body, expires_at = row
+        return self._build_response(url, status, json.loads(headers), body), time.time() < expires_at
+
+    def store(self, key: str, response: requests.Response) -> None:
+        """
+        Сохраняет успешный ответ в кэш и удаляет старые записи, если превышен размер кэша
+
+        :param key: ключ записи (make_key)
+        :param response: ответ сервера
+        """
+
+        headers = {name: response.headers[name]
+                   for name in ("Content-Type", "ETag", "Last-Modified") if name in response.headers}
+        body = response.content
+        now = time.time()
+
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                               (key, response.url, response.status_code, json.dumps(headers), body, len(body),
+                                now + self._get_ttl(key), now))
+            self._evict()
+            self._conn.commit()
+
+    def refresh(self, key: str) -> None:
+        """
+        Продлевает срок жизни записи после ответа 304 (данные на сервере не изменились)
+
+        :param key: ключ записи (make_key)
+        """
+
+        now = time.time()
+        with self._lock:
+            self._conn.execute("UPDATE responses SET expires_at = ?, last_access = ? WHERE key = ?",
+                               (now + self._get_ttl(key), now, key))
+            self._conn.commit()
+
+    @staticmethod
+    def get_conditional_headers(response: requests.Response) -> dict[str, str]:
+        """
+        Возвращает заголовки условного запроса для проверки актуальности сохранённого ответа
+
+        :param response: сохранённый ответ
+        """
+
+        headers = {}
+        if "ETag" in response.headers:
+            headers["If-None-Match"] = response.headers["ETag"]
+        if "Last-Modified" in response.headers:
+            headers["If-Modified-Since"] = response.headers["Last-Modified"]
+        return headers
+
+    def record(self, event: str, size: int = 0) -> None:
+        """
+        Учитывает обращение к кэшу в статистике
+
+        :param event: тип обращения: "hits", "misses" или "revalidated"
+        :param size: количество байт, которые не пришлось загружать из сети
+        """
+
+        with self._lock:
+            self.stats[event] += 1
+            self.stats["bytes_saved"] += size
+
+    def get_stats(self) -> dict[str, int | float]:
+        """Возвращает статистику кэша: попадания, промахи, подтверждения 304, сэкономленные байты и долю попаданий"""
+
+        stats = dict(self.stats)
+        requests_number = stats["hits"] + stats["revalidated"] + stats["misses"]
+        stats["hit_rate"] = round((stats["hits"] + stats["revalidated"]) / requests_number, 3) if requests_number else 0
+        return stats
+
+    def clear(self) -> None:
+        """Удаляет все записи из кэша"""
+
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def close(self) -> None:
+        """Закрывает файл кэша"""
+
+        self._conn.close()
+
+    def _get_ttl(self, key: str) -> int:
+        """
+        Возвращает время жизни записи для ссылки: берётся самый длинный подходящий префикс из ttls
+
+        :param key: ключ записи (make_key)
+        """
+
+        prefixes = [prefix for prefix in self.ttls if key.startswith(prefix)]
+        if not prefixes:
+            return self.default_ttl
+        return self.ttls[max(prefixes, key=len)]
+
+    def _evict(self) -> None:
+        """Удаляет записи, к которым дольше всего не обращались, пока размер кэша превышает max_bytes"""
+
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        for key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY last_access").fetchall():
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    @staticmethod
+    def _build_response(url: str, status: int, headers: dict, body: bytes) -> requests.Response:
+        """Восстанавливает объект ответа requests из сохранённых данных"""
+
+        response = requests.Response()
+        response.url = url
+        response.status_code = status
+        response.headers = CaseInsensitiveDict(headers)
+        response._content = body
+        response.encoding = "utf-8"
+        return response
+
+    @staticmethod
+    def _build_path_to_cache(file_name: str) -> str:
+        """Строит путь к файлу в директории cache в корне проекта"""
+
+        project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        return os.path.join(project_root, "cache", file_name)
@@ -0,0 +1,252 @@
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import psycopg2
+import requests
+from prettytable import PrettyTable
+
+from api_client.rate_limiter import Rate_Limit_Registry
+from data_storage.data_storage_hh import Data_Storage_HH
+from database.connection_pool import Connection_Pool
+from database.db_saver import DB_Saver
+from instrumentation.instrumentation import Instrumentation
+from pipeline.ingestion_pipeline import Ingestion_Pipeline
+
+
+class Batch_Runner:
+    """
+    Неинтерактивный запуск многих заданий поиска вакансий (например, ночная загрузка по расписанию).
+
+    Задания читаются из JSON-файла, каждое задание - это ключевое слово, список id компаний
+    и ограничение количества вакансий. Информация обо всех компаниях загружается один раз,
+    затем задания выполняются одновременно в пуле потоков: каждое задание загружает вакансии
+    через Ingestion_Pipeline (логика поиска Data_Storage_HH) и сохраняет их через общий DB_Saver.
+    Все задания используют общий HTTP-клиент, ограничитель частоты запросов и пул соединений
+    с базой данных, поэтому число потоков не увеличивает нагрузку на hh.ru сверх лимитов.
+    Ошибка одного задания не останавливает остальные, в конце выводится отчёт о производительности
+
+    Формат файла заданий:
+    {
+        "employers": ["1740", "3529"],         - компании по умолчанию для заданий без своего списка
+        "number": 500,                         - ограничение количества вакансий по умолчанию
+        "keywords": ["python", "java"],        - по заданию на каждое ключевое слово с параметрами по умолчанию
+        "jobs": [{"keyword": "go", "employers": ["78638"], "number": 100}]
+    }
+    """
+
+    # количество одновременно выполняемых заданий
+    max_workers = 4
+
+    def __init__(self,
+                 jobs: list[dict],
+                 max_workers: int | None = None,
+                 page_workers: int | None = None,
+                 db_saver: DB_Saver | None = None) -> None:
+        """
+        Инициализатор объектов класса
+
+        :param jobs: задания в формате {"keyword": ..., "employers": [...], "number": ...}
+        :param max_workers: количество одновременно выполняемых заданий
+        :param page_workers: количество страниц, загружаемых одновременно внутри одного задания,
+                             по умолчанию как в Data_Storage_HH
+        :param db_saver: объект для сохранения данных в базу данных, по умолчанию создаётся новый
+        """
+
+        self.jobs = jobs
+        if max_workers is not None:
+            self.max_workers = max(1, max_workers)
+        self.page_workers = page_workers
+        self.db_saver = db_saver or DB_Saver()
+
+        # объект, в который один раз загружается информация обо всех компаниях заданий
+        self.data_storage = Data_Storage_HH(page_workers)
+
+    @classmethod
+    def load_jobs(cls, path: str) -> list[dict]:
+        """
+        Читает файл заданий и возвращает список заданий с заполненными значениями по умолчанию
+
+        :param path: путь к JSON-файлу заданий
+
+        :raises ValueError: если в файле нет заданий или задание описано неверно
+        """
+
+        with open(path, "r", encoding="UTF-8") as file:
+            content = json.load(file)
+
+        if isinstance(content, list):
+            content = {"jobs": content}
+
+        default_employers = [str(employer_id) for employer_id in content.get("employers", [])]
+        default_number = content.get("number")
+
+        jobs = [{"keyword": keyword} for keyword in content.get("keywords", [])]
+        jobs.extend(content.get("jobs", []))
+
+        result = []
+        for number, job in enumerate(jobs, 1):
+            keyword = str(job.get("keyword", "")).strip()
+            employers = [str(employer_id) for employer_id in job.get("employers", default_employers)]
+            if not keyword:
+                raise ValueError(f"В задании {number} не указано ключевое слово")
+            if not employers:
+                raise ValueError(f"В задании {number} ({keyword}) не указаны компании")
+            vacancies_number = job.get("number", default_number)
+            if vacancies_number is not None and (type(vacancies_number) is not int or vacancies_number <= 0):
+                raise ValueError(f"В задании {number} ({keyword}) количество вакансий должно быть "
+                                 f"положительным целым числом, получено: {vacancies_number!r}")
+            result.append({"keyword": keyword, "employers": employers, "number": vacancies_number})
+
+        if not result:
+            raise ValueError(f"В файле {path} нет заданий")
+        return result
+
+    def run(self) -> dict:
+        """
+        Загружает информацию о компаниях, выполняет все задания и возвращает результаты:
+        статистику каждого задания, общее время работы и статистику запросов к сайтам
+        """
+
+        start = time.perf_counter()
+
+        employer_ids = list(dict.fromkeys(employer_id for job in self.jobs for employer_id in job["employers"]))
+        print(f"Загружаю информацию о компаниях: {len(employer_ids)}...")
+        summary = self.data_storage.load_employers(employer_ids)
+        if summary["not_found"]:
+            print(f"Не найдены: {', '.join(summary['not_found'])}")
+        if summary["failed"]:
+            print(f"Не удалось загрузить из-за ошибки соединения: {', '.join(summary['failed'])}")
+        if summary["budget"]:
+            print(f"{self.data_storage.budget_error_message}"
+                  f"\nНе загружены: {', '.join(summary['budget'])}")
+
+        # результаты хранятся в порядке заданий в файле, а не в порядке завершения
+        results = [None] * len(self.jobs)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(self.run_job, job): number for number, job in enumerate(self.jobs)}
+            for done, future in enumerate(as_completed(futures), 1):
+                result = results[futures[future]] = future.result()
+                print(f"[{done}/{len(self.jobs)}] {result['keyword']}: {result['status']}, "
+                      f"строк: {result['rows_written']}, {result['seconds']} с")
+
+        return {"jobs": results,
+                "seconds": round(time.perf_counter() - start, 3),
+                "requests": Rate_Limit_Registry.get_shared().get_stats()}
+
+    def run_job(self, job: dict) -> dict:
+        """
+        Выполняет одно задание и возвращает его статистику. Ошибки задания не пробрасываются,
+        а сохраняются в статистике, чтобы не останавливать остальные задания
+
+        :param job: задание в формате {"keyword": ..., "employers": [...], "number": ...}
+        """
+
+        start = time.perf_counter()
+        result = {"keyword": job["keyword"], "employers": 0, "pages": 0, "vacancies": 0,
+                  "rows_written": 0, "rows_unchanged": 0, "seconds": 0.0, "status": "ok"}
+
+        # строки одновременных заданий блокируются в одном порядке, так как Bulk_Writer записывает их
+        # по возрастанию первичного ключа, а взаимоблокировки с другими сохранениями повторяет DB_Saver
+        storage = Data_Storage_HH(self.page_workers, self.data_storage.client)
+        storage.employers = {employer_id: self.data_storage.employers[employer_id]
+                             for employer_id in job["employers"] if employer_id in self.data_storage.employers}
+        result["employers"] = len(storage.employers)
+
+        if not storage.employers:
+            result["status"] = "нет компаний"
+            return result
+
+        try:
+            stats = Ingestion_Pipeline(storage, self.db_saver).run(job["keyword"], job["number"])
+        except requests.RequestException as error:
+            result["status"] = f"ошибка сети: {str(error).strip()}"
+        except psycopg2.Error as error:
+            result["status"] = f"ошибка базы данных: {str(error).strip()}"
+        except Exception as error:
+            # непредвиденная ошибка одного задания не должна останавливать остальные
+            Instrumentation.get_logger("batch_runner").exception("Задание %s завершилось ошибкой", job["keyword"])
+            result["status"] = f"ошибка: {type(error).__name__}: {str(error).strip()}"
+        else:
+            result.update({key: stats[key] for key in ("pages", "vacancies", "rows_written", "rows_unchanged")})
+            if stats["budget_exhausted"]:
+                result["status"] = "исчерпан лимит запросов"
+            elif stats["truncated"]:
+                result["status"] = f"получены не все вакансии компаний: {stats['truncated']}"
+
+        result["seconds"] = round(time.perf_counter() - start, 3)
+        Instrumentation.get_logger("batch_runner").info("Задание %s: %s", job["keyword"], result)
+        return result
+
+
+def print_report(results: dict) -> None:
+    """
+    Выводит отчёт о выполнении заданий: таблицу по заданиям и итоговую производительность
+
+    :param results: результаты Batch_Runner.run
+    """
+
+    table = PrettyTable()
+    table.field_names = ["ключевое слово", "компаний", "страниц", "вакансий", "строк записано", "без изменений",
+                         "время, с", "строк/с", "статус"]
+    table.align["ключевое слово"] = "l"
+    table.align["статус"] = "l"
+
+    for job in results["jobs"]:
+        rows_per_second = round(job["rows_written"] / job["seconds"]) if job["seconds"] else 0
+        table.add_row([job["keyword"], job["employers"], job["pages"], job["vacancies"], job["rows_written"],
+                       job["rows_unchanged"], job["seconds"], rows_per_second, job["status"]])
+    print(table)
+
+    seconds = results["seconds"]
+    rows = sum(job["rows_written"] for job in results["jobs"])
+    pages = sum(job["pages"] for job in results["jobs"])
+    failed = sum(job["status"] != "ok" for job in results["jobs"])
+    requests_stats = results["requests"]
+
+    print(f"\nЗаданий: {len(results['jobs'])}, с ошибками или не завершено: {failed}"
+          f"\nВсего страниц: {pages}, строк записано: {rows}"
+          f"\nОбщее время: {seconds} с, {round(rows / seconds) if seconds else rows} строк/с, "
+          f"{round(pages / seconds, 1) if seconds else pages} страниц/с"
+          f"\nЗапросов к сайтам: {requests_stats['requests']}, замедлений из-за ответа 429: "
+          f"{requests_stats['throttled']}")
+
+
+def main(arguments: list[str] | None = None) -> int:
+    """
+    Разбирает аргументы командной строки, выполняет задания и выводит отчёт.
+    Возвращает код завершения: 0, если все задания выполнены, иначе 1
+    """
+
+    parser = argparse.ArgumentParser(description="Неинтерактивная загрузка вакансий hh.ru в базу данных")
+    parser.add_argument("jobs_file", help="JSON-файл с заданиями (ключевые слова, id компаний, ограничения)")
+    parser.add_argument("--workers", type=int, default=Batch_Runner.max_workers,
+                        help="количество одновременно выполняемых заданий")
+    parser.add_argument("--page-workers", type=int, default=None,
+                        help="количество страниц, загружаемых одновременно внутри одного задания")
+    options = parser.parse_args(arguments)
+
+    try:
+        jobs = Batch_Runner.load_jobs(options.jobs_file)
+    except (OSError, ValueError) as error:
+        print(f"\033[31mНе удалось прочитать файл заданий: {error}\033[0m")
+        return 1
+
+    Instrumentation.configure()
+    try:
+        results = Batch_Runner(jobs, options.workers, options.page_workers).run()
+    except psycopg2.Error as error:
+        print(f"\033[31mНе удалось подключиться к базе данных: {str(error).strip()}\033[0m")
+        return 1
+    finally:
+        Connection_Pool.close_shared()
+        Instrumentation.shutdown()
+
+    print_report(results)
+    return 0 if all(job["status"] == "ok" for job in results["jobs"]) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
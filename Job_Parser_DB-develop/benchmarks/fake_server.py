@@ -0,0 +1,202 @@
+import json
+import random
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+
+class Fake_HH_Server:
+    """
+    Локальный HTTP-сервер, имитирующий API hh.ru и сайт курсов валют ЦБР для замеров производительности.
+
+    Поддерживаемые ресурсы:
+    /vacancies - поиск вакансий (pages страниц по per_page вакансий),
+    /employers - поиск компаний, /employers/<id> - информация о компании,
+    /daily_json.js - таблица курсов валют.
+    Каждый ответ отправляется с задержкой latency секунд, чтобы имитировать сеть.
+    Вакансии содержат и поля, которые программа не использует (описание, адрес, логотип),
+    чтобы размер ответов был близок к настоящему
+    """
+
+    # валюты зарплат и их курсы к рублю в таблице ЦБР
+    rates = {"USD": 90.5, "EUR": 98.7, "KZT": 0.19}
+
+    def __init__(self,
+                 pages: int = 20,
+                 per_page: int = 50,
+                 latency: float = 0.02,
+                 employers: int = 50,
+                 seed: int = 0) -> None:
+        """
+        Инициализатор объектов класса. Сервер запускается методом start или в блоке with
+
+        :param pages: количество страниц в результатах поиска вакансий и компаний
+        :param per_page: количество элементов на странице, если в запросе не указано другое
+        :param latency: задержка перед каждым ответом в секундах
+        :param employers: количество компаний, к которым относятся вакансии
+        :param seed: начальное значение генератора случайных чисел, чтобы ответы повторялись между запусками
+        """
+
+        self.pages = pages
+        self.per_page = per_page
+        self.latency = latency
+        self.employers = employers
+        self.seed = seed
+
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    def __enter__(self) -> "Fake_HH_Server":
+        self.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.stop()
+
+    @property
+    def base_url(self) -> str:
+        """Адрес запущенного сервера, например http://127.0.0.1:54321"""
+
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> None:
+        """Запускает сервер в фоновом потоке на свободном порту"""
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                server._handle(self)
+
+            def log_message(self, *args) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-hh", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Останавливает сервер"""
+
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def make_vacancy(self, vacancy_id: int) -> dict:
+        """
+        Возвращает вакансию в формате API hh.ru. Одинаковый id всегда даёт одинаковую вакансию
+
+        :param vacancy_id: id вакансии
+        """
+
+        rnd = random.Random(self.seed * 1_000_003 + vacancy_id)
+        employer_id = str(rnd.randrange(self.employers) + 1)
+
+        salary = None
+        if rnd.random() < 0.7:
+            currency = rnd.choice(["RUR", "RUR", "RUR", *self.rates])
+            amount = rnd.randrange(50, 400) * (1000 if currency in ("RUR", "KZT") else 10)
+            salary = {"from": amount if rnd.random() < 0.8 else None,
+                      "to": amount * 2 if rnd.random() < 0.6 else None,
+                      "currency": currency,
+                      "gross": rnd.random() < 0.5}
+
+        published_at = datetime(2024, 1, 1, tzinfo=timezone.utc) + timedelta(minutes=vacancy_id)
+        return {
+            "id": str(vacancy_id),
+            "premium": False,
+            "name": rnd.choice(["Python-разработчик", "Java developer", "Аналитик данных", "DevOps-инженер"]),
+            "department": None,
+            "has_test": rnd.random() < 0.3,
+            "area": {"id": "1", "name": rnd.choice(["Москва", "Санкт-Петербург", "Казань"]),
+                     "url": "https://api.hh.ru/areas/1"},
+            "salary": salary,
+            "type": {"id": "open", "name": "Открытая"},
+            "address": {"city": "Москва", "street": "Тверская", "building": str(rnd.randrange(100)),
+                        "lat": 55.75, "lng": 37.61, "metro_stations": []},
+            "published_at": published_at.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "created_at": published_at.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "archived": False,
+            "alternate_url": f"https://hh.ru/vacancy/{vacancy_id}",
+            "employer": {"id": employer_id, "name": f"Компания {employer_id}",
+                         "url": f"https://api.hh.ru/employers/{employer_id}",
+                         "alternate_url": f"https://hh.ru/employer/{employer_id}",
+                         "logo_urls": {"90": "https://hh.ru/logo90.png", "240": "https://hh.ru/logo240.png"},
+                         "trusted": True},
+            "snippet": {"requirement": "Опыт работы от 3 лет. " * 4,
+                        "responsibility": "Разработка и поддержка сервисов. " * 4},
+            "schedule": {"id": "fullDay", "name": "Полный день"},
+            "professional_roles": [{"id": "96", "name": "Программист, разработчик"}],
+            "experience": {"id": "between3And6", "name": "От 3 до 6 лет"},
+            "employment": {"id": "full", "name": "Полная занятость"},
+        }
+
+    def make_employer(self, employer_id: int) -> dict:
+        """
+        Возвращает информацию о компании в формате API hh.ru
+
+        :param employer_id: id компании
+        """
+
+        return {"id": str(employer_id),
+                "name": f"Компания {employer_id}",
+                "alternate_url": f"https://hh.ru/employer/{employer_id}",
+                "open_vacancies": employer_id % 50 + 1,
+                "description": "<p>Описание компании</p>" * 10}
+
+    def _handle(self, handler: BaseHTTPRequestHandler) -> None:
+        """Формирует ответ на запрос в зависимости от ресурса"""
+
+        with self._lock:
+            self.requests += 1
+        time.sleep(self.latency)
+
+        parts = urlsplit(handler.path)
+        query = parse_qs(parts.query)
+        path = parts.path.rstrip("/")
+
+        if path == "/vacancies":
+            status, body = 200, self._get_page(query, self.make_vacancy)
+        elif path == "/employers":
+            status, body = 200, self._get_page(query, self.make_employer)
+        elif path.startswith("/employers/") and path.rsplit("/", 1)[1].isdigit():
+            status, body = 200, self.make_employer(int(path.rsplit("/", 1)[1]))
+        elif path == "/daily_json.js":
+            status, body = 200, {"Date": datetime.now(timezone.utc).isoformat(),
+                                 "Valute": {code: {"CharCode": code, "Nominal": 1, "Value": value}
+                                            for code, value in self.rates.items()}}
+        else:
+            status, body = 404, {"errors": [{"type": "not_found"}]}
+
+        content = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        handler.send_response(status)
+        handler.send_header("Content-Type", "application/json; charset=utf-8")
+        handler.send_header("Content-Length", str(len(content)))
+        handler.end_headers()
+        handler.wfile.write(content)
+
+    def _get_page(self, query: dict[str, list[str]], make_item) -> dict:
+        """
+        Возвращает страницу результатов поиска в формате API hh.ru
+
+        :param query: параметры запроса
+        :param make_item: функция, создающая элемент по его номеру
+        """
+
+        page = int(query.get("page", ["0"])[0])
+        per_page = int(query.get("per_page", [str(self.per_page)])[0])
+
+        items = []
+        if page < self.pages:
+            start = page * per_page + 1
+            items = [make_item(number) for number in range(start, start + per_page)]
+
+        return {"items": items, "found": self.pages * per_page, "pages": self.pages,
+                "page": page, "per_page": per_page}
@@ -0,0 +1,337 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from datetime import datetime
+from math import ceil
+from unittest import mock
+
+from prettytable import PrettyTable
+
+from api_client.api_client import API_Client
+from api_client.rate_limiter import Rate_Limit_Registry
+from benchmarks.fake_server import Fake_HH_Server
+from currency.rate_provider_cbr import Rate_Provider_CBR
+from data_storage.data_storage_hh import Data_Storage_HH
+from entity.employer_hh import Employer_HH
+from entity.vacancy_hh import Vacancy_HH
+
+
+class Benchmark_Runner:
+    """
+    Замеры производительности основных этапов работы программы.
+
+    Сетевые этапы (загрузка страниц, поиск вакансий) работают с локальным сервером Fake_HH_Server.
+    Этапы базы данных выполняются, только если передан отдельный конфигурационный файл
+    базы данных для замеров (в неё записываются сгенерированные данные);
+    если он не передан или база данных недоступна, эти этапы пропускаются.
+
+    Каждый этап выполняется repeat раз, по длительностям запусков считаются медиана (p50) и p95,
+    пропускная способность считается по медиане. Пиковая память измеряется отдельным запуском
+    под tracemalloc, чтобы трассировка не искажала время.
+    Результаты выводятся таблицей и сохраняются в JSON-файл для сравнения запусков между собой
+    """
+
+    # директория для файлов с результатами
+    results_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+    # запросы DB_Manager, которые замеряются, и их параметры
+    queries = {"1": None, "2": None, "3": None, "4": None,
+               "5": {"keyword": "python", "pattern": "%python%"}}
+
+    def __init__(self,
+                 pages: int = 20,
+                 per_page: int = 50,
+                 latency: float = 0.02,
+                 repeat: int = 5,
+                 max_workers: int | None = None,
+                 db_config: str | None = None) -> None:
+        """
+        Инициализатор объектов класса
+
+        :param pages: количество страниц в результатах поиска на локальном сервере
+        :param per_page: количество вакансий на странице
+        :param latency: задержка каждого ответа локального сервера в секундах
+        :param repeat: количество запусков каждого этапа
+        :param max_workers: количество страниц, загружаемых одновременно, по умолчанию как в Data_Storage_HH
+        :param db_config: путь к конфигурационному файлу .ini базы данных для замеров
+        """
+
+        self.pages = pages
+        self.per_page = per_page
+        self.latency = latency
+        self.repeat = max(1, repeat)
+        self.max_workers = max_workers or Data_Storage_HH.max_workers
+        self.db_config = os.path.abspath(db_config) if db_config else None
+
+        self.results = {}
+
+    def run(self) -> dict:
+        """Выполняет все этапы и возвращает результаты"""
+
+        started_at = datetime.now().isoformat(timespec="seconds")
+
+        with Fake_HH_Server(self.pages, self.per_page, self.latency) as server, \
+                tempfile.TemporaryDirectory() as temp_dir:
+            # ограничения частоты запросов не должны влиять на замеры
+            client = API_Client(limits=Rate_Limit_Registry(default_limit=(1_000_000, 1_000_000)))
+
+            # курсы валют для вакансий берутся с локального сервера
+            rate_provider = Rate_Provider_CBR(os.path.join(temp_dir, "rates.json"), client)
+            rate_provider.url = server.base_url + "/daily_json.js"
+            previous_provider = Vacancy_HH.rate_provider
+            Vacancy_HH.set_rate_provider(rate_provider)
+
+            try:
+                self._run_http_stages(server, client)
+                self._run_db_stages(server)
+            finally:
+                Vacancy_HH.set_rate_provider(previous_provider)
+                client.close()
+
+        return {
+            "started_at": started_at,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "config": {"pages": self.pages, "per_page": self.per_page, "latency": self.latency,
+                       "repeat": self.repeat, "max_workers": self.max_workers},
+            "stages": self.results,
+        }
+
+    def measure(self, name: str, stage: Callable[[], int]) -> None:
+        """
+        Замеряет этап и сохраняет результат
+
+        :param name: название этапа
+        :param stage: функция, выполняющая этап и возвращающая количество обработанных элементов
+        """
+
+        durations = []
+        items = 0
+        for _ in range(self.repeat):
+            start = time.perf_counter()
+            items = stage()
+            durations.append(time.perf_counter() - start)
+
+        tracemalloc.start()
+        try:
+            stage()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        p50 = self._percentile(durations, 50)
+        self.results[name] = {
+            "items": items,
+            "runs": len(durations),
+            "p50_seconds": round(p50, 4),
+            "p95_seconds": round(self._percentile(durations, 95), 4),
+            "items_per_second": round(items / p50) if p50 else items,
+            "peak_memory_kb": round(peak / 1024),
+        }
+
+    def skip(self, name: str, reason: str) -> None:
+        """
+        Отмечает этап пропущенным
+
+        :param name: название этапа
+        :param reason: причина пропуска
+        """
+
+        self.results[name] = {"skipped": reason}
+
+    def _run_http_stages(self, server: Fake_HH_Server, client: API_Client) -> None:
+        """Замеряет этапы, работающие с API сайтов"""
+
+        url = server.base_url + "/vacancies?employer_id=1"
+        items = self._create_storage(server, client)._cyclic_response(url, "python")
+
+        self.measure("cyclic_response",
+                     lambda: len(self._create_storage(server, client)._cyclic_response(url, "python")))
+
+        number = min(Data_Storage_HH.max_vacancies, self.pages * self.per_page)
+        self.measure("find_vacancies", lambda: self._find_vacancies(server, client, number))
+
+        self.measure("vacancy_construction", lambda: len([Vacancy_HH(item) for item in items]))
+
+    def _run_db_stages(self, server: Fake_HH_Server) -> None:
+        """Замеряет сохранение в базу данных и запросы DB_Manager, если база данных доступна"""
+
+        db_stages = ["save_to_db_employers", "save_to_db_vacancies", "save_to_db_vacancies_changed",
+                     *(f"query_{command}" for command in self.queries)]
+
+        if self.db_config is None:
+            for name in db_stages:
+                self.skip(name, "не указан конфигурационный файл базы данных для замеров (--db-config)")
+            return
+
+        try:
+            from database.connection_pool import Connection_Pool
+            from database.db_manager import DB_Manager
+            from database.db_saver import DB_Saver
+
+            # оба объекта подключаются к базе данных для замеров, а не к рабочей
+            db_saver = type("Benchmark_DB_Saver", (DB_Saver,),
+                            {"starting_db": self.db_config, "target_db": self.db_config})()
+            db_manager = type("Benchmark_DB_Manager", (DB_Manager,), {"db_config_file": self.db_config})()
+            # объекты подключаются к базе данных при первой операции, подключение не должно попасть в замеры
+            db_saver.pool, db_manager.pool
+        except Exception as error:
+            for name in db_stages:
+                self.skip(name, f"база данных недоступна: {str(error).strip()}")
+            return
+
+        try:
+            employers = {str(employer_id): Data_Storage_HH._create_employer(server.make_employer(employer_id))
+                         for employer_id in range(1, server.employers + 1)}
+            vacancies = {str(vacancy_id): Vacancy_HH(server.make_vacancy(vacancy_id))
+                         for vacancy_id in range(1, self.pages * self.per_page + 1)}
+
+            self.measure("save_to_db_employers", lambda: db_saver.save_to_db("employers", employers)["rows"])
+            # после первого повтора строки не меняются и не перезаписываются (контрольная сумма та же)
+            self.measure("save_to_db_vacancies", lambda: db_saver.save_to_db("vacancies", vacancies)["rows"])
+            self.measure("save_to_db_vacancies_changed", lambda: self._save_changed(db_saver, vacancies))
+
+            for command, parameters in self.queries.items():
+                self.measure(f"query_{command}",
+                             lambda command=command, parameters=parameters:
+                             self._run_query(db_manager, command, parameters))
+        finally:
+            Connection_Pool.close_shared()
+
+    def _create_storage(self, server: Fake_HH_Server, client: API_Client) -> Data_Storage_HH:
+        """Создаёт объект Data_Storage_HH, обращающийся к локальному серверу"""
+
+        storage = Data_Storage_HH(self.max_workers, client)
+        storage.url_employers = server.base_url + "/employers"
+        storage.url_vacancies = server.base_url + "/vacancies"
+        return storage
+
+    def _find_vacancies(self, server: Fake_HH_Server, client: API_Client, number: int) -> int:
+        """
+        Выполняет команду find vacancies с подставленным вводом пользователя и без вывода на экран
+
+        :return: количество найденных вакансий
+        """
+
+        storage = self._create_storage(server, client)
+        storage.employers = {str(employer_id): Employer_HH(str(employer_id), "", "", 0) for employer_id in range(1, 6)}
+
+        with mock.patch("builtins.input", side_effect=["python", str(number)]), \
+                contextlib.redirect_stdout(io.StringIO()):
+            storage.find_vacancies()
+
+        return len(storage.vacancies)
+
+    @staticmethod
+    def _save_changed(db_saver, vacancies: dict[str, Vacancy_HH]) -> int:
+        """
+        Изменяет название каждой вакансии и сохраняет вакансии, чтобы замерить перезапись всех строк
+
+        :param db_saver: объект DB_Saver, подключённый к базе данных для замеров
+        :param vacancies: вакансии в формате 'id: объект'
+        """
+
+        # при каждом вызове в конце названия добавляется или удаляется звёздочка
+        for vacancy in vacancies.values():
+            vacancy.name = vacancy.name[:-1] if vacancy.name.endswith("*") else vacancy.name + "*"
+        return db_saver.save_to_db("vacancies", vacancies)["updated"]
+
+    @staticmethod
+    def _run_query(db_manager, command: str, parameters: dict | None) -> int:
+        """
+        Выполняет запрос DB_Manager целиком (все страницы) без вывода на экран
+
+        :return: количество строк результата
+        """
+
+        with mock.patch.object(db_manager, "_ask_next_page", return_value=True), \
+                contextlib.redirect_stdout(io.StringIO()):
+            return db_manager._run_sql_query(command, parameters)["rows"]
+
+    @staticmethod
+    def _percentile(values: list[float], percent: int) -> float:
+        """
+        Возвращает перцентиль по методу ближайшего ранга
+
+        :param values: значения
+        :param percent: перцентиль от 1 до 100
+        """
+
+        ordered = sorted(values)
+        return ordered[max(0, ceil(percent / 100 * len(ordered)) - 1)]
+
+
+def print_report(results: dict, baseline: dict | None = None) -> None:
+    """
+    Выводит результаты замеров таблицей
+
+    :param results: результаты Benchmark_Runner.run
+    :param baseline: результаты предыдущего запуска для сравнения пропускной способности
+    """
+
+    table = PrettyTable()
+    table.field_names = ["этап", "элементов", "p50, с", "p95, с", "элементов/с", "пик памяти, КБ", "изменение"]
+    table.align["этап"] = "l"
+
+    for name, stage in results["stages"].items():
+        if "skipped" in stage:
+            table.add_row([name, "-", "-", "-", "-", "-", "пропущен"])
+            continue
+
+        change = ""
+        previous = (baseline or {}).get("stages", {}).get(name, {})
+        if previous.get("items_per_second"):
+            change = f"{(stage['items_per_second'] / previous['items_per_second'] - 1) * 100:+.1f}%"
+
+        table.add_row([name, stage["items"], stage["p50_seconds"], stage["p95_seconds"],
+                       stage["items_per_second"], stage["peak_memory_kb"], change])
+
+    print(table)
+    skipped = {stage["skipped"] for stage in results["stages"].values() if "skipped" in stage}
+    for reason in skipped:
+        print(f"Пропущено: {reason}")
+
+
+def main(arguments: list[str] | None = None) -> None:
+    """Разбирает аргументы командной строки, выполняет замеры и сохраняет результаты"""
+
+    parser = argparse.ArgumentParser(description="Замеры производительности Job_Parser_DB")
+    parser.add_argument("--pages", type=int, default=20, help="количество страниц результатов поиска")
+    parser.add_argument("--per-page", type=int, default=50, help="количество вакансий на странице")
+    parser.add_argument("--latency", type=float, default=0.02, help="задержка ответа сервера в секундах")
+    parser.add_argument("--repeat", type=int, default=5, help="количество запусков каждого этапа")
+    parser.add_argument("--max-workers", type=int, default=None, help="количество одновременно загружаемых страниц")
+    parser.add_argument("--db-config", help="конфигурационный файл .ini отдельной базы данных для замеров "
+                                            "(в неё будут записаны сгенерированные данные)")
+    parser.add_argument("--output", help="файл для результатов, по умолчанию benchmarks/results/<дата>.json")
+    parser.add_argument("--baseline", help="файл с результатами предыдущего запуска для сравнения")
+    options = parser.parse_args(arguments)
+
+    results = Benchmark_Runner(options.pages, options.per_page, options.latency,
+                               options.repeat, options.max_workers, options.db_config).run()
+
+    baseline = None
+    if options.baseline:
+        with open(options.baseline, "r", encoding="UTF-8") as file:
+            baseline = json.load(file)
+
+    print_report(results, baseline)
+
+    output = options.output or os.path.join(Benchmark_Runner.results_dir,
+                                            f"benchmark_{datetime.now():%Y%m%d_%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="UTF-8") as file:
+        json.dump(results, file, ensure_ascii=False, indent=2)
+    print(f"Результаты сохранены в файл {output}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
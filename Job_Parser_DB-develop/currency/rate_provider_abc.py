@@ -0,0 +1,38 @@
+from abc import ABC, abstractmethod
+
+
+class Rate_Provider(ABC):
+    """Абстрактный класс для описания источников актуальных курсов валют"""
+
+    @abstractmethod
+    def get_rate(self, currency: str) -> float | None:
+        """
+        Возвращает курс указанной валюты к рублю (стоимость одной единицы валюты в рублях)
+        или None, если валюта не найдена
+
+        :param currency: код валюты, например 'USD'
+        """
+        pass
+
+    @abstractmethod
+    def get_stats(self) -> dict[str, int]:
+        """Возвращает статистику обращений к кэшу курсов валют"""
+        pass
+
+    def convert(self, number: int | None, currency: str | None) -> int:
+        """
+        Конвертирует сумму в иностранной валюте в эквивалентную сумму в рублях.
+        Если сумма не указана или курс валюты неизвестен, возвращает 0
+
+        :param number: сумма в иностранной валюте
+        :param currency: код валюты
+        """
+
+        if not number or not currency:
+            return 0
+
+        rate = self.get_rate(currency)
+        if rate is None:
+            return 0
+
+        return int(rate * number)
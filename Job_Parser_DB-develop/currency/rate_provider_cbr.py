@@ -0,0 +1,180 @@
+import json
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+
+import requests
+
+from api_client.api_client import API_Client
+from currency.rate_provider_abc import Rate_Provider
+
+
+class Rate_Provider_CBR(Rate_Provider):
+    """
+    Источник курсов валют центрального банка России (https://www.cbr-xml-daily.ru).
+
+    Таблица курсов загружается один раз и кэшируется в памяти и в файле на диске.
+    Кэш считается актуальным до следующей публикации курсов ЦБР (дата таблицы + 1 день).
+    Если сайт с курсами недоступен, используется последняя сохранённая таблица
+    """
+
+    # ссылка на данные о текущем курсе валют центрального банка России
+    url = "https://www.cbr-xml-daily.ru/daily_json.js"
+
+    # файл, в котором хранится последняя загруженная таблица курсов
+    cache_file = "cbr_rates.json"
+
+    # минимальное время жизни кэша, чтобы не загружать таблицу повторно,
+    # если ЦБР ещё не опубликовал новые курсы (например, в выходные)
+    min_ttl = timedelta(hours=1)
+    # через сколько повторить загрузку, если сайт ЦБР был недоступен
+    retry_interval = timedelta(minutes=5)
+    # часовой пояс дат ЦБР (Москва), если в дате не указано смещение
+    cbr_timezone = timezone(timedelta(hours=3))
+
+    def __init__(self, path_to_cache: str | None = None, client: API_Client | None = None) -> None:
+        """
+        Инициализатор объектов класса.
+        Сетевых запросов не выполняет: таблица курсов загружается при первом обращении
+
+        :param path_to_cache: путь к файлу кэша, по умолчанию cache/cbr_rates.json в корне проекта
+        :param client: HTTP-клиент для загрузки курсов, по умолчанию общий для всей программы
+        """
+
+        self.client = client
+        self.path_to_cache = path_to_cache or self._build_path_to_cache(self.cache_file)
+
+        self._table = None
+        self._expires_at = None
+        self._disk_checked = False
+        self._lock = threading.Lock()
+
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "fallbacks": 0}
+
+    def get_rate(self, currency: str) -> float | None:
+        """
+        Возвращает курс указанной валюты к рублю или None, если валюта не найдена
+
+        :param currency: код валюты, например 'USD'
+        """
+
+        currency_info = self._get_table().get(currency)
+        if not currency_info:
+            return None
+
+        return currency_info["Value"] / currency_info["Nominal"]
+
+    def get_stats(self) -> dict[str, int]:
+        """Возвращает статистику обращений к кэшу курсов валют"""
+
+        return dict(self.stats)
+
+    def _get_table(self) -> dict:
+        """
+        Возвращает таблицу курсов валют в формате 'код валюты: информация о курсе'.
+
+        Порядок поиска: кэш в памяти, файл кэша, сайт ЦБР.
+        При ошибке загрузки возвращает устаревшую таблицу из кэша, если она есть
+        """
+
+        with self._lock:
+            if self._is_fresh():
+                self.stats["memory_hits"] += 1
+                return self._table
+
+            if not self._disk_checked:
+                self._disk_checked = True
+                self._load_from_disk()
+                if self._is_fresh():
+                    self.stats["disk_hits"] += 1
+                    return self._table
+
+            self.stats["misses"] += 1
+            try:
+                self._fetch()
+            except (requests.RequestException, ValueError):
+                if self._table is None:
+                    raise requests.RequestException("Ошибка при загрузке словаря с текущим курсом валют")
+                self.stats["fallbacks"] += 1
+                self._expires_at = datetime.now(timezone.utc) + self.retry_interval
+
+            return self._table
+
+    def _is_fresh(self) -> bool:
+        """Проверяет, есть ли в памяти таблица курсов, срок действия которой не истёк"""
+
+        return self._table is not None and datetime.now(timezone.utc) < self._expires_at
+
+    def _fetch(self) -> None:
+        """Загружает таблицу курсов с сайта ЦБР и сохраняет её в памяти и на диске"""
+
+        client = self.client or API_Client.get_shared()
+        response = client.get(self.url)
+        if response.status_code != 200:
+            raise requests.RequestException("Ошибка при загрузке словаря с текущим курсом валют")
+        data = response.json()
+
+        self._table = data["Valute"]
+        self._expires_at = self._get_expiration(data.get("Date"))
+        self._save_to_disk()
+
+    def _get_expiration(self, publication_date: str | None) -> datetime:
+        """
+        Возвращает момент, до которого таблица курсов считается актуальной
+
+        :param publication_date: дата, на которую установлены курсы, в формате ISO 8601
+        """
+
+        now = datetime.now(timezone.utc)
+        try:
+            expires_at = self._as_aware(datetime.fromisoformat(publication_date)) + timedelta(days=1)
+        except (TypeError, ValueError):
+            expires_at = now + timedelta(days=1)
+
+        return max(expires_at, now + self.min_ttl)
+
+    @classmethod
+    def _as_aware(cls, moment: datetime) -> datetime:
+        """
+        Возвращает момент с часовым поясом: дате без смещения назначается часовой пояс ЦБР,
+        чтобы её можно было сравнивать с текущим моментом в UTC
+
+        :param moment: дата и время
+        """
+
+        return moment.replace(tzinfo=cls.cbr_timezone) if moment.tzinfo is None else moment
+
+    def _load_from_disk(self) -> None:
+        """Загружает таблицу курсов из файла кэша, если он существует"""
+
+        try:
+            with open(self.path_to_cache, "r", encoding="UTF-8") as file:
+                data = json.load(file)
+            table = data["table"]
+            expires_at = self._as_aware(datetime.fromisoformat(data["expires_at"]))
+        except (OSError, ValueError, KeyError):
+            return
+
+        self._table = table
+        self._expires_at = expires_at
+
+    def _save_to_disk(self) -> None:
+        """Сохраняет таблицу курсов в файл кэша. Ошибки записи не прерывают работу программы"""
+
+        data = {"expires_at": self._expires_at.isoformat(), "table": self._table}
+        temp_path = self.path_to_cache + ".tmp"
+
+        try:
+            os.makedirs(os.path.dirname(self.path_to_cache), exist_ok=True)
+            with open(temp_path, "w", encoding="UTF-8") as file:
+                json.dump(data, file, ensure_ascii=False)
+            os.replace(temp_path, self.path_to_cache)
+        except OSError:
+            pass
+
+    @staticmethod
+    def _build_path_to_cache(file_name: str) -> str:
+        """Строит путь к файлу в директории cache в корне проекта"""
+
+        project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        return os.path.join(project_root, "cache", file_name)
@@ -0,0 +1,220 @@
+from collections.abc import Iterable
+
+from entity.vacancy_hh import Vacancy_HH
+
+# numpy - необязательная зависимость, нужна только для локальной аналитики,
+# поэтому модуль загружается при создании первого хранилища, а не при запуске программы
+np = None
+
+
+def _import_numpy() -> None:
+    """
+    Загружает numpy при первом обращении
+
+    :raises ImportError: если numpy не установлен
+    """
+
+    global np
+    if np is None:
+        try:
+            import numpy
+        except ImportError:
+            raise ImportError("Для колоночного хранилища вакансий необходимо установить numpy") from None
+        np = numpy
+
+
+class Columnar_Vacancy_Store:
+    """
+    Колоночное хранилище вакансий в памяти для быстрой аналитики без обращения к базе данных.
+
+    id вакансий, id компаний и границы зарплаты хранятся в массивах NumPy,
+    отсутствующие значения зарплаты отмечены масками. Названия и города хранятся
+    в виде словаря уникальных строк и массива их номеров, поэтому одинаковые строки
+    занимают память один раз.
+
+    Фильтры возвращают булевы маски, которые можно объединять операторами & и |,
+    а агрегаты повторяют SQL-запросы DB_Manager
+    """
+
+    def __init__(self,
+                 vacancy_ids: "np.ndarray",
+                 employer_ids: "np.ndarray",
+                 salary_min: "np.ndarray",
+                 salary_max: "np.ndarray",
+                 salary_min_mask: "np.ndarray",
+                 salary_max_mask: "np.ndarray",
+                 name_codes: "np.ndarray",
+                 names: list[str],
+                 location_codes: "np.ndarray",
+                 locations: list[str]) -> None:
+        """
+        Инициализатор объектов класса. Для создания хранилища из объектов Vacancy_HH
+        используется метод from_vacancies
+
+        :param salary_min_mask: маска строк, в которых нижняя граница зарплаты не указана
+        :param salary_max_mask: маска строк, в которых верхняя граница зарплаты не указана
+        :param name_codes: номера названий вакансий в списке names
+        :param location_codes: номера городов в списке locations
+        """
+
+        _import_numpy()
+
+        self.vacancy_ids = vacancy_ids
+        self.employer_ids = employer_ids
+        self.salary_min = salary_min
+        self.salary_max = salary_max
+        self.salary_min_mask = salary_min_mask
+        self.salary_max_mask = salary_max_mask
+        self.name_codes = name_codes
+        self.names = names
+        self.location_codes = location_codes
+        self.locations = locations
+
+    @classmethod
+    def from_vacancies(cls, vacancies: Iterable[Vacancy_HH]) -> "Columnar_Vacancy_Store":
+        """
+        Создаёт хранилище из объектов Vacancy_HH
+
+        :param vacancies: объекты вакансий, например значения словаря Data_Storage_HH.vacancies
+        """
+
+        _import_numpy()
+
+        vacancy_ids, employer_ids, salary_min, salary_max = [], [], [], []
+        name_codes, location_codes = [], []
+        names, locations = {}, {}
+
+        for vacancy in vacancies:
+            vacancy_ids.append(int(vacancy.vacancy_id))
+            employer_ids.append(int(vacancy.employer_id) if vacancy.employer_id else -1)
+            salary_min.append(vacancy.salary_min)
+            salary_max.append(vacancy.salary_max)
+            name_codes.append(names.setdefault(vacancy.name or "", len(names)))
+            location_codes.append(locations.setdefault(vacancy.location or "", len(locations)))
+
+        # нулевая зарплата сохраняется в базу данных как NULL, поэтому тоже считается отсутствующей
+        salary_min_mask = np.array([not value for value in salary_min], dtype=bool)
+        salary_max_mask = np.array([not value for value in salary_max], dtype=bool)
+
+        return cls(
+            np.array(vacancy_ids, dtype=np.int64),
+            np.array(employer_ids, dtype=np.int64),
+            np.array([value or 0 for value in salary_min], dtype=np.int64),
+            np.array([value or 0 for value in salary_max], dtype=np.int64),
+            salary_min_mask,
+            salary_max_mask,
+            np.array(name_codes, dtype=np.int32),
+            list(names),
+            np.array(location_codes, dtype=np.int32),
+            list(locations),
+        )
+
+    def __len__(self) -> int:
+        """Возвращает количество вакансий в хранилище"""
+
+        return len(self.vacancy_ids)
+
+    # Фильтры
+    def salary_above(self, amount: int) -> "np.ndarray":
+        """
+        Возвращает маску вакансий, средняя зарплата которых выше указанной суммы
+
+        :param amount: сумма в рублях
+        """
+
+        average, has_salary = self._get_average_salary()
+        return has_salary & (average > amount)
+
+    def employer_in(self, employer_ids: Iterable[str | int]) -> "np.ndarray":
+        """
+        Возвращает маску вакансий указанных компаний
+
+        :param employer_ids: id компаний
+        """
+
+        return np.isin(self.employer_ids, np.array([int(employer_id) for employer_id in employer_ids],
+                                                   dtype=np.int64))
+
+    def location_is(self, location: str) -> "np.ndarray":
+        """
+        Возвращает маску вакансий в указанном городе (без учёта регистра)
+
+        :param location: название города
+        """
+
+        codes = [code for code, name in enumerate(self.locations) if name.lower() == location.lower()]
+        return np.isin(self.location_codes, codes)
+
+    def name_contains(self, keyword: str) -> "np.ndarray":
+        """
+        Возвращает маску вакансий, в названии которых содержится указанное слово (без учёта регистра)
+
+        :param keyword: ключевое слово
+        """
+
+        keyword = keyword.lower()
+        codes = [code for code, name in enumerate(self.names) if keyword in name.lower()]
+        return np.isin(self.name_codes, codes)
+
+    def select(self, mask: "np.ndarray") -> "Columnar_Vacancy_Store":
+        """
+        Возвращает новое хранилище только с вакансиями, отмеченными в маске
+
+        :param mask: булева маска, полученная от фильтров
+        """
+
+        return self.__class__(
+            self.vacancy_ids[mask],
+            self.employer_ids[mask],
+            self.salary_min[mask],
+            self.salary_max[mask],
+            self.salary_min_mask[mask],
+            self.salary_max_mask[mask],
+            self.name_codes[mask],
+            self.names,
+            self.location_codes[mask],
+            self.locations,
+        )
+
+    # Агрегаты, соответствующие запросам DB_Manager
+    def count_by_employer(self) -> dict[int, int]:
+        """Возвращает количество вакансий у каждой компании в формате 'id компании: количество'"""
+
+        employer_ids, counts = np.unique(self.employer_ids, return_counts=True)
+        return dict(zip(employer_ids.tolist(), counts.tolist()))
+
+    def avg_salary(self) -> int | None:
+        """
+        Возвращает среднюю зарплату по вакансиям, у которых указаны обе границы зарплаты,
+        с тем же округлением, что и в SQL-запросе (ROUND(AVG((salary_min + salary_max) / 2)))
+        """
+
+        average = self._get_mean_salary()
+        if average is None:
+            return None
+        return int(np.floor(average + 0.5))
+
+    def higher_salary(self) -> "np.ndarray":
+        """Возвращает маску вакансий, у которых зарплата выше средней по всем вакансиям"""
+
+        mean = self._get_mean_salary()
+        if mean is None:
+            return np.zeros(len(self), dtype=bool)
+        return self.salary_above(mean)
+
+    def _get_average_salary(self) -> tuple["np.ndarray", "np.ndarray"]:
+        """
+        Возвращает среднюю зарплату каждой вакансии (целочисленное деление, как в SQL)
+        и маску вакансий, у которых указаны обе границы зарплаты
+        """
+
+        has_salary = ~(self.salary_min_mask | self.salary_max_mask)
+        return (self.salary_min + self.salary_max) // 2, has_salary
+
+    def _get_mean_salary(self) -> float | None:
+        """Возвращает неокруглённое среднее значение средних зарплат вакансий или None, если зарплат нет"""
+
+        average, has_salary = self._get_average_salary()
+        if not has_salary.any():
+            return None
+        return float(average[has_salary].mean())
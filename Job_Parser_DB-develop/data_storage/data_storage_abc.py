@@ -22,6 +22,15 @@ class Data_Storage(ABC):
         """
         pass
 
+    @abstractmethod
+    def add_employers_bulk(self) -> None:
+        """
+        Запрашивает у пользователя сразу список id нанимателей,
+        получает информацию обо всех нанимателях через API сайта и создаёт объекты Employer.
+        Созданные объекты добавляются в словарь employers в формате 'id: объект'
+        """
+        pass
+
     @abstractmethod
     def show_employers_info(self) -> None:
         """Выводит на экран информацию о компаниях, которые содержатся в словаре объекта этого класса"""
@@ -56,9 +65,8 @@ class Data_Storage(ABC):
         """Опустошает словарь вакансий"""
         pass
 
-    @staticmethod
     @abstractmethod
-    def _get_response(url: str, parameters: None | dict = None):
+    def _get_response(self, url: str, parameters: None | dict = None):
         """
         Отправляет запрос к API сайта, возвращает ответ
 
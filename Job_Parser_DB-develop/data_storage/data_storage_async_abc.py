@@ -0,0 +1,62 @@
+from abc import ABC, abstractmethod
+
+
+class Data_Storage_Async(ABC):
+    """
+    Класс, описывающий объекты способные искать и хранить данные с сайта,
+    отправляя запросы асинхронно (операции поиска и добавления - корутины)
+    """
+
+    # максимальное количество вакансий, которое можно запросить по одному ключевому слову
+    max_vacancies = None
+
+    @abstractmethod
+    async def find_employers(self, text: str) -> list[dict]:
+        """
+        Ищет компании, в названии которых есть указанный текст
+
+        :param text: часть названия компании
+        """
+        pass
+
+    @abstractmethod
+    async def add_employers(self, employer_ids) -> dict[str, list[str]]:
+        """
+        Получает через API сайта информацию о компаниях с указанными id и создаёт объекты Employer.
+        Созданные объекты добавляются в словарь employers в формате 'id: объект'
+
+        :param employer_ids: id компаний
+        """
+        pass
+
+    @abstractmethod
+    async def find_vacancies(self, keyword: str, number: int | None = None) -> list:
+        """
+        Находит и добавляет в словарь вакансии тех компаний, которые есть в словаре компаний
+
+        :param keyword: ключевое слово для поиска
+        :param number: искомое количество вакансий
+        """
+        pass
+
+    @abstractmethod
+    async def _get_response(self, url: str, parameters: None | dict = None):
+        """
+        Отправляет запрос к API сайта, возвращает ответ
+
+        :param url: ссылка на ресурс
+        :param parameters: параметры запроса
+        """
+        pass
+
+    @abstractmethod
+    async def _cyclic_response(self, url: str, text: str, number: int | None = None):
+        """
+        Отправляет запросы на все страницы результатов поиска.
+        Завершает работу, если закончились страницы или число элементов достигло желаемого
+
+        :param url: ссылка на ресурс
+        :param text: ключевое слово для поиска
+        :param number: искомое количество элементов
+        """
+        pass
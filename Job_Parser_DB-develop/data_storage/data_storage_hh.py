@@ -1,7 +1,20 @@
-import requests
-import json
+import os
+import re
 
+import requests
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from math import ceil
+from urllib.parse import urlsplit
+
+from api_client.api_client import API_Client
+from api_client.rate_limiter import Request_Budget_Exceeded
+from data_storage.columnar_store import Columnar_Vacancy_Store
 from data_storage.data_storage_abc import Data_Storage
+from data_storage.hh_decoder import HH_Decoder
+from data_storage.search_planner import Search_Planner
+from instrumentation.metrics import Metrics_Registry
 from entity.vacancy_hh import Vacancy_HH
 from entity.employer_hh import Employer_HH
 
@@ -19,15 +32,44 @@ class Data_Storage_HH(Data_Storage):
     max_page = 100
     # количество результатов поиска на одной странице
     per_page = 50
+    # максимальное количество страниц, загружаемых одновременно
+    max_workers = 5
+
+    # разбор ответов API сайта сразу в объекты вакансий и компаний
+    decoder = HH_Decoder()
+
+    # сообщение для пользователя, если сайт недоступен после всех повторных попыток
+    connection_error_message = "\n\033[31mНе удалось получить ответ от hh.ru, попробуйте повторить запрос позже.\033[0m"
+    # сообщение для пользователя, если исчерпан лимит запросов на один запуск программы
+    budget_error_message = "\n\033[31mИсчерпан лимит запросов к hh.ru на этот запуск программы.\033[0m"
 
-    def __init__(self) -> None:
+    def __init__(self, max_workers: int | None = None, client: API_Client | None = None) -> None:
         """
         Инициализатор объектов класса, присваивает объекту пустые словари
         для хранения объектов вакансий и нанимателей
+
+        :param max_workers: максимальное количество страниц, загружаемых одновременно,
+                            при значении 1 страницы загружаются последовательно
+        :param client: HTTP-клиент для обращения к API сайта, по умолчанию общий для всей программы
         """
 
         self.vacancies = {}
         self.employers = {}
+        self._client = client
+
+        if max_workers is not None:
+            self.max_workers = max(1, max_workers)
+
+    @property
+    def client(self) -> API_Client:
+        """
+        Возвращает HTTP-клиент для обращения к API сайта.
+        Общий клиент (вместе с кэшем ответов) создаётся при первом запросе, а не при запуске программы
+        """
+
+        if self._client is None:
+            self._client = API_Client.get_shared()
+        return self._client
 
     def find_employers(self) -> None:
         """Ищет и выводит на экран компании, в названии которых есть введённый пользователем текст"""
@@ -36,7 +78,15 @@ class Data_Storage_HH(Data_Storage):
 
         print("\nПодождите минутку, ищу подходящие компании...")
 
-        results = self._cyclic_response(self.url_employers, employer_name)
+        try:
+            results = self._cyclic_response(self.url_employers, employer_name)
+        except Request_Budget_Exceeded:
+            print(self.budget_error_message)
+            return
+        except requests.RequestException:
+            print(self.connection_error_message)
+            return
+
         counter = 0
 
         for result in results:
@@ -67,24 +117,105 @@ class Data_Storage_HH(Data_Storage):
             if employer_id.lower() == "stop":
                 break
 
-            url = self.url_employers + "/" + employer_id
-            response = self._get_response(url)
+            if not employer_id:
+                print("Такой id не найден.")
+                continue
+
+            try:
+                employer = self._get_employer(employer_id)
+            except Request_Budget_Exceeded:
+                print(self.budget_error_message)
+                break
+            except requests.RequestException:
+                print(self.connection_error_message)
+                continue
 
-            if "errors" in response or not employer_id:
+            if employer is None:
                 print("Такой id не найден.")
                 continue
 
-            employer = Employer_HH(
-                response.get("id"),
-                response.get("name"),
-                response.get("alternate_url"),
-                response.get("open_vacancies")
-            )
             new_employers[employer.employer_id] = employer
             print("Компания успешно добавлена в список.")
 
         self.employers.update(new_employers)
 
+    def add_employers_bulk(self) -> None:
+        """
+        Запрашивает у пользователя список id компаний через запятую или путь к файлу со списком id,
+        загружает информацию обо всех компаниях параллельно и добавляет их в словарь employers.
+        Выводит сводку: сколько компаний добавлено, не найдено или уже было в списке
+        """
+
+        text = input("\nВведите id компаний через запятую или путь к файлу со списком id:\n").strip()
+
+        if os.path.isfile(text):
+            with open(text, "r", encoding="UTF-8") as file:
+                text = file.read()
+
+        employer_ids = [employer_id for employer_id in re.split(r"[\s,;]+", text) if employer_id]
+        if not employer_ids:
+            print("Список id пуст.")
+            return
+
+        print("\nПодождите минутку, загружаю информацию о компаниях...")
+        summary = self.load_employers(employer_ids)
+
+        print(f"\nДобавлено компаний: {len(summary['added'])}"
+              f"\nУже были в списке: {len(summary['skipped'])}")
+        if summary["not_found"]:
+            print(f"Не найдены: {', '.join(summary['not_found'])}")
+        if summary["failed"]:
+            print(f"Не удалось загрузить из-за ошибки соединения: {', '.join(summary['failed'])}")
+        if summary["budget"]:
+            print(f"{self.budget_error_message}"
+                  f"\nНе загружены: {', '.join(summary['budget'])}")
+
+    def load_employers(self, employer_ids: Iterable[str]) -> dict[str, list[str]]:
+        """
+        Загружает информацию о компаниях с указанными id параллельно (не более max_workers запросов
+        одновременно) и добавляет их в словарь employers.
+        Повторяющиеся id, нечисловые id и id компаний, которые уже есть в словаре, не запрашиваются.
+        Id компаний, которые не загружены из-за исчерпанного бюджета запросов, попадают в список budget
+
+        :param employer_ids: id компаний
+        :return: сводка в формате 'added/skipped/not_found/failed/budget: список id'
+        """
+
+        summary = {"added": [], "skipped": [], "not_found": [], "failed": [], "budget": []}
+
+        new_ids = []
+        for employer_id in dict.fromkeys(employer_ids):
+            if employer_id in self.employers:
+                summary["skipped"].append(employer_id)
+            elif not employer_id.isdigit():
+                summary["not_found"].append(employer_id)
+            else:
+                new_ids.append(employer_id)
+
+        def fetch(employer_id: str) -> Employer_HH | None | requests.RequestException:
+            try:
+                return self._get_employer(employer_id)
+            except requests.RequestException as error:
+                return error
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            results = list(executor.map(fetch, new_ids))
+
+        new_employers = {}
+        for employer_id, employer in zip(new_ids, results):
+            if isinstance(employer, Request_Budget_Exceeded):
+                summary["budget"].append(employer_id)
+            elif isinstance(employer, requests.RequestException):
+                summary["failed"].append(employer_id)
+            elif employer is None:
+                summary["not_found"].append(employer_id)
+            else:
+                new_employers[employer.employer_id] = employer
+                summary["added"].append(employer_id)
+
+        self.employers.update(new_employers)
+        return summary
+
     def show_employers_info(self) -> None:
         """Выводит на экран информацию о компаниях, которые содержатся в словаре employers"""
 
@@ -132,11 +263,21 @@ class Data_Storage_HH(Data_Storage):
         else:
             number = number if number in range(self.max_vacancies + 1) else 50
 
-        employers = ["employer_id=" + company for company in self.employers.keys()]
-        url = self.url_vacancies + "?" + "&".join(employers)
-
         print("\nПодождите минутку, ищу подходящие вакансии...")
-        results = self._cyclic_response(url, keyword, number)[:number]
+        try:
+            if len(self.employers) > Search_Planner.shard_size:
+                # слишком много компаний для одного запроса, поиск делится на части
+                pages = Search_Planner(self).iter_pages(keyword, self.employers.keys(), number)
+                results = [item for page in pages for item in page]
+            else:
+                url = self._build_vacancies_url(self.employers.keys())
+                results = self._cyclic_response(url, keyword, number)[:number]
+        except Request_Budget_Exceeded:
+            print(self.budget_error_message)
+            return
+        except requests.RequestException:
+            print(self.connection_error_message)
+            return
 
         if not results:
             print("Вакансии по такому запросу не найдены.")
@@ -161,6 +302,42 @@ class Data_Storage_HH(Data_Storage):
             print()
             print(vacancy.get_info())
 
+    def show_vacancies_stats(self) -> None:
+        """
+        Выводит на экран сводку по найденным вакансиям без обращения к базе данных:
+        количество вакансий у каждой компании, среднюю зарплату и количество вакансий
+        с зарплатой выше средней. Для расчёта используется колоночное хранилище (нужен numpy)
+        """
+
+        if not self.vacancies:
+            print("\nСписок вакансий пуст.")
+            return
+
+        try:
+            store = self.get_columnar_store()
+        except ImportError as error:
+            print(f"\n{error}.")
+            return
+
+        print()
+        for employer_id, count in store.count_by_employer().items():
+            employer = self.employers.get(str(employer_id))
+            print(f"{employer or employer_id}: {count} вакансий")
+
+        print(f"\nВсего вакансий: {len(store)}"
+              f"\nСредняя зарплата: {store.avg_salary()}"
+              f"\nВакансий с зарплатой выше средней: {int(store.higher_salary().sum())}")
+
+    def get_columnar_store(self) -> Columnar_Vacancy_Store:
+        """
+        Возвращает колоночное хранилище, построенное по словарю vacancies,
+        для векторных фильтров и агрегатов
+
+        :raises ImportError: если не установлен numpy
+        """
+
+        return Columnar_Vacancy_Store.from_vacancies(self.vacancies.values())
+
     def clear_vacancies(self) -> None:
         """Опустошает словарь вакансий"""
 
@@ -168,19 +345,77 @@ class Data_Storage_HH(Data_Storage):
         print("\nСписок вакансий очищен.")
 
     @staticmethod
-    def _get_response(url: str, parameters: None | dict = None) -> list[dict] | dict:
+    def _create_employer(response: dict) -> Employer_HH:
+        """
+        Создаёт объект Employer_HH из ответа API сайта о компании
+
+        :param response: информация о компании в формате словаря
+        """
+
+        return Employer_HH(
+            response.get("id"),
+            response.get("name"),
+            response.get("alternate_url"),
+            response.get("open_vacancies")
+        )
+
+    def _build_vacancies_url(self, employer_ids: Iterable[str]) -> str:
+        """
+        Возвращает ссылку для поиска вакансий указанных компаний
+
+        :param employer_ids: id компаний
+        """
+
+        employers = ["employer_id=" + employer_id for employer_id in employer_ids]
+        return self.url_vacancies + "?" + "&".join(employers)
+
+    def _get_response(self, url: str, parameters: None | dict = None) -> list[dict] | dict:
+        """
+        Отправляет запрос к API сайта через HTTP-клиент, возвращает ответ в виде списка словарей
+
+        :param url: ссылка на ресурс
+        :param parameters: параметры запроса
+
+        :raises requests.RequestException: если сайт недоступен или отвечает ошибкой после всех повторов
+        """
+
+        return self.client.get_json(url, parameters)
+
+    def _get_page(self, url: str, parameters: dict) -> tuple[list[dict], int, int | None]:
         """
-        Отправляет запрос к API сайта, возвращает ответ в виде списка словарей
+        Запрашивает страницу результатов поиска и возвращает её элементы в виде словарей,
+        общее количество страниц и количество найденных элементов (None, если его нет в ответе).
+        Ответ без списка items (например, описание ошибки) считается пустой страницей
 
         :param url: ссылка на ресурс
         :param parameters: параметры запроса
         """
 
-        with requests.get(url, parameters) as request:
-            response = request.content.decode("utf-8")
-            response = json.loads(response)
+        response = self._get_response(url, parameters)
+        return response.get("items", []), response.get("pages", 0), response.get("found")
 
-        return response
+    def _get_vacancies_page(self, url: str, parameters: dict) -> tuple[list[Vacancy_HH], int, int | None]:
+        """
+        Запрашивает страницу результатов поиска вакансий и возвращает её вакансии в виде объектов Vacancy_HH,
+        общее количество страниц и количество найденных вакансий.
+        Тело ответа разбирается сразу в объекты (HH_Decoder), без словарей
+
+        :param url: ссылка на ресурс
+        :param parameters: параметры запроса
+        """
+
+        return self.decoder.decode_vacancies_page(self.client.get_content(url, parameters))
+
+    def _get_employer(self, employer_id: str) -> Employer_HH | None:
+        """
+        Запрашивает информацию о компании и возвращает объект Employer_HH или None, если компания не найдена
+
+        :param employer_id: id компании
+
+        :raises requests.RequestException: если сайт недоступен или отвечает ошибкой после всех повторов
+        """
+
+        return self.decoder.decode_employer(self.client.get_content(self.url_employers + "/" + employer_id))
 
     def _cyclic_response(self, url: str, text: str, number: int | None = None) -> list[dict]:
         """
@@ -191,23 +426,138 @@ class Data_Storage_HH(Data_Storage):
         :param text: ключевое слово для поиска
         :param number: искомое количество элементов
         """
-        page = 0
-        per_page = self.per_page
-        parameters = {"text": text, "page": page, "per_page": per_page}
+
         results = []
+        for items in self._iter_pages(url, text, number):
+            results.extend(items)
+
+        return results
+
+    def _iter_pages(self,
+                    url: str,
+                    text: str,
+                    number: int | None = None,
+                    extra_parameters: dict | None = None,
+                    as_vacancies: bool = False,
+                    first_page: tuple | None = None) -> Iterator[list[dict]] | Iterator[list[Vacancy_HH]]:
+        """
+        Возвращает генератор, который по порядку выдаёт элементы каждой страницы результатов запроса.
+
+        Первая страница запрашивается отдельно, чтобы узнать общее число страниц,
+        остальные загружаются параллельно (не более max_workers одновременно).
+        Ответ без списка items (например, описание ошибки) считается пустой страницей.
+        Страницы выдаются строго по порядку, загрузка прекращается,
+        как только число элементов достигло желаемого
+
+        :param url: ссылка на ресурс
+        :param text: ключевое слово для поиска
+        :param number: искомое количество элементов
+        :param extra_parameters: дополнительные параметры запроса, например date_from
+        :param as_vacancies: выдавать вакансии объектами Vacancy_HH, разобранными сразу из тела ответа,
+                             вместо словарей
+        :param first_page: уже полученная первая страница (результат _get_page или _get_vacancies_page
+                           с теми же параметрами), чтобы не запрашивать её повторно
+        """
+
+        if self.max_workers <= 1:
+            yield from self._iter_pages_sequentially(url, text, number, extra_parameters, as_vacancies, first_page)
+            return
+
+        get_page = self._get_vacancies_page if as_vacancies else self._get_page
+        parameters = {**(extra_parameters or {}), "text": text, "page": 0, "per_page": self.per_page}
+
+        items, total_pages, _ = first_page or get_page(url, parameters)
+        collected = len(items)
+        self._record_page(url, items)
+        yield items
+
+        last_page = min(total_pages, self.max_page)
+        if number:
+            last_page = min(last_page, ceil(number / self.per_page))
+            if collected >= number:
+                return
+
+        pages = iter(range(1, last_page))
+        pending = deque()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            try:
+                for page in pages:
+                    pending.append(executor.submit(get_page, url, {**parameters, "page": page}))
+                    if len(pending) >= self.max_workers:
+                        break
+
+                while pending:
+                    items = pending.popleft().result()[0]
+                    collected += len(items)
+                    self._record_page(url, items)
+                    yield items
+
+                    if number and collected >= number:
+                        break
+
+                    page = next(pages, None)
+                    if page is not None:
+                        pending.append(executor.submit(get_page, url, {**parameters, "page": page}))
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def _iter_pages_sequentially(self,
+                                 url: str,
+                                 text: str,
+                                 number: int | None = None,
+                                 extra_parameters: dict | None = None,
+                                 as_vacancies: bool = False,
+                                 first_page: tuple | None = None) -> Iterator[list[dict]] | Iterator[list[Vacancy_HH]]:
+        """
+        Возвращает генератор, который выдаёт элементы каждой страницы результатов запроса,
+        запрашивая страницы по одной
+
+        :param url: ссылка на ресурс
+        :param text: ключевое слово для поиска
+        :param number: искомое количество элементов
+        :param extra_parameters: дополнительные параметры запроса, например date_from
+        :param as_vacancies: выдавать вакансии объектами Vacancy_HH вместо словарей
+        :param first_page: уже полученная первая страница, чтобы не запрашивать её повторно
+        """
+
+        get_page = self._get_vacancies_page if as_vacancies else self._get_page
+        parameters = {**(extra_parameters or {}), "text": text, "page": 0, "per_page": self.per_page}
+        collected = 0
 
         while True:
-            response = self._get_response(url, parameters)
-            results.extend(response["items"])
+            if first_page is not None:
+                (items, total_pages, _), first_page = first_page, None
+            else:
+                items, total_pages, _ = get_page(url, parameters)
+            collected += len(items)
+            self._record_page(url, items)
+            yield items
 
-            total_pages = response.get("pages")
             parameters["page"] += 1
 
-            if number and len(results) > number:
+            if number and collected > number:
                 break
             elif parameters["page"] >= total_pages:
                 break
             elif parameters["page"] >= self.max_page:
                 break
 
-        return results
+    @staticmethod
+    def _record_page(url: str, items: list[dict]) -> None:
+        """
+        Записывает в метрики полученную страницу результатов: количество страниц
+        и гистограмму количества элементов на странице по ресурсу
+
+        :param url: ссылка на ресурс (без параметров запроса)
+        :param items: элементы страницы
+        """
+
+        resource = urlsplit(url).path.rstrip("/").rsplit("/", 1)[-1]
+        metrics = Metrics_Registry.get_shared()
+        metrics.increment("hh_pages_total", labels={"resource": resource},
+                          description="Количество полученных страниц результатов поиска")
+        metrics.observe("hh_page_items", len(items), labels={"resource": resource},
+                        buckets=(0, 1, 10, 25, 50, 100),
+                        description="Количество элементов на странице результатов поиска")
@@ -0,0 +1,203 @@
+import asyncio
+from collections.abc import Iterable
+from math import ceil
+
+import requests
+
+from api_client.async_api_client import Async_API_Client
+from api_client.rate_limiter import Request_Budget_Exceeded
+from data_storage.data_storage_async_abc import Data_Storage_Async
+from data_storage.data_storage_hh import Data_Storage_HH
+from data_storage.search_planner import Search_Planner
+from entity.vacancy_hh import Vacancy_HH
+
+
+class Data_Storage_HH_Async(Data_Storage_Async):
+    """
+    Асинхронный вариант Data_Storage_HH: ищет и хранит данные с сайта https://hh.ru,
+    отправляя все запросы через один асинхронный HTTP-клиент.
+
+    Методы не спрашивают данные у пользователя и ничего не выводят на экран,
+    поэтому подходят для загрузки вакансий по многим компаниям и ключевым словам сразу:
+    все страницы и все запросы выполняются одновременно в одном потоке,
+    а их количество и частота ограничиваются клиентом
+    """
+
+    # основные ссылки, использующиеся для обращения к API сайта
+    url_employers = Data_Storage_HH.url_employers
+    url_vacancies = Data_Storage_HH.url_vacancies
+
+    # максимальное количество вакансий, которое можно запросить по одному ключевому слову
+    max_vacancies = Data_Storage_HH.max_vacancies
+    # максимальное разрешенное количество страниц для выдачи результатов запроса
+    max_page = Data_Storage_HH.max_page
+    # количество результатов поиска на одной странице
+    per_page = Data_Storage_HH.per_page
+
+    def __init__(self, client: Async_API_Client | None = None) -> None:
+        """
+        Инициализатор объектов класса, присваивает объекту пустые словари
+        для хранения объектов вакансий и нанимателей
+
+        :param client: асинхронный HTTP-клиент, по умолчанию создаётся новый
+        """
+
+        self.vacancies = {}
+        self.employers = {}
+        self.client = client or Async_API_Client()
+
+    async def find_employers(self, text: str) -> list[dict]:
+        """
+        Ищет компании, в названии которых есть указанный текст
+
+        :param text: часть названия компании
+        :return: информация о найденных компаниях в формате словарей API сайта
+        """
+
+        return await self._cyclic_response(self.url_employers, text.lower().strip())
+
+    async def add_employers(self, employer_ids: Iterable[str]) -> dict[str, list[str]]:
+        """
+        Загружает информацию о компаниях с указанными id одновременно и добавляет их в словарь employers.
+        Повторяющиеся id, нечисловые id и id компаний, которые уже есть в словаре, не запрашиваются.
+        Id компаний, которые не загружены из-за исчерпанного бюджета запросов, попадают в список budget
+
+        :param employer_ids: id компаний
+        :return: сводка в формате 'added/skipped/not_found/failed/budget: список id'
+        """
+
+        summary = {"added": [], "skipped": [], "not_found": [], "failed": [], "budget": []}
+
+        new_ids = []
+        for employer_id in dict.fromkeys(employer_ids):
+            if employer_id in self.employers:
+                summary["skipped"].append(employer_id)
+            elif not employer_id.isdigit():
+                summary["not_found"].append(employer_id)
+            else:
+                new_ids.append(employer_id)
+
+        responses = await asyncio.gather(
+            *(self._get_response(self.url_employers + "/" + employer_id) for employer_id in new_ids),
+            return_exceptions=True
+        )
+
+        for employer_id, response in zip(new_ids, responses):
+            if isinstance(response, Request_Budget_Exceeded):
+                summary["budget"].append(employer_id)
+            elif isinstance(response, requests.RequestException):
+                summary["failed"].append(employer_id)
+            elif isinstance(response, BaseException):
+                raise response
+            elif "errors" in response or "id" not in response:
+                summary["not_found"].append(employer_id)
+            else:
+                employer = Data_Storage_HH._create_employer(response)
+                self.employers[employer.employer_id] = employer
+                summary["added"].append(employer_id)
+
+        return summary
+
+    async def find_vacancies(self, keyword: str, number: int | None = None) -> list[Vacancy_HH]:
+        """
+        Находит и добавляет в словарь vacancies вакансии компаний из словаря employers.
+        Компании делятся на группы по Search_Planner.shard_size, чтобы ссылка не была слишком длинной,
+        группы загружаются одновременно
+
+        :param keyword: ключевое слово для поиска
+        :param number: искомое количество вакансий, но не больше max_vacancies
+        :return: найденные вакансии без повторов
+        """
+
+        if not self.employers:
+            return []
+
+        number = min(number or self.max_vacancies, self.max_vacancies)
+        employer_ids = list(self.employers)
+        urls = [self._build_vacancies_url(employer_ids[start:start + Search_Planner.shard_size])
+                for start in range(0, len(employer_ids), Search_Planner.shard_size)]
+
+        pages = await asyncio.gather(*(self._cyclic_response(url, keyword.lower().strip(), number) for url in urls))
+
+        results = {}
+        for items in pages:
+            for item in items:
+                results.setdefault(item.get("id"), item)
+
+        found = []
+        for vacancy_id, item in list(results.items())[:number]:
+            vacancy = self.vacancies.get(vacancy_id)
+            if vacancy is None:
+                vacancy = self.vacancies[vacancy_id] = Vacancy_HH(item)
+            found.append(vacancy)
+
+        return found
+
+    async def find_vacancies_many(self,
+                                  keywords: Iterable[str],
+                                  number: int | None = None) -> dict[str, list[Vacancy_HH]]:
+        """
+        Ищет вакансии сразу по нескольким ключевым словам, все поиски выполняются одновременно
+
+        :param keywords: ключевые слова для поиска
+        :param number: искомое количество вакансий по каждому ключевому слову
+        :return: найденные вакансии в формате 'ключевое слово: список вакансий'
+        """
+
+        keywords = list(dict.fromkeys(keywords))
+        results = await asyncio.gather(*(self.find_vacancies(keyword, number) for keyword in keywords))
+        return dict(zip(keywords, results))
+
+    async def close(self) -> None:
+        """Закрывает HTTP-клиент"""
+
+        await self.client.close()
+
+    # ссылка для поиска вакансий строится, а страницы записываются в метрики так же, как у синхронного варианта
+    _build_vacancies_url = Data_Storage_HH._build_vacancies_url
+    _record_page = staticmethod(Data_Storage_HH._record_page)
+
+    async def _get_response(self, url: str, parameters: None | dict = None) -> list[dict] | dict:
+        """
+        Отправляет запрос к API сайта через асинхронный HTTP-клиент, возвращает ответ
+
+        :param url: ссылка на ресурс
+        :param parameters: параметры запроса
+
+        :raises requests.RequestException: если сайт недоступен или отвечает ошибкой после всех повторов
+        """
+
+        return await self.client.get_json(url, parameters)
+
+    async def _cyclic_response(self, url: str, text: str, number: int | None = None) -> list[dict]:
+        """
+        Запрашивает первую страницу результатов, чтобы узнать общее число страниц,
+        затем все остальные нужные страницы одновременно.
+        Элементы возвращаются в порядке страниц
+
+        :param url: ссылка на ресурс
+        :param text: ключевое слово для поиска
+        :param number: искомое количество элементов
+        """
+
+        parameters = {"text": text, "page": 0, "per_page": self.per_page}
+
+        response = await self._get_response(url, parameters)
+        results = list(response.get("items", []))
+        self._record_page(url, results)
+
+        last_page = min(response.get("pages", 1), self.max_page)
+        if number:
+            if len(results) >= number:
+                return results
+            last_page = min(last_page, ceil(number / self.per_page))
+
+        responses = await asyncio.gather(
+            *(self._get_response(url, {**parameters, "page": page}) for page in range(1, last_page))
+        )
+        for response in responses:
+            items = response.get("items", [])
+            self._record_page(url, items)
+            results.extend(items)
+
+        return results
@@ -0,0 +1,151 @@
+from functools import lru_cache
+
+from api_client import json_decoder
+from api_client.json_decoder import Json_Decoder
+from entity.employer_hh import Employer_HH
+from entity.vacancy_hh import Vacancy_HH
+
+
+@lru_cache
+def _define_structs() -> tuple[type, type]:
+    """
+    Объявляет структуры ответов API hh.ru (требуется msgspec) и возвращает структуры
+    страницы результатов поиска вакансий и компании.
+    Объявлены только поля, которые используют Vacancy_HH и Employer_HH,
+    остальные поля (описание, адрес, логотипы и т.д.) пропускаются при разборе без создания объектов
+    """
+
+    msgspec = json_decoder.msgspec
+
+    class _Area(msgspec.Struct):
+        name: str | None = None
+
+    class _Employer_Ref(msgspec.Struct):
+        id: str | None = None
+
+    class _Salary(msgspec.Struct):
+        from_: int | float | None = msgspec.field(default=None, name="from")
+        to: int | float | None = None
+        currency: str | None = None
+
+    class _Vacancy(msgspec.Struct):
+        id: str | None = None
+        name: str | None = None
+        area: _Area | None = None
+        alternate_url: str | None = None
+        employer: _Employer_Ref | None = None
+        published_at: str | None = None
+        salary: _Salary | None = None
+
+    class _Vacancies_Page(msgspec.Struct):
+        items: list[_Vacancy] = []
+        pages: int = 0
+        found: int | None = None
+
+    class _Employer(msgspec.Struct):
+        id: str | None = None
+        name: str | None = None
+        alternate_url: str | None = None
+        open_vacancies: int | None = None
+
+    return _Vacancies_Page, _Employer
+
+
+class HH_Decoder:
+    """
+    Разбор ответов API сайта https://hh.ru сразу в объекты Vacancy_HH и Employer_HH.
+
+    Если установлен msgspec, тело ответа разбирается из байтов в типизированные структуры,
+    в которых объявлены только нужные поля: остальные поля ответа пропускаются,
+    промежуточные словари не создаются. Без msgspec тело ответа разбирается
+    в словари (orjson или стандартным модулем json, см. Json_Decoder), из которых создаются объекты.
+    Если ответ не соответствует структуре (например, API сайта изменило тип поля),
+    он разбирается вторым способом.
+    Библиотеки разбора и структуры ответов загружаются при разборе первого ответа
+    """
+
+    def __init__(self) -> None:
+        """Инициализатор объектов класса"""
+
+        self.typed = False
+        self._loaded = False
+
+    def _load(self) -> None:
+        """Загружает библиотеки разбора JSON и создаёт декодеры структур (если установлен msgspec)"""
+
+        if self._loaded:
+            return
+
+        json_decoder.import_backends()
+        msgspec = json_decoder.msgspec
+        if msgspec is not None:
+            page_struct, employer_struct = _define_structs()
+            self._page_decoder = msgspec.json.Decoder(page_struct)
+            self._employer_decoder = msgspec.json.Decoder(employer_struct)
+            self.typed = True
+        self._loaded = True
+
+    def decode_vacancies_page(self, content: bytes) -> tuple[list[Vacancy_HH], int, int | None]:
+        """
+        Разбирает страницу результатов поиска вакансий и возвращает вакансии, общее количество страниц
+        и количество найденных вакансий (None, если его нет в ответе).
+        Ответ без списка items (например, описание ошибки) считается пустой страницей
+
+        :param content: тело ответа в байтах
+        """
+
+        self._load()
+        if self.typed:
+            try:
+                page = self._page_decoder.decode(content)
+            except json_decoder.msgspec.DecodeError:
+                pass
+            else:
+                return [self._create_vacancy(item) for item in page.items], page.pages, page.found
+
+        response = Json_Decoder.loads(content)
+        return ([Vacancy_HH(item) for item in response.get("items", [])], response.get("pages", 0),
+                response.get("found"))
+
+    def decode_employer(self, content: bytes) -> Employer_HH | None:
+        """
+        Разбирает ответ с информацией о компании, возвращает None, если компания не найдена
+
+        :param content: тело ответа в байтах
+        """
+
+        self._load()
+        if self.typed:
+            try:
+                employer = self._employer_decoder.decode(content)
+            except json_decoder.msgspec.DecodeError:
+                pass
+            else:
+                if employer.id is None:
+                    return None
+                return Employer_HH(employer.id, employer.name, employer.alternate_url, employer.open_vacancies)
+
+        response = Json_Decoder.loads(content)
+        if "errors" in response or "id" not in response:
+            return None
+        return Employer_HH(response.get("id"), response.get("name"), response.get("alternate_url"),
+                           response.get("open_vacancies"))
+
+    @staticmethod
+    def _create_vacancy(item) -> Vacancy_HH:
+        """
+        Создаёт объект Vacancy_HH из структуры вакансии
+
+        :param item: вакансия, разобранная msgspec
+        """
+
+        salary = item.salary
+        return Vacancy_HH.from_values(
+            item.id,
+            item.name,
+            item.area.name if item.area else None,
+            item.alternate_url,
+            item.employer.id if item.employer else None,
+            item.published_at,
+            (salary.from_, salary.to, salary.currency) if salary else None
+        )
@@ -0,0 +1,196 @@
+from collections import deque
+from collections.abc import Iterable, Iterator
+from datetime import datetime, timedelta, timezone
+from operator import attrgetter, methodcaller
+
+import requests
+
+from entity.vacancy_hh import Vacancy_HH
+from instrumentation.instrumentation import Instrumentation
+
+
+class Search_Planner:
+    """
+    Планировщик поиска вакансий большого числа компаний на сайте https://hh.ru.
+
+    API сайта выдаёт по одному запросу не больше result_window вакансий, а ссылка
+    с сотнями параметров employer_id становится слишком длинной. Поэтому список компаний
+    делится на части (шарды) по shard_size компаний; если в шарде всё равно найдено больше
+    result_window вакансий, он делится пополам по компаниям, а шард с одной компанией -
+    пополам по периоду публикации (date_from / date_to).
+    Шарды загружаются по одному и только по мере того, как выдаются их вакансии:
+    первая страница шарда показывает количество найденных вакансий и, если шард делить не нужно,
+    сразу выдаётся, остальные страницы загружаются параллельно внутри шарда (Data_Storage_HH._iter_pages).
+    Поэтому в памяти нет результатов других шардов, а первые вакансии выдаются после первого запроса.
+    Результаты объединяются без повторов по id вакансии.
+    Если шард с одной компанией нельзя разделить дальше (период публикации не больше min_period),
+    выдаются только его первые result_window вакансий: это записывается в журнал,
+    а id компании добавляется в переданное множество truncated
+    """
+
+    # максимальное количество компаний в одном запросе
+    shard_size = 20
+    # максимальное количество результатов, которое API сайта выдаёт по одному запросу
+    result_window = 2000
+    # hh.ru ищет вакансии, опубликованные или обновлённые за этот период
+    search_period = timedelta(days=30)
+    # минимальный период публикации, дальше которого шард не делится
+    min_period = timedelta(hours=1)
+
+    # формат даты, который принимает API сайта
+    date_format = "%Y-%m-%dT%H:%M:%S%z"
+
+    def __init__(self, data_storage, shard_size: int | None = None) -> None:
+        """
+        Инициализатор объектов класса
+
+        :param data_storage: объект Data_Storage_HH, через который отправляются запросы к API сайта
+        :param shard_size: максимальное количество компаний в одном запросе
+        """
+
+        self.data_storage = data_storage
+        if shard_size is not None:
+            self.shard_size = max(1, shard_size)
+
+    def iter_pages(self,
+                   keyword: str,
+                   employer_ids: Iterable[str],
+                   number: int | None = None,
+                   parameters: dict | None = None,
+                   as_vacancies: bool = False,
+                   truncated: set[str] | None = None) -> Iterator[list[dict]] | Iterator[list[Vacancy_HH]]:
+        """
+        Возвращает генератор, который выдаёт страницы вакансий всех шардов без повторов по id.
+        Шард - словарь с ключами employer_ids, date_from и date_to.
+        Если компаний не больше shard_size и результаты не обрезаны, выполняется один обычный поиск.
+        Загрузка прекращается, как только число вакансий достигло желаемого
+
+        :param keyword: ключевое слово для поиска
+        :param employer_ids: id компаний
+        :param number: искомое количество вакансий, по умолчанию все найденные
+        :param parameters: дополнительные параметры запроса, например date_from
+        :param as_vacancies: выдавать вакансии объектами Vacancy_HH вместо словарей
+        :param truncated: опциональный параметр, множество, в которое добавляются id компаний,
+                          выданные вакансии которых неполные, так как шард нельзя разделить дальше
+
+        :raises requests.RequestException: если в ответе на первую страницу шарда нет количества
+                                           найденных вакансий (например, API сайта вернуло описание ошибки)
+        """
+
+        employer_ids = list(employer_ids)
+        pending = deque({"employer_ids": employer_ids[start:start + self.shard_size],
+                         "date_from": None, "date_to": None}
+                        for start in range(0, len(employer_ids), self.shard_size))
+        get_page = self.data_storage._get_vacancies_page if as_vacancies else self.data_storage._get_page
+        get_id = attrgetter("vacancy_id") if as_vacancies else methodcaller("get", "id")
+        seen = set()
+        collected = 0
+
+        while pending:
+            shard = pending.popleft()
+            url = self.data_storage._build_vacancies_url(shard["employer_ids"])
+            shard_parameters = self._get_parameters(shard, parameters)
+            first_page = get_page(url, {**shard_parameters, "text": keyword, "page": 0,
+                                        "per_page": self.data_storage.per_page})
+
+            found = first_page[2]
+            if found is None:
+                raise requests.RequestException(f"Ответ API сайта без количества найденных вакансий: {url}")
+
+            remaining = number - collected if number else None
+            # шард делится, только если нужны вакансии за пределами первых result_window
+            if found > self.result_window and not (remaining and remaining <= self.result_window):
+                halves = self._split(shard, parameters)
+                if halves:
+                    pending.extendleft(reversed(halves))
+                    continue
+                # шард нельзя разделить дальше, будут получены только первые result_window вакансий
+                Instrumentation.get_logger("search_planner").warning(
+                    "Результаты поиска обрезаны: найдено %s вакансий, выдаётся %s (компании %s, период %s - %s)",
+                    found, self.result_window, ", ".join(shard["employer_ids"]),
+                    *self._get_period(shard, parameters))
+                if truncated is not None:
+                    truncated.update(shard["employer_ids"])
+
+            for page in self.data_storage._iter_pages(url, keyword, remaining, shard_parameters, as_vacancies,
+                                                      first_page):
+                items = [item for item in page if get_id(item) not in seen]
+                seen.update(map(get_id, items))
+                if number:
+                    items = items[:number - collected]
+                collected += len(items)
+                if items:
+                    yield items
+                if number and collected >= number:
+                    return
+
+    def _split(self, shard: dict, parameters: dict | None) -> list[dict]:
+        """
+        Делит шард пополам: сначала по компаниям, для одной компании - по периоду публикации.
+        Возвращает пустой список, если шард делить дальше нельзя
+
+        :param shard: шард
+        :param parameters: дополнительные параметры запроса
+        """
+
+        employer_ids = shard["employer_ids"]
+        if len(employer_ids) > 1:
+            middle = len(employer_ids) // 2
+            return [{**shard, "employer_ids": employer_ids[:middle]},
+                    {**shard, "employer_ids": employer_ids[middle:]}]
+
+        date_from, date_to = self._get_period(shard, parameters)
+        if date_to - date_from <= self.min_period:
+            return []
+
+        middle = date_from + (date_to - date_from) / 2
+        return [{**shard, "date_from": date_from, "date_to": middle},
+                {**shard, "date_from": middle, "date_to": date_to}]
+
+    def _get_period(self, shard: dict, parameters: dict | None) -> tuple[datetime, datetime]:
+        """
+        Возвращает период публикации шарда. Если он не задан, берутся даты из параметров запроса
+        или весь период поиска hh.ru
+
+        :param shard: шард
+        :param parameters: дополнительные параметры запроса
+        """
+
+        parameters = parameters or {}
+        now = datetime.now(timezone.utc)
+
+        date_from = shard["date_from"]
+        if date_from is None:
+            date_from = self._parse_date(parameters.get("date_from")) or now - self.search_period
+
+        date_to = shard["date_to"]
+        if date_to is None:
+            date_to = self._parse_date(parameters.get("date_to")) or now
+
+        return date_from, date_to
+
+    def _get_parameters(self, shard: dict, parameters: dict | None) -> dict:
+        """
+        Возвращает параметры запроса для шарда
+
+        :param shard: шард
+        :param parameters: дополнительные параметры запроса
+        """
+
+        parameters = dict(parameters or {})
+        if shard["date_from"] is not None:
+            parameters["date_from"] = shard["date_from"].strftime(self.date_format)
+        if shard["date_to"] is not None:
+            parameters["date_to"] = shard["date_to"].strftime(self.date_format)
+        return parameters
+
+    @classmethod
+    def _parse_date(cls, value: str | None) -> datetime | None:
+        """Преобразует дату из формата API сайта в объект datetime"""
+
+        if not value:
+            return None
+        try:
+            return datetime.strptime(value, cls.date_format)
+        except ValueError:
+            return datetime.fromisoformat(value)
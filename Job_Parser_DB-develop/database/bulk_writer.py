@@ -0,0 +1,228 @@
+import csv
+import hashlib
+import io
+import time
+from collections.abc import Iterable
+from functools import lru_cache
+
+from psycopg2.extensions import connection, cursor
+from psycopg2.extras import execute_values
+
+from entity.entity_abc import Entity
+
+
+class Bulk_Writer:
+    """
+    Класс для пакетного сохранения сущностей в базу данных.
+
+    Сущности группируются по набору полей, строка запроса для каждой группы строится один раз.
+    Небольшие группы отправляются пачками через execute_values,
+    крупные загружаются командой COPY во временную таблицу и переносятся в основную
+    одним запросом INSERT ... SELECT ... ON CONFLICT.
+    Строки каждой группы записываются в порядке первичного ключа (первого поля), поэтому
+    одновременные сохранения пересекающихся наборов строк блокируют их в одном порядке
+    и не попадают во взаимоблокировку.
+
+    К каждой строке добавляется контрольная сумма её значений (поле content_hash),
+    существующая строка перезаписывается, только если контрольная сумма изменилась,
+    поэтому повторное сохранение тех же данных не создаёт новых версий строк в таблице и индексах.
+    Поля из reset_fields получают указанное значение при каждом сохранении строки,
+    и строка с другим значением такого поля перезаписывается, даже если контрольная сумма не изменилась
+    """
+
+    # количество строк в одном запросе INSERT
+    batch_size = 1000
+    # начиная с этого количества строк в группе используется загрузка через COPY
+    copy_threshold = 10_000
+
+    # поле таблицы с контрольной суммой значений строки
+    hash_field = "content_hash"
+    # поля, которые сбрасываются при сохранении строки, в формате 'таблица: (поле, значение)':
+    # сохранённая вакансия есть на сайте, поэтому снова считается открытой (см. Incremental_Sync)
+    reset_fields = {"vacancies": ("is_closed", "FALSE")}
+
+    def __init__(self,
+                 conn: connection,
+                 batch_size: int | None = None,
+                 copy_threshold: int | None = None) -> None:
+        """
+        Инициализатор объектов класса
+
+        :param conn: открытое соединение с базой данных
+        :param batch_size: количество строк в одном запросе INSERT
+        :param copy_threshold: количество строк в группе, начиная с которого используется COPY
+        """
+
+        self.conn = conn
+        if batch_size is not None:
+            self.batch_size = batch_size
+        if copy_threshold is not None:
+            self.copy_threshold = copy_threshold
+
+    def write(self, table_name: str, entities: Iterable[Entity]) -> dict[str, int | float]:
+        """
+        Сохраняет сущности в указанную таблицу (вставка или обновление по первому полю)
+        и возвращает статистику: количество строк, из них новых (inserted), изменённых (updated)
+        и оставшихся без изменений (unchanged), время и скорость записи.
+        Фиксация транзакции остаётся за вызывающим кодом
+
+        :param table_name: имя таблицы, в которую будут сохранены значения
+        :param entities: сущности-наследники класса Entity
+        """
+
+        start = time.perf_counter()
+
+        groups = {}
+        for entity in entities:
+            values = entity.get_values()
+            groups.setdefault(entity.get_fields(), []).append((*values, self.get_content_hash(values)))
+
+        rows = inserted = updated = 0
+        cur = self.conn.cursor()
+        try:
+            for fields, values in groups.items():
+                fields = (*fields, self.hash_field)
+                values.sort(key=self._get_sort_key)
+                if len(values) >= self.copy_threshold:
+                    group_inserted, group_updated = self._copy_and_merge(cur, table_name, fields, values)
+                else:
+                    results = execute_values(cur, self._get_insert_string(table_name, fields), values,
+                                             page_size=self.batch_size, fetch=True)
+                    group_inserted = sum(1 for (is_inserted,) in results if is_inserted)
+                    group_updated = len(results) - group_inserted
+                rows += len(values)
+                inserted += group_inserted
+                updated += group_updated
+        finally:
+            cur.close()
+
+        seconds = time.perf_counter() - start
+        return {"rows": rows,
+                "inserted": inserted,
+                "updated": updated,
+                "unchanged": rows - inserted - updated,
+                "seconds": round(seconds, 3),
+                "rows_per_second": round(rows / seconds) if seconds else rows}
+
+    @staticmethod
+    def get_content_hash(values: tuple) -> str:
+        """
+        Возвращает контрольную сумму (MD5) значений строки.
+        Значения get_values - строки или None, поэтому их представление однозначно и не зависит от запуска
+
+        :param values: значения полей строки
+        """
+
+        return hashlib.md5(repr(values).encode("UTF-8")).hexdigest()
+
+    @staticmethod
+    def _get_sort_key(row: tuple) -> tuple:
+        """
+        Возвращает ключ сортировки строки по первичному ключу (первому полю).
+        Числовые id (строки из цифр или числа) сравниваются как числа, в том же порядке, что и в базе данных,
+        строки без значения ключа ставятся в конец
+
+        :param row: значения полей строки
+        """
+
+        key = row[0]
+        if key is None:
+            return 2, 0, ""
+        key = str(key)
+        return (0, int(key), "") if key.isdigit() else (1, 0, key)
+
+    def _copy_and_merge(self, cur: cursor, table_name: str, fields: tuple, values: list[tuple]) -> tuple[int, int]:
+        """
+        Загружает строки командой COPY во временную таблицу
+        и переносит их в основную таблицу одним запросом.
+        Возвращает количество вставленных и обновлённых строк
+
+        :param cur: курсор открытого соединения
+        :param table_name: имя основной таблицы
+        :param fields: названия полей таблицы в формате кортежа
+        :param values: значения полей для каждой строки
+        """
+
+        temp_table = f"tmp_{table_name}"
+        field_names = ", ".join(fields)
+
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(values)
+        buffer.seek(0)
+
+        cur.execute(f"DROP TABLE IF EXISTS {temp_table}")
+        cur.execute(f"CREATE TEMP TABLE {temp_table} (LIKE {table_name} INCLUDING DEFAULTS)")
+        cur.copy_expert(f"COPY {temp_table} ({field_names}) FROM STDIN WITH (FORMAT csv)", buffer)
+        cur.execute(self._get_merge_string(table_name, temp_table, fields))
+        inserted, updated = cur.fetchone()
+        cur.execute(f"DROP TABLE {temp_table}")
+        return inserted, updated
+
+    @classmethod
+    @lru_cache
+    def _get_insert_string(cls, table_name: str, fields: tuple) -> str:
+        """
+        Возвращает строку, которая будет использована для пакетной вставки значений через execute_values
+
+        :param table_name: имя таблицы
+        :param fields: названия полей таблицы в формате кортежа
+
+        :return: строка вида "INSERT INTO table_name (field_1, field_2...) VALUES %s ON CONFLICT ...",
+                 запрос возвращает по строке (xmax = 0) для каждой вставленной или изменённой строки
+        """
+
+        field_names = ", ".join(fields)
+
+        return f"""
+               INSERT INTO {table_name} ({field_names})
+               VALUES %s
+               {cls._get_conflict_clause(table_name, fields)}
+               RETURNING (xmax = 0);
+               """
+
+    @classmethod
+    @lru_cache
+    def _get_merge_string(cls, table_name: str, temp_table: str, fields: tuple) -> str:
+        """
+        Возвращает строку для переноса значений из временной таблицы в основную.
+        Запрос возвращает одну строку: количество вставленных и обновлённых строк
+
+        :param table_name: имя основной таблицы
+        :param temp_table: имя временной таблицы
+        :param fields: названия полей таблицы в формате кортежа
+        """
+
+        field_names = ", ".join(fields)
+
+        return f"""
+               WITH merged AS (
+                   INSERT INTO {table_name} ({field_names})
+                   SELECT {field_names} FROM {temp_table} ORDER BY {fields[0]}
+                   {cls._get_conflict_clause(table_name, fields)}
+                   RETURNING (xmax = 0) AS inserted
+               )
+               SELECT COUNT(*) FILTER (WHERE inserted), COUNT(*) FILTER (WHERE NOT inserted)
+               FROM merged;
+               """
+
+    @classmethod
+    def _get_conflict_clause(cls, table_name: str, fields: tuple) -> str:
+        """
+        Возвращает часть запроса ON CONFLICT ... DO UPDATE: существующая строка перезаписывается,
+        если изменилась контрольная сумма (последнее поле) или у строки другое значение поля из reset_fields
+
+        :param table_name: имя таблицы
+        :param fields: названия полей таблицы в формате кортежа
+        """
+
+        updated_values = [f"{field} = EXCLUDED.{field}" for field in fields]
+        condition = f"{table_name}.{fields[-1]} IS DISTINCT FROM EXCLUDED.{fields[-1]}"
+
+        if table_name in cls.reset_fields:
+            field, value = cls.reset_fields[table_name]
+            updated_values.append(f"{field} = {value}")
+            condition += f" OR {table_name}.{field} IS DISTINCT FROM {value}"
+
+        return f"""ON CONFLICT ({fields[0]})
+               DO UPDATE SET {", ".join(updated_values)}
+               WHERE {condition}"""
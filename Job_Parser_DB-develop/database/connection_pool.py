@@ -0,0 +1,236 @@
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+
+import psycopg2
+from psycopg2 import extensions
+from psycopg2.extensions import connection
+from psycopg2.pool import ThreadedConnectionPool
+
+
+class Connection_Pool:
+    """
+    Пул соединений с базой данных на основе psycopg2.pool.ThreadedConnectionPool,
+    общий для всех объектов, работающих с одной базой данных (DB_Saver, DB_Manager).
+
+    Соединения открываются один раз и переиспользуются, поэтому смена режима работы программы
+    не требует нового подключения и авторизации. Соединения можно брать одновременно
+    из разных потоков: запись и аналитические запросы выполняются параллельно.
+    Если все соединения заняты, getconn ждёт, пока одно из них не вернётся в пул.
+
+    Перед выдачей соединение проверяется: закрытые соединения отбрасываются,
+    а соединение, которое долго не использовалось, проверяется запросом SELECT 1.
+    Функции настройки (add_setup) выполняются один раз для каждого нового соединения,
+    например для подготовки запросов на сервере
+    """
+
+    # количество соединений, которые открываются сразу и не закрываются при возврате в пул
+    min_connections = 2
+    # максимальное количество одновременно открытых соединений
+    max_connections = 8
+    # время простоя в секундах, после которого соединение проверяется запросом перед выдачей
+    validate_after = 30
+
+    # общие для всей программы пулы в формате 'параметры подключения: пул'
+    _shared = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self,
+                 parameters: dict[str, str],
+                 min_connections: int | None = None,
+                 max_connections: int | None = None) -> None:
+        """
+        Инициализатор объектов класса, открывает min_connections соединений
+
+        :param parameters: параметры подключения к базе данных (результат DB_Interaction.config)
+        :param min_connections: количество постоянно открытых соединений
+        :param max_connections: максимальное количество одновременно открытых соединений
+
+        :raises psycopg2.OperationalError: если не удалось подключиться к базе данных
+        """
+
+        if max_connections is not None:
+            self.max_connections = max(1, max_connections)
+        if min_connections is not None:
+            self.min_connections = min_connections
+        self.min_connections = min(self.min_connections, self.max_connections)
+
+        self._pool = ThreadedConnectionPool(self.min_connections, self.max_connections, **parameters)
+        self._available = threading.BoundedSemaphore(self.max_connections)
+        self._lock = threading.Lock()
+
+        # функции настройки и соединения, для которых они уже выполнены
+        self._setups = []
+        self._initialized = {}
+        # момент последнего возврата соединения в пул
+        self._released_at = {}
+
+    @classmethod
+    def get_shared(cls, parameters: dict[str, str]) -> "Connection_Pool":
+        """
+        Возвращает общий пул для указанных параметров подключения, создавая его при первом обращении
+
+        :param parameters: параметры подключения к базе данных
+
+        :raises psycopg2.OperationalError: если не удалось подключиться к базе данных
+        """
+
+        key = tuple(sorted(parameters.items()))
+        with cls._shared_lock:
+            if key not in cls._shared:
+                cls._shared[key] = cls(parameters)
+            return cls._shared[key]
+
+    @classmethod
+    def close_shared(cls) -> None:
+        """Закрывает все соединения всех общих пулов"""
+
+        with cls._shared_lock:
+            for pool in cls._shared.values():
+                pool.closeall()
+            cls._shared.clear()
+
+    def add_setup(self, setup: Callable[[connection], None]) -> None:
+        """
+        Добавляет функцию настройки, которая будет выполнена один раз для каждого соединения пула
+        перед его первой выдачей (для уже открытых соединений - при следующей выдаче)
+
+        :param setup: функция, принимающая соединение, например Query_Registry.prepare
+        """
+
+        with self._lock:
+            if setup not in self._setups:
+                self._setups.append(setup)
+
+    def getconn(self) -> connection:
+        """
+        Возвращает исправное соединение из пула. Если все соединения заняты, ждёт освобождения одного из них.
+        Полученное соединение обязательно нужно вернуть методом putconn
+
+        :raises psycopg2.OperationalError: если не удалось открыть новое соединение
+        """
+
+        self._available.acquire()
+        try:
+            while True:
+                conn = self._pool.getconn()
+                if self._is_healthy(conn):
+                    break
+                self._discard(conn)
+
+            self._run_setups(conn)
+        except BaseException:
+            self._available.release()
+            raise
+
+        return conn
+
+    def putconn(self, conn: connection) -> None:
+        """
+        Возвращает соединение в пул. Незавершённая транзакция откатывается,
+        повреждённое соединение закрывается
+
+        :param conn: соединение, полученное методом getconn
+        """
+
+        try:
+            self._pool.putconn(conn, close=conn.closed or self._is_broken(conn))
+        finally:
+            with self._lock:
+                if conn.closed:
+                    self._forget(conn)
+                else:
+                    self._released_at[id(conn)] = time.monotonic()
+            self._available.release()
+
+    @contextmanager
+    def connection(self) -> Iterator[connection]:
+        """Контекстный менеджер: выдаёт соединение из пула и возвращает его по завершении блока"""
+
+        conn = self.getconn()
+        try:
+            yield conn
+        finally:
+            self.putconn(conn)
+
+    def closeall(self) -> None:
+        """Закрывает все соединения пула"""
+
+        if not self._pool.closed:
+            self._pool.closeall()
+        with self._lock:
+            self._initialized.clear()
+            self._released_at.clear()
+
+    def _is_healthy(self, conn: connection) -> bool:
+        """
+        Проверяет соединение перед выдачей: закрытое соединение неисправно,
+        соединение, простаивавшее дольше validate_after секунд, проверяется запросом SELECT 1
+
+        :param conn: соединение из пула
+        """
+
+        if conn.closed:
+            return False
+
+        released_at = self._released_at.get(id(conn))
+        if released_at is None or time.monotonic() - released_at < self.validate_after:
+            return True
+
+        try:
+            cur = conn.cursor()
+            cur.execute("SELECT 1")
+            cur.close()
+            conn.rollback()
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            return False
+        return True
+
+    @staticmethod
+    def _is_broken(conn: connection) -> bool:
+        """
+        Проверяет, потеряна ли связь с сервером (состояние транзакции неизвестно)
+
+        :param conn: соединение, возвращаемое в пул
+        """
+
+        return conn.info.transaction_status == extensions.TRANSACTION_STATUS_UNKNOWN
+
+    def _discard(self, conn: connection) -> None:
+        """
+        Закрывает неисправное соединение и убирает его из пула
+
+        :param conn: соединение из пула
+        """
+
+        self._pool.putconn(conn, close=True)
+        with self._lock:
+            self._forget(conn)
+
+    def _forget(self, conn: connection) -> None:
+        """Удаляет служебные сведения о закрытом соединении, вызывается под блокировкой"""
+
+        self._initialized.pop(id(conn), None)
+        self._released_at.pop(id(conn), None)
+
+    def _run_setups(self, conn: connection) -> None:
+        """
+        Выполняет для соединения функции настройки, которые ещё не выполнялись для него.
+        Если настройка не удалась, соединение закрывается
+
+        :param conn: соединение из пула
+        """
+
+        with self._lock:
+            done = self._initialized.setdefault(id(conn), [])
+            pending = [setup for setup in self._setups if setup not in done]
+
+        for setup in pending:
+            try:
+                setup(conn)
+            except psycopg2.Error:
+                self._discard(conn)
+                raise
+            with self._lock:
+                done.append(setup)
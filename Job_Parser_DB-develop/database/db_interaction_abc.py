@@ -1,6 +1,9 @@
 from abc import ABC, abstractmethod
 from configparser import ConfigParser
 import os
+import threading
+
+from database.connection_pool import Connection_Pool
 
 
 class DB_Interaction(ABC):
@@ -9,9 +12,26 @@ class DB_Interaction(ABC):
     и взаимодействующих с ней
     """
 
-    # при инициализации объектов классов-наследников
-    # должно устанавливаться соединение с именем conn (self.conn)
-    conn = None
+    # общий пул соединений, его получает метод make_connection классов-наследников (self._pool);
+    # подключение выполняется при первом обращении к свойству pool, а не при создании объекта,
+    # поэтому запуск программы не ждёт ответа базы данных
+    _pool: Connection_Pool | None = None
+    _connection_lock = threading.RLock()
+
+    @property
+    def pool(self) -> Connection_Pool:
+        """
+        Общий пул соединений, соединения берутся из него на время операции.
+        При первом обращении выполняется подключение к базе данных (make_connection)
+
+        :raises psycopg2.OperationalError: если не удалось подключиться к базе данных
+        """
+
+        if self._pool is None:
+            with self._connection_lock:
+                if self._pool is None:
+                    self.make_connection()
+        return self._pool
 
     @staticmethod
     def _build_path_to_file(file_name: str) -> str:
@@ -45,25 +65,20 @@ class DB_Interaction(ABC):
 
         script = self._read_script(path_to_script)
 
-        cur = self.conn.cursor()
-        cur.execute(script)
-        cur.close()
-        self.conn.commit()
-
-    def __del__(self) -> None:
-        """Метод, предписывающий закрыть соединение с базой данных при удалении объекта"""
-
-        if hasattr(self, 'conn') and self.conn is not None:
-            self.conn.close()
+        with self.pool.connection() as conn:
+            cur = conn.cursor()
+            cur.execute(script)
+            cur.close()
+            conn.commit()
 
     @abstractmethod
     def make_connection(self) -> None:
-        """Устанавливает соединение с базой данных"""
+        """Получает пул соединений с базой данных"""
         pass
 
     @abstractmethod
     def close_connection_db(self) -> None:
-        """Закрывает соединение с базой данных"""
+        """Отказывается от пула соединений с базой данных"""
         pass
 
     @staticmethod
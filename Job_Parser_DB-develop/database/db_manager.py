@@ -1,8 +1,11 @@
-import psycopg2
+import time
+
 from prettytable import PrettyTable
-from psycopg2.extensions import cursor
 
+from database.connection_pool import Connection_Pool
 from database.db_interaction_abc import DB_Interaction
+from database.query_registry import Query_Registry
+from instrumentation.metrics import Metrics_Registry
 from mixins.user_interaction import User_Interaction_Mixin
 
 
@@ -20,21 +23,40 @@ class DB_Manager(DB_Interaction, User_Interaction_Mixin):
     # цвет текста меню
     text_color = "\033[34m"
 
+    # команды, результат которых может быть очень большим: строки получаются с сервера частями,
+    # каждая часть - отдельным выполнением запроса, продолжающим выдачу после последней полученной строки.
+    # Для каждой команды указаны параметры запроса, продолжающие выдачу, в формате
+    # 'параметр: (столбец последней строки, значение для первой части)'
+    streamed_commands = {
+        "2": {"after": ("vacancy_id", 0)},
+        "4": {"after": ("vacancy_id", 0)},
+        # ранг совпадения не больше 1, поэтому первая часть начинается после ранга 2
+        "5": {"after_rank": ("rank", 2), "after": ("vacancy_id", 0)},
+    }
+    # количество строк, которое получается с сервера за одно выполнение запроса
+    itersize = 2000
+    # количество строк в одной странице вывода на экран
+    page_size = 50
+    # количество первых строк результата, которые сохраняются в итоговой сводке запроса
+    summary_rows = 5
+    # границы корзин гистограммы количества строк результата запроса
+    rows_buckets = (0, 1, 10, 100, 1_000, 10_000, 100_000)
+
     def __init__(self) -> None:
         """
         Инициализатор объектов класса.
 
         Строит пути к конфигурационным файлам и sql-скриптам;
-        Получает текст sql-скрипта из файла queries_file;
-        Устанавливает соединение с базой данных;
+        Получает реестр запросов из файла queries_file (файл разбирается один раз за работу программы);
+        Пул соединений с базой данных получается при первом запросе (см. make_connection),
+        запросы из реестра подготавливаются на сервере один раз для каждого соединения пула;
         Инициализирует меню
         """
 
         self.db_parameters = self.config(self._build_path_to_file(self.db_config_file))
-        self.text_queries = self._read_script(self._build_path_to_file(self.queries_file)).split(";")
+        self.queries = Query_Registry.from_file(self._build_path_to_file(self.queries_file))
 
-        self.conn = None
-        self.make_connection()
+        self._pool = None
 
         self.commands = {
             "help":
@@ -64,7 +86,8 @@ class DB_Manager(DB_Interaction, User_Interaction_Mixin):
         Запускает скрипт взаимодействия с пользователем при вызове объекта класса.
         Готовность принять команду от пользователя сохраняется до ввода команды выхода "exit"
 
-        При завершении возвращает результаты SQL-запросов, если такие были в течение сессии
+        При завершении возвращает сводки SQL-запросов (команда, число строк, первые строки),
+        если такие были в течение сессии
         """
 
         print(f"\nВы вошли в режим работы с базой данных."
@@ -87,40 +110,41 @@ class DB_Manager(DB_Interaction, User_Interaction_Mixin):
 
     # Команды основного меню
     def make_connection(self) -> None:
-        """Устанавливает соединение с базой данных"""
-        setattr(self, "conn", psycopg2.connect(**self.db_parameters))
+        """Получает общий пул соединений с базой данных и регистрирует подготовку запросов из реестра"""
+        pool = Connection_Pool.get_shared(self.db_parameters)
+        pool.add_setup(self.queries.prepare)
+        self._pool = pool
 
     def close_connection_db(self) -> None:
-        """Закрывает соединение с базой данных"""
-        if self.conn:
-            self.conn.close()
-            self.conn = None
+        """Отказывается от пула соединений, сами соединения остаются открытыми для других объектов"""
+        self._pool = None
 
-    def get_companies_and_vacancies_count(self) -> list[tuple]:
+    def get_companies_and_vacancies_count(self) -> dict:
         """Возвращает список всех компаний и количество вакансий у каждой компании"""
 
         return self._run_sql_query("1")
 
-    def get_all_vacancies(self) -> list[tuple]:
+    def get_all_vacancies(self) -> dict:
         """Возвращает список всех вакансий с указанием названия компании"""
 
         return self._run_sql_query("2")
 
-    def get_avg_salary(self) -> list[tuple]:
+    def get_avg_salary(self) -> dict:
         """Возвращает среднюю зарплату по вакансиям"""
 
         return self._run_sql_query("3")
 
-    def get_vacancies_with_higher_salary(self) -> list[tuple]:
+    def get_vacancies_with_higher_salary(self) -> dict:
         """Возвращает список всех вакансий, у которых зарплата выше средней по всем вакансиям"""
 
         return self._run_sql_query("4")
 
-    def get_vacancies_with_keyword(self) -> list[tuple] | None:
+    def get_vacancies_with_keyword(self) -> dict | None:
         """
         Запрашивает у пользователя слово, которое будет использовано в качестве ключевого
         при выполнении SQL-запроса.
-        Возвращает список всех вакансий, в названии которых содержится указанное слово
+        Выводит все вакансии, в названии которых содержится указанное слово (без учёта регистра),
+        начиная с наиболее похожих. Поиск использует триграммный индекс по названию вакансии
         """
 
         keyword = input("\nПожалуйста, введите ключевое слово для поиска совпадений в списке вакансий:\n")
@@ -130,68 +154,142 @@ class DB_Manager(DB_Interaction, User_Interaction_Mixin):
             if keyword.lower().strip() == "stop":
                 return
 
-        substitutions = (keyword.capitalize(), keyword.lower())
-        return self._run_sql_query("5", substitutions)
+        keyword = keyword.strip()
+        return self._run_sql_query("5", {"keyword": keyword, "pattern": f"%{self._escape_like(keyword)}%"})
 
     # Вспомогательные методы
-    def _run_sql_query(self, command: str, substitutions: tuple | None = None) -> list[tuple]:
+    def _run_sql_query(self, command: str, parameters: dict | None = None) -> dict:
         """
-        Возвращает результат SQL-запроса в зависимости от выбранной
-        пользователем команды меню в виде списка кортежей.
-        Выводит результат запроса на экран в виде таблицы
+        Исполняет SQL-запрос, соответствующий выбранной пользователем команде меню,
+        и выводит результат на экран постранично в виде таблиц.
+        Первая страница выводится сразу, следующая - по запросу пользователя.
+
+        Для команд из streamed_commands строки получаются с сервера частями (см. _fetch_rows),
+        поэтому результат целиком не загружается в память.
+        Соединение с базой данных занято только на время получения строк: транзакция завершается
+        и соединение возвращается в пул до вывода на экран и ожидания ответа пользователя.
+        Возвращает сводку запроса: команду, её описание, количество выведенных строк, первые строки
+        и длительность выполнения без учёта ожидания ответа пользователя.
+        Длительность и количество строк записываются в метрики (Metrics_Registry)
 
         :param command: команда, введённая пользователем
-        :param substitutions: опциональный параметр, используется для вставки в запрос каких-то значений,
-                              полученных от пользователя
+        :param parameters: опциональный параметр, значения параметров запроса в формате 'имя: значение',
+                           полученные от пользователя
+        """
+
+        summary = {"command": command, "description": self.commands[command][0], "rows": 0, "sample": []}
+        start = time.perf_counter()
+        # время ожидания ответа пользователя не входит в длительность запроса
+        waited = 0.0
+
+        keys = self.streamed_commands.get(command, {})
+        after = {name: first_value for name, (column, first_value) in keys.items()}
+        finished = False
+        while not finished:
+            columns, rows = self._fetch_rows(command, parameters, after)
+            # лишняя строка сверх itersize означает, что у результата есть следующая часть
+            has_more = command in self.streamed_commands and len(rows) > self.itersize
+            if has_more:
+                rows = rows[:self.itersize]
+                after = {name: rows[-1][columns.index(column)] for name, (column, _) in keys.items()}
+
+            for first in range(0, max(len(rows), 1), self.page_size):
+                page = rows[first:first + self.page_size]
+                if page or not summary["rows"]:
+                    print(self._create_table(columns, page))
+
+                summary["rows"] += len(page)
+                summary["sample"].extend(page[:self.summary_rows - len(summary["sample"])])
+
+                if first + self.page_size >= len(rows) and not has_more:
+                    finished = True
+                    break
+                asked_at = time.perf_counter()
+                next_page = self._ask_next_page()
+                waited += time.perf_counter() - asked_at
+                if not next_page:
+                    finished = True
+                    break
+
+        summary["seconds"] = round(time.perf_counter() - start - waited, 4)
+        self._record_query(command, summary)
+        return summary
+
+    def _fetch_rows(self, command: str, parameters: dict | None, after: dict) -> tuple[list[str], list[tuple]]:
         """
+        Исполняет подготовленный на сервере запрос в отдельной короткой транзакции
+        и возвращает названия столбцов и строки результата.
+
+        Для команд из streamed_commands получает не больше itersize + 1 строк, следующих после строки,
+        на которой закончилась предыдущая часть; лишняя строка показывает, что результат ещё не закончился.
+        Сервер не пропускает уже выданные строки, а сразу находит продолжение по индексу,
+        поэтому каждая часть получается одинаково быстро
+
+        :param command: команда меню
+        :param parameters: значения параметров запроса в формате 'имя: значение'
+        :param after: значения параметров, продолжающих выдачу (см. streamed_commands)
+        """
+
+        if command in self.streamed_commands:
+            parameters = {**(parameters or {}), **after, "limit": self.itersize + 1}
 
-        query = self._get_query(command)
+        with self.pool.connection() as conn:
+            cur = conn.cursor()
+            try:
+                self.queries.execute(cur, command, parameters)
+                columns = [desc[0] for desc in cur.description]
+                rows = cur.fetchall()
+            finally:
+                cur.close()
+                conn.commit()
 
-        if substitutions:
-            for substitution in substitutions:
-                query = query.replace("placeholder", substitution, 1)
+        return columns, rows
 
-        cur = self.conn.cursor()
-        cur.execute(query)
-        response = cur.fetchall()
-        print(self._create_table(cur, response))
+    def _record_query(self, command: str, summary: dict) -> None:
+        """
+        Записывает в метрики длительность запроса и количество строк результата
+
+        :param command: команда меню
+        :param summary: сводка запроса
+        """
+
+        metrics = Metrics_Registry.get_shared()
+        metrics.observe("db_query_duration_seconds", summary["seconds"], labels={"command": command},
+                        description="Длительность SQL-запросов режима работы с базой данных в секундах")
+        metrics.observe("db_query_rows", summary["rows"], labels={"command": command}, buckets=self.rows_buckets,
+                        description="Количество строк результата SQL-запросов")
 
-        self.conn.commit()
-        cur.close()
+    @staticmethod
+    def _ask_next_page() -> bool:
+        """Спрашивает у пользователя, нужно ли выводить следующую страницу результата"""
 
-        return response
+        answer = input("\nНажмите Enter, чтобы показать следующую страницу, или введите 'q' для завершения: ")
+        return answer.lower().strip() != "q"
 
     @staticmethod
-    def _create_table(cur: cursor, data: list[tuple]) -> PrettyTable:
+    def _create_table(columns: list[str], data: list[tuple]) -> PrettyTable:
         """
         Создаёт и возвращает объект PrettyTable, представляющий собой
         таблицу для вывода данных на экран
 
-        :param cur: объект cursor библиотеки psycopg2, представляющий собой интерфейс
-                    для выполнения SQL-запросов и получения результатов
+        :param columns: названия столбцов результата запроса
         :param data: данные, полученные в результате исполнения запроса
 
         :return: объект таблицы (PrettyTable) библиотеки prettytable
         """
 
         table = PrettyTable()
-        table.field_names = [desc[0] for desc in cur.description]
+        table.field_names = columns
         for row in data:
             table.add_row(row)
         return table
 
-    def _get_query(self, command: str) -> str:
+    @staticmethod
+    def _escape_like(text: str) -> str:
         """
-        Возвращает строку sql-запроса, которая соответствует заданному в меню описанию действия
+        Экранирует специальные символы шаблона LIKE, чтобы введённый текст искался буквально
 
-        :param command: команда, введённая пользователем
+        :param text: текст, полученный от пользователя
         """
 
-        comment = self.commands[command][0]
-        query = ""
-        for text in self.text_queries:
-            if "-- " + comment in text:
-                query = text
-                break
-
-        return query
+        return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
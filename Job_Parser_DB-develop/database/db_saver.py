@@ -1,7 +1,17 @@
+import hashlib
+import os
+import time
+
 import psycopg2
+from psycopg2 import errors
+from psycopg2.extensions import TransactionRollbackError, connection, cursor
 
 from entity.entity_abc import Entity
+from database.bulk_writer import Bulk_Writer
+from database.connection_pool import Connection_Pool
 from database.db_interaction_abc import DB_Interaction
+from instrumentation.instrumentation import Instrumentation
+from instrumentation.metrics import Metrics_Registry
 
 
 class DB_Saver(DB_Interaction):
@@ -16,14 +26,26 @@ class DB_Saver(DB_Interaction):
     starting_db = "db_config_starting.ini"
     target_db = "db_config_target.ini"
 
+    # сводная таблица с количеством вакансий и суммой зарплат по каждой компании
+    stats_table = "employer_stats"
+    # таблица с контрольными суммами выполненных скриптов создания таблиц
+    schema_table = "schema_version"
+
+    # количество попыток сохранения пакета при взаимоблокировке или ошибке сериализации
+    # и пауза перед повтором в секундах (увеличивается с каждой попыткой)
+    retry_attempts = 3
+    retry_delay = 0.1
+
+    # журнал сохранения данных
+    logger = Instrumentation.get_logger("db_saver")
+
     def __init__(self) -> None:
         """
         Инициализатор объектов класса.
 
-        Строит пути к конфигурационным файлам и sql-скриптам;
-        Создаёт базу данных;
-        Создаёт необходимые таблицы, прописанные в файле скрипта
-        table_creation_script, если они не существуют
+        Строит пути к конфигурационным файлам и sql-скриптам и читает параметры подключения.
+        К базе данных объект подключается при первой операции (см. make_connection),
+        поэтому создание объекта не ждёт ответа сервера
         """
 
         self.path_to_starting_config = self._build_path_to_file(self.starting_db)
@@ -34,29 +56,47 @@ class DB_Saver(DB_Interaction):
         self.starting_parameters_db = self.config(self.path_to_starting_config)
         self.target_parameters_db = self.config(self.path_to_target_config)
 
-        self._create_db()
+        self._pool = None
 
-        self.conn = None
-        self.make_connection()
-        self._create_tables()
-
-    def save_to_db(self, table_name: str, data: dict[Entity]) -> None:
+    def save_to_db(self, table_name: str, data: dict[Entity]) -> dict[str, int | float]:
         """
-        Сохраняет в указанную таблицу данные, полученные из объекта-наследника класса Entity
+        Сохраняет в указанную таблицу данные, полученные из объекта-наследника класса Entity.
+        Значения отправляются пакетами, возвращается статистика записи (строки, из них новые, изменённые
+        и без изменений, время, строк в секунду). Строки, значения которых не изменились, не перезаписываются.
+        В той же транзакции пересчитывается сводная таблица employer_stats для затронутых компаний,
+        если хотя бы одна строка была вставлена или изменена.
+        Статистика записи сохраняется в метрики (Metrics_Registry) и журнал.
+        Если транзакция отменена из-за взаимоблокировки или ошибки сериализации с другим сохранением,
+        пакет записывается заново (не больше retry_attempts попыток)
 
         :param table_name: имя таблицы, в которую будут сохранены значения
         :param data: словарь с сущностями, информацию о которых следует сохранить в таблицу
         """
 
-        cur = self.conn.cursor()
-
-        for item in data.values():
-            fields = item.get_fields()
-            values = item.get_values()
-            cur.execute(self._get_insert_string(table_name, fields), values)
-
-        cur.close()
-        self.conn.commit()
+        for attempt in range(1, self.retry_attempts + 1):
+            with self.pool.connection() as conn:
+                try:
+                    stats = Bulk_Writer(conn).write(table_name, data.values())
+                    if stats["inserted"] or stats["updated"]:
+                        self._refresh_employer_stats(conn,
+                                                     {getattr(item, "employer_id", None) for item in data.values()})
+                    conn.commit()
+                except TransactionRollbackError as error:
+                    conn.rollback()
+                    if attempt == self.retry_attempts:
+                        raise
+                    self.logger.warning("Повтор сохранения в таблицу %s (попытка %s): %s",
+                                        table_name, attempt + 1, str(error).strip())
+                except psycopg2.Error:
+                    conn.rollback()
+                    raise
+                else:
+                    break
+
+            time.sleep(self.retry_delay * attempt)
+
+        self._record_save(table_name, stats)
+        return stats
 
     def clear_db(self) -> None:
         """Удаляет все значения из таблиц базы данных"""
@@ -64,15 +104,29 @@ class DB_Saver(DB_Interaction):
         self._run_script(self.path_to_table_remove_script)
 
     def make_connection(self) -> None:
-        """Устанавливает соединение с базой данных"""
+        """
+        Получает общий пул соединений с целевой базой данных и проверяет схему таблиц (_ensure_schema).
+        Если подключиться не удалось, создаёт базу данных и подключается ещё раз,
+        поэтому при обычном запуске стартовая база данных не используется.
+        Вызывается при первом обращении к свойству pool
+
+        :raises psycopg2.OperationalError: если не удалось подключиться к базе данных
+        """
+
+        try:
+            pool = Connection_Pool.get_shared(self.target_parameters_db)
+        except psycopg2.OperationalError:
+            self._create_db()
+            pool = Connection_Pool.get_shared(self.target_parameters_db)
 
-        setattr(self, "conn", psycopg2.connect(**self.target_parameters_db))
+        # пул становится доступен другим потокам только после проверки схемы
+        self._ensure_schema(pool)
+        self._pool = pool
 
     def close_connection_db(self) -> None:
-        """Закрывает соединение с базой данных"""
-        if self.conn:
-            self.conn.close()
-            self.conn = None
+        """Отказывается от пула соединений, сами соединения остаются открытыми для других объектов"""
+
+        self._pool = None
 
     def _create_db(self) -> None:
         """
@@ -94,31 +148,123 @@ class DB_Saver(DB_Interaction):
         cur.close()
         conn.close()
 
-    @staticmethod
-    def _get_insert_string(table_name: str, fields: tuple) -> str:
+    def _refresh_employer_stats(self, conn: connection, employer_ids: set[str | None]) -> None:
         """
-        Возвращает строку, которая будет использована для операции вставки значений в базу данных
+        Пересчитывает количество открытых вакансий и сумму зарплат в таблице employer_stats
+        только для указанных компаний.
+
+        Перед пересчётом берутся рекомендательные блокировки компаний (до конца транзакции)
+        в порядке возрастания id: одновременные сохранения вакансий одной компании (пакетная загрузка,
+        фоновая запись, синхронизация) пересчитывают её статистику по очереди, и каждый следующий
+        пересчёт видит строки, зафиксированные предыдущим, а единый порядок блокировок исключает
+        взаимоблокировки
+
+        :param conn: соединение, в транзакции которого были сохранены данные
+        :param employer_ids: id компаний, данные о которых были изменены
+        """
+
+        employer_ids = sorted({int(employer_id) for employer_id in employer_ids if employer_id})
+        if not employer_ids:
+            return
+
+        cur = conn.cursor()
+        # unnest выдаёт элементы в порядке массива, поэтому блокировки берутся по возрастанию id
+        cur.execute("SELECT pg_advisory_xact_lock(hashtext(%s), employer_id) FROM unnest(%s::int[]) AS employer_id",
+                    (self.stats_table, employer_ids))
+        cur.execute(f"""
+                    INSERT INTO {self.stats_table} (employer_id, number_vacancies, salary_count, salary_sum)
+                    SELECT
+                        e.employer_id,
+                        COUNT(v.vacancy_id),
+                        COUNT((v.salary_min + v.salary_max) / 2),
+                        COALESCE(SUM((v.salary_min + v.salary_max) / 2), 0)
+                    FROM employers e
+                    LEFT JOIN vacancies v
+                        ON v.employer_id = e.employer_id AND NOT v.is_closed
+                    WHERE e.employer_id = ANY(%s)
+                    GROUP BY e.employer_id
+                    ON CONFLICT (employer_id)
+                    DO UPDATE SET number_vacancies = EXCLUDED.number_vacancies,
+                                  salary_count = EXCLUDED.salary_count,
+                                  salary_sum = EXCLUDED.salary_sum
+                    WHERE ({self.stats_table}.number_vacancies, {self.stats_table}.salary_count,
+                           {self.stats_table}.salary_sum)
+                          IS DISTINCT FROM (EXCLUDED.number_vacancies, EXCLUDED.salary_count, EXCLUDED.salary_sum);
+                    """, (employer_ids,))
+        cur.close()
+
+    def _record_save(self, table_name: str, stats: dict[str, int | float]) -> None:
+        """
+        Записывает в метрики и журнал статистику сохранения: количество новых, изменённых
+        и оставшихся без изменений строк, длительность и скорость записи последнего пакета
 
         :param table_name: имя таблицы
-        :param fields: названия полей таблицы в формате кортежа
+        :param stats: статистика записи, полученная от Bulk_Writer
+        """
 
-        :return: конечная строка вида "INSERT INTO table_name (field_1, field_2...) VALUES (%s, %s...);"
+        metrics = Metrics_Registry.get_shared()
+        labels = {"table": table_name}
+        for result in ("inserted", "updated", "unchanged"):
+            metrics.increment("db_rows_written_total", stats[result], labels={**labels, "result": result},
+                              description="Количество строк, сохранённых в базу данных, по результату записи")
+        metrics.observe("db_save_duration_seconds", stats["seconds"], labels=labels,
+                        description="Длительность сохранения пакета в базу данных в секундах")
+        metrics.set("db_save_rows_per_second", stats["rows_per_second"], labels=labels,
+                    description="Скорость записи последнего пакета, строк в секунду")
+
+        self.logger.info("Сохранено строк в таблицу %s: %s (новых %s, изменённых %s, без изменений %s) за %s с "
+                         "(%s строк/с)", table_name, stats["rows"], stats["inserted"], stats["updated"],
+                         stats["unchanged"], stats["seconds"], stats["rows_per_second"])
+
+    def _ensure_schema(self, pool: Connection_Pool) -> None:
         """
+        Исполняет скрипт создания таблиц, только если он изменился с момента последнего выполнения.
 
-        field_names = ", ".join(fields)
-        fields_number = ", ".join(['%s'] * len(fields))
-        updated_values = ", ".join([f"{field} = EXCLUDED.{field}" for field in fields])
+        Контрольная сумма (SHA-256) выполненного скрипта хранится в таблице schema_version,
+        поэтому при повторных запусках вместо всего скрипта выполняется один запрос.
+        Одновременно запущенные программы выполняют скрипт по очереди (рекомендательная блокировка)
 
-        return f"""
-               INSERT INTO {table_name} ({field_names})
-               VALUES ({fields_number})
-               ON CONFLICT ({fields[0]}) 
-               DO UPDATE SET {updated_values};
-               """
+        :param pool: пул соединений с целевой базой данных
+        """
 
-    def _create_tables(self) -> None:
+        script = self._read_script(self.path_to_table_creation_script)
+        checksum = hashlib.sha256(script.encode("UTF-8")).hexdigest()
+        script_name = os.path.basename(self.path_to_table_creation_script)
+
+        with pool.connection() as conn:
+            cur = conn.cursor()
+            try:
+                if self._get_schema_checksum(cur, script_name) != checksum:
+                    cur.execute("SELECT pg_advisory_xact_lock(hashtext(%s))", (self.schema_table,))
+                    cur.execute(script)
+                    cur.execute(f"""
+                                INSERT INTO {self.schema_table} (script, checksum)
+                                VALUES (%s, %s)
+                                ON CONFLICT (script)
+                                DO UPDATE SET checksum = EXCLUDED.checksum,
+                                              applied_at = now();
+                                """, (script_name, checksum))
+                conn.commit()
+            except psycopg2.Error:
+                conn.rollback()
+                raise
+            finally:
+                cur.close()
+
+    def _get_schema_checksum(self, cur: cursor, script_name: str) -> str | None:
         """
-        Исполняет скрипт создания таблиц в базе данных
+        Возвращает контрольную сумму последнего выполненного скрипта создания таблиц
+        или None, если скрипт ещё не выполнялся (в том числе если таблицы schema_version нет)
+
+        :param cur: курсор открытого соединения
+        :param script_name: имя файла скрипта
         """
 
-        self._run_script(self.path_to_table_creation_script)
+        try:
+            cur.execute(f"SELECT checksum FROM {self.schema_table} WHERE script = %s", (script_name,))
+        except errors.UndefinedTable:
+            cur.connection.rollback()
+            return None
+
+        row = cur.fetchone()
+        return row[0] if row else None
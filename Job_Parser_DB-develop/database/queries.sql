@@ -1,8 +1,20 @@
 --
 -- Запросы для выдачи данных из БД
 --
+-- Каждый запрос начинается с комментария "-- command: <id>", где id совпадает с командой меню DB_Manager.
+-- Значения, полученные от пользователя, передаются только через параметры вида %(name)s
+--
+-- Количество вакансий и средняя зарплата берутся из таблицы employer_stats,
+-- которая обновляется при сохранении данных (DB_Saver.save_to_db).
+-- Закрытые вакансии (is_closed, см. Incremental_Sync) в выдачу не попадают.
+-- Запросы команд, результат которых выводится частями (DB_Manager.streamed_commands),
+-- принимают параметр %(limit)s и параметры, продолжающие выдачу после последней полученной строки
+-- (keyset-пагинация), и упорядочивают строки однозначно.
+-- Столбцы вакансий перечисляются явно: служебные столбцы (content_hash, published_at, is_closed) не выводятся
+--
 
 --
+-- command: 1
 -- Вывести список всех компаний и количество вакансий у каждой компании
 --
 
@@ -10,13 +22,13 @@ SELECT
     e.employer_id,
     e.name,
     open_vacancies,
-    COUNT(vacancy_id) AS number_vacancies
+    COALESCE(s.number_vacancies, 0) AS number_vacancies
 FROM employers e
-LEFT JOIN vacancies v
-    USING(employer_id)
-GROUP BY e.employer_id;
+LEFT JOIN employer_stats s
+    USING(employer_id);
 
 --
+-- command: 2
 -- Вывести список всех вакансий с указанием названия компании
 --
 
@@ -31,30 +43,61 @@ SELECT
     e.name AS employer_name
 FROM vacancies v
 JOIN employers e
-    USING(employer_id);
+    USING(employer_id)
+WHERE NOT v.is_closed AND vacancy_id > %(after)s
+ORDER BY vacancy_id
+LIMIT %(limit)s;
 
 --
+-- command: 3
 -- Вывести среднюю зарплату по вакансиям
 --
 
-SELECT ROUND(AVG((salary_min + salary_max) / 2)) AS avg_salary
-FROM vacancies;
+SELECT ROUND(SUM(salary_sum)::numeric / NULLIF(SUM(salary_count), 0)) AS avg_salary
+FROM employer_stats;
 
 --
+-- command: 4
 -- Вывести список всех вакансий, у которых зарплата выше средней по всем вакансиям
 --
 
-SELECT *
+SELECT
+    vacancy_id,
+    name,
+    location,
+    currency,
+    salary_min,
+    salary_max,
+    url,
+    employer_id
 FROM vacancies
-WHERE (salary_min + salary_max) / 2 > (
-    SELECT AVG((salary_min + salary_max) / 2)
-    FROM vacancies
-    );
+WHERE NOT is_closed AND vacancy_id > %(after)s AND (salary_min + salary_max) / 2 > (
+    SELECT FLOOR(SUM(salary_sum)::numeric / NULLIF(SUM(salary_count), 0))::int
+    FROM employer_stats
+    )
+ORDER BY vacancy_id
+LIMIT %(limit)s;
 
 --
+-- command: 5
 -- Вывести список всех вакансий, в названии которых содержится указанное слово, например 'python'
 --
 
 SELECT *
-FROM vacancies
-WHERE name LIKE '%placeholder%' OR name LIKE '%placeholder%';
\ No newline at end of file
+FROM (
+    SELECT
+        vacancy_id,
+        name,
+        location,
+        currency,
+        salary_min,
+        salary_max,
+        url,
+        employer_id,
+        ROUND(word_similarity(%(keyword)s, name)::numeric, 2) AS rank
+    FROM vacancies
+    WHERE NOT is_closed AND name ILIKE %(pattern)s
+    ) AS found
+WHERE (rank, vacancy_id) < (%(after_rank)s, %(after)s)
+ORDER BY rank DESC, vacancy_id DESC
+LIMIT %(limit)s;
@@ -0,0 +1,98 @@
+import re
+from functools import lru_cache
+
+from psycopg2.extensions import connection, cursor
+
+
+class Query_Registry:
+    """
+    Реестр именованных SQL-запросов.
+
+    Файл запросов разбирается один раз: каждый запрос помечается комментарием "-- command: <id>"
+    и хранится по этому id. Значения от пользователя передаются только через параметры %(name)s,
+    которые при подготовке запроса на сервере (PREPARE) заменяются на $1, $2...
+
+    Запросы исполняются только как подготовленные (EXECUTE), в том числе запросы с большим результатом:
+    DECLARE CURSOR в PostgreSQL не принимает EXECUTE, поэтому такие запросы получают строки частями
+    с продолжением выдачи после последней полученной строки (см. DB_Manager.streamed_commands)
+    """
+
+    # комментарий, которым помечается начало каждого запроса
+    command_pattern = re.compile(r"^--\s*command:\s*(\S+)\s*$", re.MULTILINE)
+    # параметр запроса в формате psycopg2
+    parameter_pattern = re.compile(r"%\((\w+)\)s")
+
+    def __init__(self, script: str) -> None:
+        """
+        Инициализатор объектов класса, разбирает текст SQL-скрипта на отдельные запросы
+
+        :param script: текст SQL-скрипта с запросами, разделёнными точкой с запятой
+        """
+
+        self.queries = {}
+        self.parameters = {}
+
+        for text in script.split(";"):
+            match = self.command_pattern.search(text)
+            if not match:
+                continue
+
+            query = "\n".join(line for line in text.splitlines() if not line.strip().startswith("--")).strip()
+            command = match.group(1)
+
+            self.queries[command] = query
+            self.parameters[command] = tuple(dict.fromkeys(self.parameter_pattern.findall(query)))
+
+    @classmethod
+    @lru_cache
+    def from_file(cls, path_to_script: str) -> "Query_Registry":
+        """
+        Возвращает реестр запросов из указанного файла.
+        Файл читается и разбирается только при первом обращении
+
+        :param path_to_script: путь к SQL-скрипту с запросами
+        """
+
+        with open(path_to_script, "r", encoding="UTF-8") as file:
+            return cls(file.read())
+
+    @staticmethod
+    def get_statement_name(command: str) -> str:
+        """
+        Возвращает имя подготовленного на сервере запроса
+
+        :param command: id запроса (команда меню)
+        """
+
+        return f"query_{command}"
+
+    def prepare(self, conn: connection) -> None:
+        """
+        Подготавливает все запросы реестра на сервере (PREPARE) для переданного соединения,
+        чтобы при повторных вызовах не тратить время на разбор и планирование
+
+        :param conn: открытое соединение с базой данных
+        """
+
+        cur = conn.cursor()
+        for command, query in self.queries.items():
+            positions = {name: f"${number}" for number, name in enumerate(self.parameters[command], 1)}
+            query = self.parameter_pattern.sub(lambda match: positions[match.group(1)], query)
+            cur.execute(f"PREPARE {self.get_statement_name(command)} AS {query}")
+        cur.close()
+        conn.commit()
+
+    def execute(self, cur: cursor, command: str, parameters: dict | None = None) -> None:
+        """
+        Исполняет подготовленный на сервере запрос с переданными параметрами
+
+        :param cur: курсор соединения, для которого был вызван prepare
+        :param command: id запроса (команда меню)
+        :param parameters: значения параметров запроса в формате 'имя: значение'
+        """
+
+        names = self.parameters[command]
+        values = tuple((parameters or {})[name] for name in names)
+        placeholders = f" ({', '.join(['%s'] * len(names))})" if names else ""
+
+        cur.execute(f"EXECUTE {self.get_statement_name(command)}{placeholders}", values or None)
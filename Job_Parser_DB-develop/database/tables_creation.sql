@@ -13,6 +13,19 @@ SET default_tablespace = '';
 
 SET default_with_oids = false;
 
+--
+-- Name: schema_version; Type: TABLE; Schema: public; Owner: -; Tablespace:
+-- Checksum of the last applied version of this script, DB_Saver skips the script when it is unchanged
+--
+
+CREATE TABLE IF NOT EXISTS schema_version (
+    script varchar(100),
+    checksum char(64) NOT NULL,
+    applied_at timestamptz NOT NULL DEFAULT now(),
+
+    CONSTRAINT pk_schema_version_script PRIMARY KEY(script)
+);
+
 --
 -- Name: employers; Type: TABLE; Schema: public; Owner: -; Tablespace:
 --
@@ -44,3 +57,95 @@ CREATE TABLE IF NOT EXISTS vacancies (
     CONSTRAINT fk_vacancies_employer_id FOREIGN KEY(employer_id) REFERENCES employers(employer_id)
 );
 
+--
+-- Name: vacancies; Columns for incremental synchronization
+--
+
+ALTER TABLE vacancies ADD COLUMN IF NOT EXISTS published_at timestamptz;
+ALTER TABLE vacancies ADD COLUMN IF NOT EXISTS is_closed boolean NOT NULL DEFAULT FALSE;
+
+--
+-- Name: employers, vacancies; Checksum of the saved values, conflicting rows are rewritten only when it changes
+--
+
+ALTER TABLE employers ADD COLUMN IF NOT EXISTS content_hash char(32);
+ALTER TABLE vacancies ADD COLUMN IF NOT EXISTS content_hash char(32);
+
+--
+-- Name: sync_watermarks; Type: TABLE; Schema: public; Owner: -; Tablespace:
+--
+
+CREATE TABLE IF NOT EXISTS sync_watermarks (
+    employer_id int,
+    query varchar(200),
+    watermark timestamptz NOT NULL,
+
+    CONSTRAINT pk_sync_watermarks PRIMARY KEY(employer_id, query),
+    CONSTRAINT fk_sync_watermarks_employer_id FOREIGN KEY(employer_id) REFERENCES employers(employer_id)
+);
+
+--
+-- Name: sync_reconciliations; Type: TABLE; Schema: public; Owner: -; Tablespace:
+-- Moment of the last full reconciliation of employer vacancies with the site (see Incremental_Sync)
+--
+
+CREATE TABLE IF NOT EXISTS sync_reconciliations (
+    employer_id int,
+    reconciled_at timestamptz NOT NULL,
+
+    CONSTRAINT pk_sync_reconciliations_employer_id PRIMARY KEY(employer_id),
+    CONSTRAINT fk_sync_reconciliations_employer_id FOREIGN KEY(employer_id) REFERENCES employers(employer_id)
+);
+
+--
+-- Reconciliation moments used to be stored in sync_watermarks under the empty query,
+-- which could be overwritten by a sync with an empty keyword: they are dropped, the next sync reconciles again
+--
+
+DELETE FROM sync_watermarks WHERE query = '';
+
+--
+-- Name: idx_vacancies_name_trgm; Type: INDEX; Schema: public; Owner: -; Tablespace:
+-- Trigram index for case-insensitive substring search by vacancy name (ILIKE '%...%')
+--
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS idx_vacancies_name_trgm ON vacancies USING GIN (name gin_trgm_ops);
+
+--
+-- Name: employer_stats; Type: TABLE; Schema: public; Owner: -; Tablespace:
+-- Per-employer aggregates of open vacancies, refreshed by DB_Saver.save_to_db for the saved employers
+-- (including vacancies reopened by the save) and by Incremental_Sync when vacancies are closed
+--
+
+CREATE TABLE IF NOT EXISTS employer_stats (
+    employer_id int,
+    number_vacancies int NOT NULL DEFAULT 0,
+    salary_count int NOT NULL DEFAULT 0,
+    salary_sum bigint NOT NULL DEFAULT 0,
+
+    CONSTRAINT pk_employer_stats_employer_id PRIMARY KEY(employer_id),
+    CONSTRAINT fk_employer_stats_employer_id FOREIGN KEY(employer_id) REFERENCES employers(employer_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_vacancies_employer_id ON vacancies (employer_id);
+
+CREATE INDEX IF NOT EXISTS idx_vacancies_avg_salary ON vacancies (((salary_min + salary_max) / 2));
+
+--
+-- Fill employer_stats once for databases created before the table existed
+--
+
+INSERT INTO employer_stats (employer_id, number_vacancies, salary_count, salary_sum)
+SELECT
+    e.employer_id,
+    COUNT(v.vacancy_id),
+    COUNT((v.salary_min + v.salary_max) / 2),
+    COALESCE(SUM((v.salary_min + v.salary_max) / 2), 0)
+FROM employers e
+LEFT JOIN vacancies v
+    ON v.employer_id = e.employer_id AND NOT v.is_closed
+WHERE NOT EXISTS (SELECT 1 FROM employer_stats)
+GROUP BY e.employer_id;
+
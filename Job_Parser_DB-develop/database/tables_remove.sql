@@ -2,5 +2,8 @@
 --- clear tables
 ---
 
+TRUNCATE TABLE employer_stats;
+TRUNCATE TABLE sync_watermarks;
+TRUNCATE TABLE sync_reconciliations;
 TRUNCATE TABLE vacancies;
 TRUNCATE TABLE employers CASCADE;
\ No newline at end of file
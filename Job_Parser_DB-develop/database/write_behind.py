@@ -0,0 +1,163 @@
+import queue
+import threading
+import time
+
+from database.db_saver import DB_Saver
+from entity.entity_abc import Entity
+
+
+class Write_Behind_Queue:
+    """
+    Отложенная запись в базу данных (write-behind).
+
+    Пакеты сущностей ставятся в ограниченную очередь и сохраняются фоновым потоком через DB_Saver,
+    поэтому пользователь может продолжать работу (например, искать новые вакансии), пока идёт запись.
+    Идущие подряд пакеты для одной таблицы объединяются в одну запись (не больше group_size строк),
+    порядок таблиц сохраняется, поэтому компании всегда записываются раньше своих вакансий.
+    Если очередь заполнена, постановка нового пакета ждёт, пока фоновый поток не освободит место
+    """
+
+    # максимальное количество пакетов в очереди
+    max_batches = 100
+    # максимальное количество строк, объединяемых в одну запись
+    group_size = 5000
+
+    def __init__(self, db_saver: DB_Saver, max_batches: int | None = None, group_size: int | None = None) -> None:
+        """
+        Инициализатор объектов класса. Фоновый поток запускается при постановке первого пакета
+
+        :param db_saver: объект для сохранения данных в базу данных
+        :param max_batches: максимальное количество пакетов в очереди
+        :param group_size: максимальное количество строк, объединяемых в одну запись
+        """
+
+        self.db_saver = db_saver
+        if max_batches is not None:
+            self.max_batches = max(1, max_batches)
+        if group_size is not None:
+            self.group_size = max(1, group_size)
+
+        self._queue = queue.Queue(maxsize=self.max_batches)
+        self._thread = None
+        self._lock = threading.Lock()
+        # пакет, который фоновый поток взял из очереди, но ещё не записал
+        # (список, так как это может быть и признак остановки None)
+        self._carry = []
+
+        self.stats = {"batches_queued": 0, "rows_queued": 0, "batches_written": 0, "rows_written": 0,
+                      "rows_unchanged": 0, "rows_failed": 0, "seconds": 0.0, "last_error": None}
+
+    def submit(self, table_name: str, data: dict[str, Entity]) -> None:
+        """
+        Ставит пакет сущностей в очередь на сохранение. Словарь копируется,
+        поэтому его можно сразу изменять или очищать
+
+        :param table_name: имя таблицы, в которую будут сохранены значения
+        :param data: словарь с сущностями в формате 'id: объект'
+        """
+
+        if not data:
+            return
+
+        self._start()
+        with self._lock:
+            self.stats["batches_queued"] += 1
+            self.stats["rows_queued"] += len(data)
+        self._queue.put((table_name, dict(data)))
+
+    def flush(self) -> None:
+        """Ждёт, пока все поставленные в очередь пакеты не будут записаны"""
+
+        if self._thread is not None:
+            self._queue.join()
+
+    def close(self) -> None:
+        """Записывает все пакеты из очереди и останавливает фоновый поток"""
+
+        if self._thread is None:
+            return
+
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+
+    def get_status(self) -> dict[str, int | float | str | None]:
+        """
+        Возвращает состояние записи: количество пакетов и строк в очереди, записанных и не записанных
+        из-за ошибки строк, скорость записи и текст последней ошибки
+        """
+
+        with self._lock:
+            status = dict(self.stats)
+
+        status["rows_pending"] = status["rows_queued"] - status["rows_written"] - status["rows_failed"]
+        status["batches_pending"] = self._queue.qsize()
+        status["rows_per_second"] = round(status["rows_written"] / status["seconds"]) if status["seconds"] else 0
+        status["seconds"] = round(status["seconds"], 3)
+        return status
+
+    def _start(self) -> None:
+        """Запускает фоновый поток, если он ещё не запущен"""
+
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="write-behind", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        """Основной цикл фонового потока: берёт пакеты из очереди, объединяет и записывает их"""
+
+        while True:
+            item = self._carry.pop() if self._carry else self._queue.get()
+
+            if item is None:
+                self._queue.task_done()
+                return
+
+            table_name, data = item
+            taken = 1
+            rows = len(data)
+
+            # к пакету добавляются следующие пакеты для той же таблицы, которые уже есть в очереди
+            while len(data) < self.group_size:
+                try:
+                    next_item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if next_item is None or next_item[0] != table_name:
+                    self._carry.append(next_item)
+                    break
+                data = {**data, **next_item[1]}
+                taken += 1
+                rows += len(next_item[1])
+
+            self._write(table_name, data, taken, rows)
+
+            for _ in range(taken):
+                self._queue.task_done()
+
+    def _write(self, table_name: str, data: dict[str, Entity], batches: int, rows: int) -> None:
+        """
+        Сохраняет объединённый пакет и обновляет статистику.
+        Ошибка записи не останавливает фоновый поток (иначе flush ждал бы вечно), она сохраняется в статистике
+
+        :param table_name: имя таблицы
+        :param data: словарь с сущностями в формате 'id: объект'
+        :param batches: количество пакетов очереди, объединённых в этот
+        :param rows: количество строк в этих пакетах до объединения (повторы по id записываются один раз)
+        """
+
+        start = time.perf_counter()
+        try:
+            written = self.db_saver.save_to_db(table_name, data)
+        except Exception as error:
+            with self._lock:
+                self.stats["rows_failed"] += rows
+                self.stats["last_error"] = f"{table_name}: {str(error).strip()}"
+            return
+
+        with self._lock:
+            self.stats["batches_written"] += batches
+            self.stats["rows_written"] += rows
+            self.stats["rows_unchanged"] += written["unchanged"]
+            self.stats["seconds"] += time.perf_counter() - start
@@ -1,12 +1,18 @@
 import dataclasses
+from operator import attrgetter
 
 from entity.entity_abc import Entity
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class Employer_HH(Entity):
     """Класс для описания компании-нанимателя, полученной с сайта https://hh.ru"""
 
+    # названия полей таблицы в базе данных
+    fields = ("employer_id", "name", "url", "open_vacancies")
+    # функция, возвращающая значения полей объекта одним кортежем
+    _get_row = attrgetter(*fields)
+
     employer_id: str
     name: str
     url: str
@@ -18,7 +24,7 @@ class Employer_HH(Entity):
 
     def get_fields(self) -> tuple[str]:
         """Возвращает название полей для заполнения таблицы в базе данных"""
-        return tuple(self.__dict__.keys())
+        return self.fields
 
     def get_values(self) -> tuple:
         """
@@ -28,4 +34,4 @@ class Employer_HH(Entity):
         Значения должны быть приведены к строковому формату
         """
 
-        return tuple(map(self._convert_to_str, self.__dict__.values()))
+        return tuple(map(self._convert_to_str, self._get_row(self)))
@@ -6,8 +6,16 @@ class Entity(ABC):
     """
     Абстрактный класс для описания сущности,
     которую планируется добавлять в базу данных
+
+    Наследники хранят атрибуты в __slots__ и перечисляют названия полей таблицы
+    в константе класса fields, чтобы не создавать словарь __dict__ для каждого объекта
     """
 
+    __slots__ = ()
+
+    # названия полей таблицы в базе данных, в порядке значений get_values
+    fields: tuple[str] = ()
+
     @abstractmethod
     def get_fields(self) -> tuple[str]:
         """Возвращает название полей для заполнения таблицы в базе данных"""
@@ -34,5 +42,5 @@ class Entity(ABC):
     def get_info(self) -> str:
         """Возвращает информацию об объекте класса в формате строки"""
 
-        entity_info = "\n".join([f"{key}: {value}" for key, value in self.__dict__.items()])
-        return entity_info
\ No newline at end of file
+        entity_info = "\n".join([f"{key}: {getattr(self, key)}" for key in self.fields])
+        return entity_info
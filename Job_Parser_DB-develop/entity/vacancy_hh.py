@@ -1,28 +1,109 @@
-import requests
+from operator import attrgetter
 
+from currency.rate_provider_abc import Rate_Provider
+from currency.rate_provider_cbr import Rate_Provider_CBR
 from entity.entity_abc import Entity
-from typing import Any
 
 
 class Vacancy_HH(Entity):
-    """Класс для описания вакансии, полученной с сайта https://hh.ru"""
+    """
+    Класс для описания вакансии, полученной с сайта https://hh.ru
 
-    # ссылка на данные о текущем курсе валют центрального банка России
-    cbr_rate_url = "https://www.cbr-xml-daily.ru/daily_json.js"
+    Значения нормализуются один раз при создании объекта: вложенные словари API сайта
+    раскрываются, зарплата переводится в рубли и хранится в двух атрибутах salary_min и salary_max
+    """
+
+    # названия полей таблицы в базе данных, они же - атрибуты объекта
+    fields = ("vacancy_id", "name", "location", "currency", "salary_min", "salary_max",
+              "url", "employer_id", "published_at")
+    __slots__ = fields
+
+    # функция, возвращающая значения полей объекта одним кортежем
+    _get_row = attrgetter(*fields)
+
+    # общий для всех вакансий источник курсов валют центрального банка России,
+    # таблица курсов загружается один раз и кэшируется
+    rate_provider: Rate_Provider = Rate_Provider_CBR()
 
     def __init__(self, vacancy_info: dict) -> None:
         """
         Инициализатор класса, задаёт свойства объекта класса,
-        используя полученный словарь с данными
+        используя полученный словарь с данными.
+        Конвертирует сумму зарплаты в рубли, если она представлена в другой валюте
+
+        :param vacancy_info: информация о вакансии в формате ответа API сайта
+        """
+
+        salary = vacancy_info.get("salary")
+
+        self._set_values(
+            vacancy_info.get("id"),
+            vacancy_info.get("name"),
+            (vacancy_info.get("area") or {}).get("name"),
+            vacancy_info.get("alternate_url"),
+            (vacancy_info.get("employer") or {}).get("id"),
+            vacancy_info.get("published_at"),
+            (salary.get("from"), salary.get("to"), salary.get("currency")) if salary else None
+        )
+
+    @classmethod
+    def from_values(cls,
+                    vacancy_id: str | None,
+                    name: str | None,
+                    location: str | None,
+                    url: str | None,
+                    employer_id: str | None,
+                    published_at: str | None,
+                    salary: tuple[int | None, int | None, str | None] | None = None) -> "Vacancy_HH":
+        """
+        Создаёт вакансию из уже извлечённых значений, без словаря с ответом API сайта
+        (например, из типизированной структуры HH_Decoder)
+
+        :param salary: зарплата в формате (от, до, валюта) или None, если зарплата не указана
         """
 
-        self.vacancy_id = vacancy_info.get("id")
-        self.name = vacancy_info.get("name")
-        self.location = vacancy_info.get("area")
-        self.currency = vacancy_info.get("salary")
-        self.salary = vacancy_info.get("salary")
-        self.url = vacancy_info.get("alternate_url")
-        self.employer_id = vacancy_info.get("employer")
+        vacancy = cls.__new__(cls)
+        vacancy._set_values(vacancy_id, name, location, url, employer_id, published_at, salary)
+        return vacancy
+
+    def _set_values(self,
+                    vacancy_id: str | None,
+                    name: str | None,
+                    location: str | None,
+                    url: str | None,
+                    employer_id: str | None,
+                    published_at: str | None,
+                    salary: tuple[int | None, int | None, str | None] | None) -> None:
+        """
+        Задаёт атрибуты объекта. Конвертирует сумму зарплаты в рубли, если она представлена в другой валюте
+
+        :param salary: зарплата в формате (от, до, валюта) или None, если зарплата не указана
+        """
+
+        self.vacancy_id = vacancy_id
+        self.name = name
+        self.location = location
+        self.url = url
+        self.employer_id = employer_id
+        self.published_at = published_at
+
+        if not salary:
+            self.currency = None
+            self.salary_min = None
+            self.salary_max = None
+            return
+
+        amount_from, amount_to, currency = salary
+
+        if currency not in ("RUR", None):
+            if amount_from:
+                amount_from = self.convert_currency(amount_from, currency)
+            if amount_to:
+                amount_to = self.convert_currency(amount_to, currency)
+
+        self.currency = "RUR"
+        self.salary_min = amount_from
+        self.salary_max = amount_to
 
     def __str__(self) -> str:
         """Строковое представление вакансии для пользователя"""
@@ -37,82 +118,36 @@ class Vacancy_HH(Entity):
                f"name='{self.name}'" \
                f"location='{self.location}'" \
                f"currency='{self.currency}'" \
-               f"salary={self.salary}" \
+               f"salary_min={self.salary_min}" \
+               f"salary_max={self.salary_max}" \
                f"url='{self.url}'" \
                f"employer_id='{self.employer_id}'" \
+               f"published_at='{self.published_at}'" \
                f")"
 
-    def __setattr__(self, key: str, value: Any) -> None:
+    @classmethod
+    def set_rate_provider(cls, rate_provider: Rate_Provider) -> None:
         """
-        Настраивает установление значений для некоторых ключей, значения которых могут обладать
-        большей вложенностью, чем остальные.
-        Также конвертирует сумму зарплаты в рубли, если она представлена в другой валюте
+        Устанавливает источник курсов валют, который будет использоваться
+        всеми вакансиями для конвертации зарплаты в рубли
 
-        :param key: имя свойства класса
-        :param value: значение свойства класса
+        :param rate_provider: объект-наследник класса Rate_Provider
         """
 
-        especial_keys = ("location", "salary", "currency", "employer_id")
-
-        if key in especial_keys and value:
-
-            if key == "location":
-                value = value.get("name")
-
-            elif key == "currency":
-                if type(value) is dict:
-                    value = value.get("currency")
-
-            elif key == "salary":
-                amount_from = value.get("from")
-                amount_to = value.get("to")
-
-                if amount_from and self.currency not in ("RUR", None):
-                    amount_from = self.convert_currency(amount_from, self.currency)
-                if amount_to and self.currency not in ("RUR", None):
-                    amount_to = self.convert_currency(amount_to, self.currency)
-
-                self.currency = "RUR"
-                value = (amount_from, amount_to)
-
-            elif key == "employer_id":
-                value = value.get("id")
-
-        elif key == "salary" and not value:
-            value = (None, None)
-
-        super.__setattr__(self, key, value)
+        cls.rate_provider = rate_provider
 
     def convert_currency(self, number: int | None, currency: str | None) -> int:
         """
         Конвертирует сумму в иностранной валюте в эквивалентную сумму в рублях,
-        основываясь на данных ЦБР, получаемых с сайта
+        основываясь на данных ЦБР, получаемых из общего источника курсов валют
         """
 
-        response = requests.get(self.cbr_rate_url)
-        if response.status_code != 200:
-            raise requests.RequestException("Ошибка при загрузке словаря с текущим курсом валют")
-        currency_dictionary = response.json().get("Valute")
-
-        number_rub = 0
-
-        if currency in currency_dictionary and number:
-            rate = currency_dictionary[currency]["Value"] / currency_dictionary[currency]["Nominal"]
-            number_rub = int(rate * number)
-
-        return number_rub
+        return self.rate_provider.convert(number, currency)
 
     def get_fields(self) -> tuple[str]:
         """Возвращает название полей для заполнения таблицы в базе данных"""
 
-        fields = []
-        for key in self.__dict__.keys():
-            if key == "salary":
-                fields.extend(["salary_min", "salary_max"])
-                continue
-            fields.append(key)
-
-        return tuple(fields)
+        return self.fields
 
     def get_values(self) -> tuple:
         """
@@ -122,11 +157,4 @@ class Vacancy_HH(Entity):
         Значения должны быть приведены к строковому формату
         """
 
-        values = []
-        for value in self.__dict__.values():
-            if isinstance(value, tuple):
-                values.extend([*value])
-                continue
-            values.append(value)
-
-        return tuple(map(self._convert_to_str, values))
+        return tuple(map(self._convert_to_str, self._get_row(self)))
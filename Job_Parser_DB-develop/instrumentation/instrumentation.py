@@ -0,0 +1,118 @@
+import atexit
+import logging
+import os
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+from instrumentation.metrics import Metrics_Registry
+
+
+class Instrumentation:
+    """
+    Настройка журналирования и выгрузки метрик, выполняется один раз за работу программы.
+
+    Записи журнала всех модулей программы (логгер job_parser и его дочерние логгеры) передаются
+    через очередь (QueueHandler) фоновому потоку (QueueListener), который пишет их в файл,
+    поэтому запись в журнал не задерживает работу с сетью и базой данных.
+    При завершении программы поток журнала останавливается, а накопленные метрики
+    сохраняются в файлы в формате JSON и Prometheus
+    """
+
+    # директория для файлов журнала и метрик
+    logs_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "logs")
+    # имя файла журнала, его максимальный размер в байтах и количество резервных копий
+    log_file = "query_log.log"
+    max_bytes = 100_000
+    backup_count = 1
+    # формат записей журнала
+    log_format = "%(asctime)s %(levelname)s %(name)s %(message)s"
+    # имена файлов, в которые выгружаются метрики
+    metrics_files = ("metrics.json", "metrics.prom")
+
+    # имя общего логгера программы
+    root_logger = "job_parser"
+
+    _listener = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def configure(cls, level: int = logging.INFO) -> None:
+        """
+        Подключает к общему логгеру очередь и запускает фоновый поток записи в файл.
+        Повторные вызовы ничего не делают
+
+        :param level: минимальный уровень записей журнала
+        """
+
+        with cls._lock:
+            if cls._listener is not None:
+                return
+
+            logger = logging.getLogger(cls.root_logger)
+            logger.setLevel(level)
+            logger.propagate = False
+
+            try:
+                os.makedirs(cls.logs_dir, exist_ok=True)
+                handler = RotatingFileHandler(os.path.join(cls.logs_dir, cls.log_file),
+                                              maxBytes=cls.max_bytes,
+                                              backupCount=cls.backup_count,
+                                              encoding="UTF-8")
+            except OSError as error:
+                # без файла журнала программа продолжает работу, записи просто отбрасываются
+                print(f"\033[31mОшибка логирования: {error}\033[0m")
+                handler = logging.NullHandler()
+            handler.setFormatter(logging.Formatter(cls.log_format))
+
+            records = queue.SimpleQueue()
+            logger.addHandler(QueueHandler(records))
+            cls._listener = QueueListener(records, handler, respect_handler_level=True)
+            cls._listener.start()
+
+            atexit.register(cls.shutdown)
+
+    @classmethod
+    def get_logger(cls, name: str) -> logging.Logger:
+        """
+        Возвращает дочерний логгер общего логгера программы.
+        Пока журналирование не настроено методом configure, записи отбрасываются
+
+        :param name: имя модуля или подсистемы, например "api_client"
+        """
+
+        return logging.getLogger(f"{cls.root_logger}.{name}")
+
+    @classmethod
+    def export_metrics(cls) -> None:
+        """Сохраняет метрики общего реестра в файлы metrics_files"""
+
+        registry = Metrics_Registry.get_shared()
+        for file_name in cls.metrics_files:
+            try:
+                registry.export(os.path.join(cls.logs_dir, file_name))
+            except OSError as error:
+                print(f"\033[31mНе удалось сохранить метрики: {error}\033[0m")
+
+    @classmethod
+    def shutdown(cls) -> None:
+        """Сохраняет метрики и останавливает фоновый поток журнала, дописав все записи из очереди"""
+
+        with cls._lock:
+            listener, cls._listener = cls._listener, None
+        if listener is None:
+            return
+
+        cls.export_metrics()
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+
+        logger = logging.getLogger(cls.root_logger)
+        for handler in list(logger.handlers):
+            if isinstance(handler, QueueHandler):
+                logger.removeHandler(handler)
+
+
+# до настройки журналирования записи общего логгера никуда не выводятся
+logging.getLogger(Instrumentation.root_logger).addHandler(logging.NullHandler())
@@ -0,0 +1,236 @@
+import json
+import threading
+import time
+from bisect import bisect_left
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+
+class Metrics_Registry:
+    """
+    Реестр метрик программы: счётчики (counter), последние значения (gauge) и гистограммы (histogram).
+
+    Каждая метрика хранится отдельно для каждого набора меток, например
+    http_requests_total{host="api.hh.ru", status="200"}.
+    Запись значений потокобезопасна и занимает доли микросекунды, поэтому метрики можно
+    обновлять прямо в местах обращения к сети и базе данных.
+    Метрики выгружаются в формате JSON или в текстовом формате Prometheus
+    """
+
+    # границы корзин гистограмм длительности (секунды) по умолчанию
+    default_buckets = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+    # общий для всей программы реестр
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self) -> None:
+        """Инициализатор объектов класса"""
+
+        self._lock = threading.Lock()
+        # метрики в формате 'имя: (тип, описание)'
+        self._types = {}
+        # значения в формате 'имя: {метки: значение}', для гистограмм значение - словарь с корзинами
+        self._values = {}
+
+    @classmethod
+    def get_shared(cls) -> "Metrics_Registry":
+        """Возвращает общий для всей программы реестр метрик, создавая его при первом обращении"""
+
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    def increment(self, name: str, value: float = 1, labels: dict[str, str] | None = None,
+                  description: str = "") -> None:
+        """
+        Увеличивает счётчик
+
+        :param name: имя метрики
+        :param value: величина увеличения
+        :param labels: метки в формате 'имя: значение'
+        :param description: описание метрики для выгрузки
+        """
+
+        key = self._make_key(labels)
+        with self._lock:
+            values = self._register(name, "counter", description)
+            values[key] = values.get(key, 0) + value
+
+    def set(self, name: str, value: float, labels: dict[str, str] | None = None, description: str = "") -> None:
+        """
+        Сохраняет последнее значение показателя (например, скорость последней записи)
+
+        :param name: имя метрики
+        :param value: значение
+        :param labels: метки в формате 'имя: значение'
+        :param description: описание метрики для выгрузки
+        """
+
+        key = self._make_key(labels)
+        with self._lock:
+            self._register(name, "gauge", description)[key] = value
+
+    def observe(self, name: str, value: float, labels: dict[str, str] | None = None,
+                buckets: tuple[float, ...] | None = None, description: str = "") -> None:
+        """
+        Добавляет наблюдение в гистограмму
+
+        :param name: имя метрики
+        :param value: наблюдаемое значение
+        :param labels: метки в формате 'имя: значение'
+        :param buckets: верхние границы корзин, учитываются при первом наблюдении метрики,
+                        по умолчанию default_buckets
+        :param description: описание метрики для выгрузки
+        """
+
+        key = self._make_key(labels)
+        with self._lock:
+            values = self._register(name, "histogram", description)
+            histogram = values.get(key)
+            if histogram is None:
+                bounds = tuple(sorted(buckets or self._get_bounds(values) or self.default_buckets))
+                histogram = values[key] = {"bounds": bounds, "counts": [0] * (len(bounds) + 1),
+                                           "sum": 0.0, "count": 0}
+
+            histogram["counts"][bisect_left(histogram["bounds"], value)] += 1
+            histogram["sum"] += value
+            histogram["count"] += 1
+
+    @contextmanager
+    def timer(self, name: str, labels: dict[str, str] | None = None, description: str = "") -> Iterator[None]:
+        """
+        Контекстный менеджер: добавляет длительность выполнения блока в гистограмму (в секундах)
+
+        :param name: имя метрики
+        :param labels: метки в формате 'имя: значение'
+        :param description: описание метрики для выгрузки
+        """
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, labels, description=description)
+
+    def snapshot(self) -> dict[str, dict]:
+        """
+        Возвращает копию всех метрик в формате
+        'имя: {"type": тип, "description": описание, "values": [{"labels": метки, ...значения}]}'
+        """
+
+        with self._lock:
+            result = {}
+            for name, (metric_type, description) in self._types.items():
+                values = []
+                for key, value in self._values[name].items():
+                    if metric_type == "histogram":
+                        buckets = {str(bound): count for bound, count
+                                   in zip((*value["bounds"], "+Inf"), self._accumulate(value["counts"]))}
+                        values.append({"labels": dict(key), "buckets": buckets,
+                                       "sum": round(value["sum"], 6), "count": value["count"]})
+                    else:
+                        values.append({"labels": dict(key), "value": value})
+                result[name] = {"type": metric_type, "description": description, "values": values}
+            return result
+
+    def to_json(self) -> str:
+        """Возвращает все метрики в формате JSON"""
+
+        return json.dumps(self.snapshot(), ensure_ascii=False, indent=2)
+
+    def to_prometheus(self) -> str:
+        """Возвращает все метрики в текстовом формате Prometheus"""
+
+        lines = []
+        for name, metric in self.snapshot().items():
+            if metric["description"]:
+                lines.append(f"# HELP {name} {metric['description']}")
+            lines.append(f"# TYPE {name} {metric['type']}")
+
+            for value in metric["values"]:
+                labels = value["labels"]
+                if metric["type"] != "histogram":
+                    lines.append(f"{name}{self._format_labels(labels)} {value['value']}")
+                    continue
+
+                for bound, count in value["buckets"].items():
+                    lines.append(f"{name}_bucket{self._format_labels({**labels, 'le': bound})} {count}")
+                lines.append(f"{name}_sum{self._format_labels(labels)} {value['sum']}")
+                lines.append(f"{name}_count{self._format_labels(labels)} {value['count']}")
+
+        return "\n".join(lines) + "\n"
+
+    def export(self, path: str) -> None:
+        """
+        Сохраняет все метрики в файл: в текстовом формате Prometheus для файлов .prom и .txt,
+        в формате JSON для остальных
+
+        :param path: путь к файлу
+        """
+
+        content = self.to_prometheus() if path.endswith((".prom", ".txt")) else self.to_json()
+        with open(path, "w", encoding="UTF-8") as file:
+            file.write(content)
+
+    def clear(self) -> None:
+        """Удаляет все метрики"""
+
+        with self._lock:
+            self._types.clear()
+            self._values.clear()
+
+    def _register(self, name: str, metric_type: str, description: str) -> dict:
+        """
+        Регистрирует метрику при первом обращении и возвращает словарь её значений.
+        Вызывается под блокировкой
+
+        :raises ValueError: если метрика с таким именем уже зарегистрирована с другим типом
+        """
+
+        registered = self._types.get(name)
+        if registered is None:
+            self._types[name] = (metric_type, description)
+            self._values[name] = {}
+        elif registered[0] != metric_type:
+            raise ValueError(f"Метрика {name} уже зарегистрирована с типом {registered[0]}")
+        elif description and not registered[1]:
+            self._types[name] = (metric_type, description)
+
+        return self._values[name]
+
+    @staticmethod
+    def _get_bounds(values: dict) -> tuple[float, ...] | None:
+        """Возвращает границы корзин, уже использующиеся гистограммой с другими метками"""
+
+        for histogram in values.values():
+            return histogram["bounds"]
+        return None
+
+    @staticmethod
+    def _make_key(labels: dict[str, str] | None) -> tuple[tuple[str, str], ...]:
+        """Преобразует метки в неизменяемый ключ словаря значений"""
+
+        return tuple(sorted((name, str(value)) for name, value in (labels or {}).items()))
+
+    @staticmethod
+    def _accumulate(counts: list[int]) -> list[int]:
+        """Преобразует количества по корзинам в накопленные, как принято в Prometheus (le - 'не больше')"""
+
+        total = 0
+        result = []
+        for count in counts:
+            total += count
+            result.append(total)
+        return result
+
+    @staticmethod
+    def _format_labels(labels: dict[str, str]) -> str:
+        """Форматирует метки для текстового формата Prometheus"""
+
+        if not labels:
+            return ""
+        escaped = (name + '="' + value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") + '"'
+                   for name, value in labels.items())
+        return "{" + ",".join(escaped) + "}"
@@ -0,0 +1,284 @@
+import time
+from collections.abc import Iterator
+from datetime import datetime, timedelta, timezone
+
+import psycopg2
+from psycopg2.extras import execute_values
+
+from entity.vacancy_hh import Vacancy_HH
+from pipeline.ingestion_pipeline import Ingestion_Pipeline
+
+
+class Incremental_Sync(Ingestion_Pipeline):
+    """
+    Конвейер инкрементальной синхронизации вакансий с сайта https://hh.ru.
+
+    Для каждой пары 'компания + поисковый запрос' в таблице sync_watermarks хранится момент
+    последней синхронизации. При следующем запуске у API запрашиваются только вакансии,
+    опубликованные или обновлённые после этого момента (параметр date_from),
+    и в базу данных записываются только они.
+
+    Закрытые вакансии пропадают из поиска сайта, поэтому не реже раза в reconcile_interval
+    выполняется полная сверка: загружаются все текущие вакансии компаний (поиск без ключевого слова),
+    и вакансии этих компаний, которых нет среди загруженных, помечаются закрытыми (поле is_closed).
+    Момент сверки хранится в отдельной таблице sync_reconciliations, поэтому не смешивается
+с моментами синхронизации по ключевым словам.
+    Между сверками закрытыми помечаются только вакансии, которые не обновлялись дольше
+    срока поиска hh.ru (search_period) и поэтому точно не выдаются сайтом.
+    Если вакансии компании получены не полностью (см. Search_Planner), момент синхронизации и сверки
+    для неё не сохраняется, а её вакансии не закрываются по результатам сверки.
+    Закрытые вакансии не учитываются в employer_stats и запросах DB_Manager
+    """
+
+    # таблица с моментами последней синхронизации
+    table_name_watermarks = "sync_watermarks"
+
+    # hh.ru выдаёт в поиске только вакансии, опубликованные или обновлённые за этот период
+    search_period = timedelta(days=30)
+    # периодичность полной сверки вакансий компаний с сайтом
+    reconcile_interval = timedelta(days=1)
+    # таблица с моментами последней полной сверки
+    table_name_reconciliations = "sync_reconciliations"
+
+    # формат даты, который принимает API сайта
+    date_format = "%Y-%m-%dT%H:%M:%S%z"
+
+    def run(self, keyword: str, reconcile: bool | None = None) -> dict[str, int | float | None]:
+        """
+        Сохраняет компании из словаря employers, загружает и сохраняет вакансии,
+        появившиеся или обновлённые с момента предыдущей синхронизации,
+        помечает закрытыми пропавшие с сайта вакансии и запоминает момент синхронизации.
+        Возвращает статистику работы
+
+        :param keyword: ключевое слово для поиска
+        :param reconcile: выполнить полную сверку (True), не выполнять (False)
+                          или выполнить, если с прошлой сверки прошло больше reconcile_interval (None)
+        :raises ValueError: если ключевое слово пустое
+        """
+
+        keyword = keyword.strip()
+        if not keyword:
+            raise ValueError("Для синхронизации нужно указать ключевое слово")
+
+        start = time.perf_counter()
+        started_at = datetime.now(timezone.utc)
+        stats = {"pages": 0, "vacancies": 0, "rows_written": 0, "rows_unchanged": 0, "first_write_after": None,
+                 "closed": 0, "reconciled": 0, "budget_exhausted": False, "truncated": 0}
+        # id компаний, вакансии которых получены не полностью
+        truncated = set()
+
+        employer_ids = list(self.data_storage.employers.keys())
+        self.db_saver.save_to_db(self.table_name_employers, self.data_storage.employers)
+
+        # компании с одинаковым моментом синхронизации запрашиваются одним запросом
+        groups = {}
+        watermarks = self._get_watermarks(keyword, employer_ids)
+        for employer_id in employer_ids:
+            groups.setdefault(watermarks.get(int(employer_id)), []).append(employer_id)
+
+        for watermark, group in groups.items():
+            parameters = {"order_by": "publication_time"}
+            if watermark is not None:
+                parameters["date_from"] = watermark.strftime(self.date_format)
+            self._ingest(self.iter_vacancies(keyword, employer_ids=group, parameters=parameters, truncated=truncated),
+                         stats, start)
+            if stats["budget_exhausted"]:
+                # синхронизация не завершена, при следующем запуске она продолжится с прежнего момента
+                stats["truncated"] = len(truncated)
+                return self._finish_stats(stats, start)
+
+        stats["closed"] = self._close_outdated(employer_ids, started_at)
+        # для компаний с неполными результатами следующая синхронизация начнётся с прежнего момента
+        self._save_watermarks(keyword, [employer_id for employer_id in employer_ids if employer_id not in truncated],
+                              started_at)
+
+        if reconcile is None:
+            reconciled_at = self._get_reconciliations(employer_ids)
+            due = [employer_id for employer_id in employer_ids
+                   if started_at - reconciled_at.get(int(employer_id), datetime.min.replace(tzinfo=timezone.utc))
+                   >= self.reconcile_interval]
+        else:
+            due = employer_ids if reconcile else []
+
+        if due:
+            self._reconcile(due, stats, start, started_at, truncated)
+
+        stats["truncated"] = len(truncated)
+        return self._finish_stats(stats, start)
+
+    def _reconcile(self,
+                   employer_ids: list[str],
+                   stats: dict,
+                   start: float,
+                   started_at: datetime,
+                   truncated: set[str]) -> None:
+        """
+        Загружает и сохраняет все текущие вакансии компаний и помечает закрытыми вакансии этих компаний,
+        которых нет среди загруженных. Если загрузка не завершена (исчерпан бюджет запросов),
+        вакансии не закрываются, сверка повторится при следующем запуске.
+        Вакансии компаний, результаты поиска которых обрезаны, тоже не закрываются:
+        среди загруженных есть не все их открытые вакансии
+
+        :param employer_ids: id компаний
+        :param stats: статистика работы конвейера
+        :param start: время запуска конвейера (time.perf_counter)
+        :param started_at: момент начала синхронизации
+        :param truncated: множество id компаний, вакансии которых получены не полностью
+        """
+
+        current_ids = set()
+
+        def track(pages: Iterator[dict[str, Vacancy_HH]]) -> Iterator[dict[str, Vacancy_HH]]:
+            for vacancies in pages:
+                current_ids.update(vacancies)
+                yield vacancies
+
+        # поиск без ключевого слова выдаёт все текущие вакансии компаний
+        self._ingest(track(self.iter_vacancies("", employer_ids=employer_ids, truncated=truncated)), stats, start)
+        if stats["budget_exhausted"]:
+            return
+
+        employer_ids = [employer_id for employer_id in employer_ids if employer_id not in truncated]
+        if not employer_ids:
+            return
+
+        closed = self._update_closed("UPDATE vacancies SET is_closed = TRUE "
+                                     "WHERE NOT is_closed AND employer_id = ANY(%s) AND vacancy_id <> ALL(%s::int[]) "
+                                     "RETURNING employer_id",
+                                     ([int(employer_id) for employer_id in employer_ids],
+                                      [int(vacancy_id) for vacancy_id in current_ids]))
+        stats["closed"] += closed
+        stats["reconciled"] = len(employer_ids)
+        self._save_reconciliations(employer_ids, started_at)
+
+    def _get_watermarks(self, keyword: str, employer_ids: list[str]) -> dict[int, datetime]:
+        """
+        Возвращает моменты последней синхронизации в формате 'id компании: момент'
+
+        :param keyword: ключевое слово для поиска
+        :param employer_ids: id компаний
+        """
+
+        with self.db_saver.pool.connection() as conn:
+            cur = conn.cursor()
+            cur.execute(f"SELECT employer_id, watermark FROM {self.table_name_watermarks} "
+                        f"WHERE query = %s AND employer_id = ANY(%s)",
+                        (keyword, [int(employer_id) for employer_id in employer_ids]))
+            watermarks = dict(cur.fetchall())
+            cur.close()
+            conn.commit()
+
+        return watermarks
+
+    def _save_watermarks(self, keyword: str, employer_ids: list[str], watermark: datetime) -> None:
+        """
+        Сохраняет момент синхронизации для каждой компании
+
+        :param keyword: ключевое слово для поиска
+        :param employer_ids: id компаний
+        :param watermark: момент начала синхронизации
+        """
+
+        with self.db_saver.pool.connection() as conn:
+            cur = conn.cursor()
+            try:
+                execute_values(cur,
+                               f"""
+                               INSERT INTO {self.table_name_watermarks} (employer_id, query, watermark)
+                               VALUES %s
+                               ON CONFLICT (employer_id, query)
+                               DO UPDATE SET watermark = EXCLUDED.watermark;
+                               """,
+                               [(int(employer_id), keyword, watermark) for employer_id in employer_ids])
+            except psycopg2.Error:
+                conn.rollback()
+                raise
+            finally:
+                cur.close()
+
+            conn.commit()
+
+    def _get_reconciliations(self, employer_ids: list[str]) -> dict[int, datetime]:
+        """
+        Возвращает моменты последней полной сверки в формате 'id компании: момент'
+
+        :param employer_ids: id компаний
+        """
+
+        with self.db_saver.pool.connection() as conn:
+            cur = conn.cursor()
+            cur.execute(f"SELECT employer_id, reconciled_at FROM {self.table_name_reconciliations} "
+                        f"WHERE employer_id = ANY(%s)",
+                        ([int(employer_id) for employer_id in employer_ids],))
+            reconciliations = dict(cur.fetchall())
+            cur.close()
+            conn.commit()
+
+        return reconciliations
+
+    def _save_reconciliations(self, employer_ids: list[str], reconciled_at: datetime) -> None:
+        """
+        Сохраняет момент полной сверки для каждой компании
+
+        :param employer_ids: id компаний
+        :param reconciled_at: момент начала синхронизации, во время которой выполнена сверка
+        """
+
+        with self.db_saver.pool.connection() as conn:
+            cur = conn.cursor()
+            try:
+                execute_values(cur,
+                               f"""
+                               INSERT INTO {self.table_name_reconciliations} (employer_id, reconciled_at)
+                               VALUES %s
+                               ON CONFLICT (employer_id)
+                               DO UPDATE SET reconciled_at = EXCLUDED.reconciled_at;
+                               """,
+                               [(int(employer_id), reconciled_at) for employer_id in employer_ids])
+            except psycopg2.Error:
+                conn.rollback()
+                raise
+            finally:
+                cur.close()
+
+            conn.commit()
+
+    def _close_outdated(self, employer_ids: list[str], now: datetime) -> int:
+        """
+        Помечает закрытыми вакансии компаний, которые не обновлялись дольше срока поиска hh.ru,
+        и возвращает их количество
+
+        :param employer_ids: id компаний
+        :param now: момент начала синхронизации
+        """
+
+        return self._update_closed("UPDATE vacancies SET is_closed = TRUE "
+                                   "WHERE NOT is_closed AND employer_id = ANY(%s) AND published_at < %s "
+                                   "RETURNING employer_id",
+                                   ([int(employer_id) for employer_id in employer_ids], now - self.search_period))
+
+    def _update_closed(self, query: str, parameters: tuple) -> int:
+        """
+        Исполняет запрос, изменяющий отметку о закрытии вакансий (запрос должен возвращать employer_id
+        изменённых строк), в той же транзакции пересчитывает employer_stats для затронутых компаний
+        и возвращает количество изменённых вакансий
+
+        :param query: строка SQL-запроса
+        :param parameters: параметры запроса
+        """
+
+        with self.db_saver.pool.connection() as conn:
+            cur = conn.cursor()
+            try:
+                cur.execute(query, parameters)
+                employer_ids = [employer_id for (employer_id,) in cur.fetchall()]
+                if employer_ids:
+                    self.db_saver._refresh_employer_stats(conn, set(employer_ids))
+            except psycopg2.Error:
+                conn.rollback()
+                raise
+            finally:
+                cur.close()
+
+            conn.commit()
+        return len(employer_ids)
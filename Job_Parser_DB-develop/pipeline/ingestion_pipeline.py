@@ -0,0 +1,153 @@
+import time
+from collections.abc import Iterable, Iterator
+
+from api_client.rate_limiter import Request_Budget_Exceeded
+from data_storage.data_storage_hh import Data_Storage_HH
+from data_storage.search_planner import Search_Planner
+from database.db_saver import DB_Saver
+from entity.vacancy_hh import Vacancy_HH
+
+
+class Ingestion_Pipeline:
+    """
+    Неинтерактивный конвейер загрузки вакансий с сайта https://hh.ru прямо в базу данных.
+
+    Страницы результатов поиска обрабатываются по мере получения: из каждой страницы
+    создаются объекты Vacancy_HH, которые пакетами сохраняются через DB_Saver.
+    В памяти одновременно находятся только несколько страниц текущего шарда поиска, поэтому расход памяти
+    не зависит от количества компаний и вакансий, а первые строки попадают в базу данных,
+    пока следующие страницы ещё загружаются
+    """
+
+    # имена таблиц для базы данных
+    table_name_employers = "employers"
+    table_name_vacancies = "vacancies"
+
+    # количество вакансий, накапливаемых перед записью в базу данных
+    flush_size = 500
+
+    def __init__(self, data_storage: Data_Storage_HH, db_saver: DB_Saver, flush_size: int | None = None) -> None:
+        """
+        Инициализатор объектов класса
+
+        :param data_storage: объект для поиска данных на сайте, в словаре employers
+                             должны быть компании, вакансии которых нужно загрузить
+        :param db_saver: объект для сохранения данных в базу данных
+        :param flush_size: количество вакансий, накапливаемых перед записью в базу данных
+        """
+
+        self.data_storage = data_storage
+        self.db_saver = db_saver
+        if flush_size is not None:
+            self.flush_size = max(1, flush_size)
+
+    def iter_vacancies(self,
+                       keyword: str,
+                       number: int | None = None,
+                       employer_ids: Iterable[str] | None = None,
+                       parameters: dict | None = None,
+                       truncated: set[str] | None = None) -> Iterator[dict[str, Vacancy_HH]]:
+        """
+        Возвращает генератор, который выдаёт вакансии компаний постранично в формате 'id: объект'.
+        Поиск делится на шарды (Search_Planner), чтобы получить все найденные вакансии,
+        а не только первые 2000, которые API сайта выдаёт по одному запросу
+
+        :param keyword: ключевое слово для поиска
+        :param number: максимальное количество вакансий, по умолчанию все найденные
+        :param employer_ids: id компаний, по умолчанию все компании из словаря employers
+        :param parameters: дополнительные параметры запроса к API сайта
+        :param truncated: опциональный параметр, множество, в которое добавляются id компаний,
+                          у которых найдено больше вакансий, чем удалось получить (см. Search_Planner)
+        """
+
+        if employer_ids is None:
+            employer_ids = self.data_storage.employers.keys()
+
+        pages = Search_Planner(self.data_storage).iter_pages(keyword, employer_ids, number, parameters,
+                                                             as_vacancies=True, truncated=truncated)
+        for vacancies in pages:
+            yield {vacancy.vacancy_id: vacancy for vacancy in vacancies}
+
+    def run(self,
+            keyword: str,
+            number: int | None = None,
+            employer_ids: Iterable[str] | None = None,
+            parameters: dict | None = None) -> dict[str, int | float | None]:
+        """
+        Сохраняет компании из словаря employers, затем загружает их вакансии
+        и сохраняет пакетами по flush_size штук.
+        Возвращает статистику работы конвейера; truncated - количество компаний,
+        вакансии которых получены не полностью (см. Search_Planner)
+
+        :param keyword: ключевое слово для поиска
+        :param number: максимальное количество вакансий, по умолчанию все найденные
+        :param employer_ids: id компаний, по умолчанию все компании из словаря employers
+        :param parameters: дополнительные параметры запроса к API сайта
+        """
+
+        start = time.perf_counter()
+        stats = {"pages": 0, "vacancies": 0, "rows_written": 0, "rows_unchanged": 0, "first_write_after": None,
+                 "budget_exhausted": False, "truncated": 0}
+
+        truncated = set()
+        self.db_saver.save_to_db(self.table_name_employers, self.data_storage.employers)
+        self._ingest(self.iter_vacancies(keyword, number, employer_ids, parameters, truncated), stats, start)
+        stats["truncated"] = len(truncated)
+
+        return self._finish_stats(stats, start)
+
+    def _ingest(self, pages: Iterable[dict[str, Vacancy_HH]], stats: dict, start: float) -> None:
+        """
+        Накапливает вакансии из переданных страниц и сохраняет их пакетами по flush_size штук.
+        Если исчерпан бюджет запросов, загрузка останавливается, уже полученные вакансии сохраняются,
+        а в статистике отмечается budget_exhausted
+
+        :param pages: страницы вакансий в формате 'id: объект'
+        :param stats: статистика работы конвейера
+        :param start: время запуска конвейера (time.perf_counter)
+        """
+
+        buffer = {}
+        try:
+            for vacancies in pages:
+                stats["pages"] += 1
+                stats["vacancies"] += len(vacancies)
+                buffer.update(vacancies)
+
+                if len(buffer) >= self.flush_size:
+                    self._flush(buffer, stats, start)
+                    buffer = {}
+        except Request_Budget_Exceeded:
+            stats["budget_exhausted"] = True
+
+        if buffer:
+            self._flush(buffer, stats, start)
+
+    @staticmethod
+    def _finish_stats(stats: dict, start: float) -> dict:
+        """
+        Дополняет статистику общим временем работы и скоростью записи и возвращает её
+
+        :param stats: статистика работы конвейера
+        :param start: время запуска конвейера (time.perf_counter)
+        """
+
+        seconds = time.perf_counter() - start
+        stats["seconds"] = round(seconds, 3)
+        stats["rows_per_second"] = round(stats["rows_written"] / seconds) if seconds else stats["rows_written"]
+        return stats
+
+    def _flush(self, buffer: dict[str, Vacancy_HH], stats: dict, start: float) -> None:
+        """
+        Сохраняет накопленные вакансии в базу данных и обновляет статистику
+
+        :param buffer: словарь вакансий в формате 'id: объект'
+        :param stats: статистика работы конвейера
+        :param start: время запуска конвейера (time.perf_counter)
+        """
+
+        written = self.db_saver.save_to_db(self.table_name_vacancies, buffer)
+        stats["rows_written"] += written["rows"]
+        stats["rows_unchanged"] += written["unchanged"]
+        if stats["first_write_after"] is None:
+            stats["first_write_after"] = round(time.perf_counter() - start, 3)
@@ -0,0 +1,61 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from batch_runner import Batch_Runner
+
+
+class Test_Load_Jobs(unittest.TestCase):
+    """Чтение и проверка файла заданий"""
+
+    def load(self, content: dict | list) -> list[dict]:
+        """Записывает задания во временный файл и читает их через Batch_Runner.load_jobs"""
+
+        with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False, encoding="UTF-8") as file:
+            json.dump(content, file)
+        self.addCleanup(os.remove, file.name)
+        return Batch_Runner.load_jobs(file.name)
+
+    def test_defaults_are_applied(self) -> None:
+        jobs = self.load({"employers": [1740], "number": 100, "keywords": ["python"],
+                          "jobs": [{"keyword": "go", "employers": ["78638"]}]})
+
+        self.assertEqual(jobs, [{"keyword": "python", "employers": ["1740"], "number": 100},
+                                {"keyword": "go", "employers": ["78638"], "number": 100}])
+
+    def test_number_may_be_omitted(self) -> None:
+        self.assertIsNone(self.load([{"keyword": "python", "employers": ["1"]}])[0]["number"])
+
+    def test_invalid_number_is_rejected(self) -> None:
+        for number in ("100", -5, 0, 1.5, True):
+            with self.subTest(number=number), self.assertRaises(ValueError):
+                self.load([{"keyword": "python", "employers": ["1"], "number": number}])
+
+    def test_job_without_keyword_or_employers_is_rejected(self) -> None:
+        with self.assertRaises(ValueError):
+            self.load([{"employers": ["1"]}])
+        with self.assertRaises(ValueError):
+            self.load([{"keyword": "python"}])
+
+
+class Test_Run_Job(unittest.TestCase):
+    """Ошибки одного задания не прерывают пакетную загрузку"""
+
+    def test_unexpected_error_is_recorded_in_status(self) -> None:
+        runner = Batch_Runner([], db_saver=mock.Mock())
+        runner.data_storage._client = mock.Mock()
+        runner.data_storage.employers = {"1": mock.Mock()}
+        job = {"keyword": "python", "employers": ["1"], "number": None}
+
+        with mock.patch("batch_runner.Ingestion_Pipeline") as pipeline, \
+                self.assertLogs("job_parser.batch_runner", level="ERROR"):
+            pipeline.return_value.run.side_effect = TypeError("неверный тип")
+            result = runner.run_job(job)
+
+        self.assertIn("TypeError", result["status"])
+
+
+if __name__ == "__main__":
+    unittest.main()
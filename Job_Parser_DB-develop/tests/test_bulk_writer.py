@@ -0,0 +1,111 @@
+import unittest
+from unittest import mock
+
+from database.bulk_writer import Bulk_Writer
+
+
+class Fake_Entity:
+    """Сущность с произвольными полями и значениями"""
+
+    def __init__(self, fields: tuple, values: tuple) -> None:
+        self.fields = fields
+        self.values = values
+
+    def get_fields(self) -> tuple:
+        return self.fields
+
+    def get_values(self) -> tuple:
+        return self.values
+
+
+class Fake_Connection:
+    """Соединение, курсор которого ничего не выполняет"""
+
+    def cursor(self) -> mock.Mock:
+        return mock.Mock()
+
+
+class Test_Bulk_Writer(unittest.TestCase):
+    """Группировка, порядок строк, контрольные суммы и запросы Bulk_Writer"""
+
+    fields = ("vacancy_id", "name")
+
+    def write(self, entities: list, results: list | None = None, **kwargs) -> tuple[dict, mock.Mock]:
+        """Сохраняет сущности, подменив execute_values, и возвращает статистику и подменённую функцию"""
+
+        writer = Bulk_Writer(Fake_Connection(), **kwargs)
+        with mock.patch("database.bulk_writer.execute_values",
+                        side_effect=lambda cur, query, values, **_: results or [(True,)] * len(values)) as execute:
+            stats = writer.write("vacancies", entities)
+        return stats, execute
+
+    def test_groups_entities_by_fields(self) -> None:
+        entities = [Fake_Entity(self.fields, ("1", "a")),
+                    Fake_Entity(("vacancy_id",), ("2",)),
+                    Fake_Entity(self.fields, ("3", "c"))]
+
+        stats, execute = self.write(entities)
+
+        self.assertEqual(execute.call_count, 2)
+        queries = [call.args[1] for call in execute.call_args_list]
+        self.assertIn("INSERT INTO vacancies (vacancy_id, name, content_hash)", queries[0])
+        self.assertIn("INSERT INTO vacancies (vacancy_id, content_hash)", queries[1])
+        self.assertEqual(stats["rows"], 3)
+
+    def test_rows_are_sorted_by_numeric_key(self) -> None:
+        entities = [Fake_Entity(self.fields, (key, "x")) for key in ("10", "9", "100", "1")]
+
+        _, execute = self.write(entities)
+
+        self.assertEqual([row[0] for row in execute.call_args.args[2]], ["1", "9", "10", "100"])
+
+    def test_sort_key_accepts_int_and_none(self) -> None:
+        rows = [("b",), (None,), (20,), ("3",)]
+
+        self.assertEqual(sorted(rows, key=Bulk_Writer._get_sort_key), [("3",), (20,), ("b",), (None,)])
+
+    def test_content_hash_is_appended_and_stable(self) -> None:
+        _, execute = self.write([Fake_Entity(self.fields, ("1", "python"))])
+
+        row = execute.call_args.args[2][0]
+        self.assertEqual(row[:2], ("1", "python"))
+        self.assertEqual(row[2], Bulk_Writer.get_content_hash(("1", "python")))
+        self.assertEqual(len(row[2]), 32)
+        self.assertNotEqual(row[2], Bulk_Writer.get_content_hash(("1", "python*")))
+        self.assertNotEqual(Bulk_Writer.get_content_hash(("1", None)), Bulk_Writer.get_content_hash(("1", "None")))
+
+    def test_counts_inserted_updated_and_unchanged(self) -> None:
+        entities = [Fake_Entity(self.fields, (str(key), "x")) for key in range(4)]
+
+        stats = self.write(entities, results=[(True,), (False,)])[0]
+
+        self.assertEqual((stats["inserted"], stats["updated"], stats["unchanged"]), (1, 1, 2))
+
+    def test_large_groups_use_copy(self) -> None:
+        writer = Bulk_Writer(Fake_Connection(), copy_threshold=2)
+        entities = [Fake_Entity(self.fields, (key, "x")) for key in ("2", "1")]
+
+        with mock.patch.object(writer, "_copy_and_merge", return_value=(1, 0)) as copy_and_merge, \
+                mock.patch("database.bulk_writer.execute_values") as execute:
+            stats = writer.write("vacancies", entities)
+
+        execute.assert_not_called()
+        self.assertEqual([row[0] for row in copy_and_merge.call_args.args[3]], ["1", "2"])
+        self.assertEqual((stats["inserted"], stats["unchanged"]), (1, 1))
+
+    def test_upsert_skips_unchanged_rows(self) -> None:
+        query = Bulk_Writer._get_insert_string("employers", ("employer_id", "name", "content_hash"))
+
+        self.assertIn("WHERE employers.content_hash IS DISTINCT FROM EXCLUDED.content_hash", query)
+        self.assertNotIn("is_closed", query)
+
+    def test_upsert_reopens_closed_vacancies(self) -> None:
+        fields = ("vacancy_id", "name", "content_hash")
+        for query in (Bulk_Writer._get_insert_string("vacancies", fields),
+                      Bulk_Writer._get_merge_string("vacancies", "tmp_vacancies", fields)):
+            self.assertIn("is_closed = FALSE", query)
+            self.assertIn("OR vacancies.is_closed IS DISTINCT FROM FALSE", query)
+
+
+if __name__ == "__main__":
+    unittest.main()
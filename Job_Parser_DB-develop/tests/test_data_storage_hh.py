@@ -0,0 +1,36 @@
+import unittest
+from unittest import mock
+
+import requests
+
+from api_client.rate_limiter import Request_Budget_Exceeded
+from data_storage.data_storage_hh import Data_Storage_HH
+from entity.employer_hh import Employer_HH
+
+
+class Test_Load_Employers(unittest.TestCase):
+    """Сводка параллельной загрузки компаний"""
+
+    def test_summary_separates_budget_from_connection_errors(self) -> None:
+        storage = Data_Storage_HH(client=mock.Mock())
+        storage.employers = {"5": Employer_HH("5", "Уже в списке", "url", 1)}
+
+        def get_employer(employer_id: str) -> Employer_HH | None:
+            if employer_id == "1":
+                return Employer_HH("1", "Компания", "url", 3)
+            if employer_id == "2":
+                raise Request_Budget_Exceeded("Исчерпан лимит запросов")
+            if employer_id == "3":
+                raise requests.ConnectionError("Нет соединения")
+            return None
+
+        with mock.patch.object(storage, "_get_employer", side_effect=get_employer):
+            summary = storage.load_employers(["1", "2", "3", "4", "5", "abc", "1"])
+
+        self.assertEqual(summary, {"added": ["1"], "skipped": ["5"], "not_found": ["abc", "4"],
+                                   "failed": ["3"], "budget": ["2"]})
+        self.assertIn("1", storage.employers)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+import contextlib
+import io
+import unittest
+from unittest import mock
+
+from database.db_manager import DB_Manager
+from database.query_registry import Query_Registry
+
+SCRIPT = """
+-- command: 1
+SELECT employer_id FROM employers;
+
+-- command: 2
+SELECT vacancy_id, name FROM vacancies WHERE vacancy_id > %(after)s ORDER BY vacancy_id LIMIT %(limit)s;
+"""
+
+ROWS = [(vacancy_id, f"vacancy {vacancy_id}") for vacancy_id in range(1, 131)]
+
+
+class Fake_Pool:
+    """Пул соединений, запросы к которому выполняются над списком ROWS, а события записываются"""
+
+    def __init__(self, registry: Query_Registry) -> None:
+        self.registry = registry
+        self.events = []
+
+    @contextlib.contextmanager
+    def connection(self):
+        self.events.append("acquire")
+        yield self
+        self.events.append("release")
+
+    def cursor(self) -> "Fake_Pool":
+        return self
+
+    def execute(self, query: str, values: tuple | None = None) -> None:
+        self.events.append(("execute", values))
+        self.description = [("vacancy_id",), ("name",)]
+        if values is None:
+            self.rows = ROWS
+        else:
+            after, limit = values
+            self.rows = [row for row in ROWS if row[0] > after][:limit]
+
+    def fetchall(self) -> list[tuple]:
+        return self.rows
+
+    def close(self) -> None:
+        pass
+
+    def commit(self) -> None:
+        self.events.append("commit")
+
+
+class Test_Run_Sql_Query(unittest.TestCase):
+    """Постраничный вывод результатов запросов DB_Manager"""
+
+    def setUp(self) -> None:
+        self.manager = DB_Manager.__new__(DB_Manager)
+        self.manager.queries = Query_Registry(SCRIPT)
+        self.manager.commands = {"1": ("Все компании", None), "2": ("Все вакансии", None)}
+        self.manager.itersize = 60
+        self.manager.page_size = 20
+        self.pool = self.manager._pool = Fake_Pool(self.manager.queries)
+
+    def run_query(self, command: str, answers: list[bool]) -> dict:
+        """Выполняет запрос без вывода на экран, отвечая на вопросы о следующей странице из answers"""
+
+        def ask() -> bool:
+            self.pool.events.append("ask")
+            return answers.pop(0)
+
+        with mock.patch.object(self.manager, "_ask_next_page", side_effect=ask), \
+                mock.patch("database.db_manager.Metrics_Registry"), \
+                contextlib.redirect_stdout(io.StringIO()):
+            return self.manager._run_sql_query(command)
+
+    def test_streamed_command_continues_after_last_row(self) -> None:
+        summary = self.run_query("2", [True] * 10)
+
+        self.assertEqual(summary["rows"], len(ROWS))
+        self.assertEqual(summary["sample"], ROWS[:DB_Manager.summary_rows])
+        executed = [event[1] for event in self.pool.events if isinstance(event, tuple)]
+        self.assertEqual(executed, [(0, 61), (60, 61), (120, 61)])
+
+    def test_no_connection_is_held_while_asking(self) -> None:
+        self.run_query("2", [True] * 10)
+
+        acquired = False
+        for event in self.pool.events:
+            if event in ("acquire", "release"):
+                acquired = event == "acquire"
+            elif event == "ask":
+                self.assertFalse(acquired)
+        self.assertEqual(self.pool.events.count("acquire"), self.pool.events.count("commit"))
+
+    def test_stops_when_user_declines(self) -> None:
+        summary = self.run_query("2", [False])
+
+        self.assertEqual(summary["rows"], self.manager.page_size)
+        self.assertEqual(self.pool.events.count("acquire"), 1)
+
+    def test_not_streamed_command_is_fetched_once(self) -> None:
+        summary = self.run_query("1", [True] * 10)
+
+        self.assertEqual(summary["rows"], len(ROWS))
+        self.assertEqual([event for event in self.pool.events if isinstance(event, tuple)], [("execute", None)])
+
+
+if __name__ == "__main__":
+    unittest.main()
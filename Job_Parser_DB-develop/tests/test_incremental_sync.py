@@ -0,0 +1,93 @@
+import unittest
+from datetime import datetime, timezone
+from unittest import mock
+
+from pipeline.incremental_sync import Incremental_Sync
+
+
+class Test_Incremental_Sync(unittest.TestCase):
+    """Моменты синхронизации и сверки без обращения к базе данных и сайту"""
+
+    def setUp(self) -> None:
+        data_storage = mock.Mock()
+        data_storage.employers = {"1": mock.Mock(), "2": mock.Mock()}
+        self.sync = Incremental_Sync(data_storage, mock.Mock())
+
+        for name, value in (("_get_watermarks", {}), ("_get_reconciliations", {}), ("_close_outdated", 0),
+                            ("_update_closed", 0), ("_save_watermarks", None), ("_save_reconciliations", None),
+                            ("_flush", None)):
+            patcher = mock.patch.object(self.sync, name, return_value=value)
+            setattr(self, name.lstrip("_"), patcher.start())
+            self.addCleanup(patcher.stop)
+
+    def use_search(self, pages: dict[str, list[str]], truncated_ids: set[str] = frozenset()) -> None:
+        """
+        Подменяет поиск вакансий: для ключевого слова выдаются страницы вакансий из pages,
+        id компаний из truncated_ids отмечаются как компании с обрезанными результатами
+        """
+
+        def iter_vacancies(keyword, number=None, employer_ids=None, parameters=None, truncated=None):
+            if truncated is not None:
+                truncated.update(truncated_ids & set(employer_ids))
+            for vacancy_id in pages.get(keyword, []):
+                yield {vacancy_id: mock.Mock()}
+
+        patcher = mock.patch.object(self.sync, "iter_vacancies", side_effect=iter_vacancies)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_empty_keyword_is_rejected(self) -> None:
+        with self.assertRaises(ValueError):
+            self.sync.run("  ")
+
+    def test_reconciliation_is_stored_apart_from_watermarks(self) -> None:
+        self.use_search({"python": ["10"], "": ["10", "11"]})
+
+        stats = self.sync.run("python")
+
+        self.save_watermarks.assert_called_once()
+        self.assertEqual(self.save_watermarks.call_args.args[:2], ("python", ["1", "2"]))
+        self.save_reconciliations.assert_called_once()
+        self.assertEqual(self.save_reconciliations.call_args.args[0], ["1", "2"])
+        self.assertEqual(stats["reconciled"], 2)
+        employer_ids, current_ids = self.update_closed.call_args.args[1]
+        self.assertEqual(employer_ids, [1, 2])
+        self.assertEqual(sorted(current_ids), [10, 11])
+
+    def test_recent_reconciliation_is_not_repeated(self) -> None:
+        self.use_search({"python": ["10"]})
+        self.get_reconciliations.return_value = {1: datetime.now(timezone.utc), 2: datetime.now(timezone.utc)}
+
+        stats = self.sync.run("python")
+
+        self.save_reconciliations.assert_not_called()
+        self.update_closed.assert_not_called()
+        self.assertEqual(stats["reconciled"], 0)
+
+    def test_truncated_employers_keep_watermark_and_open_vacancies(self) -> None:
+        self.use_search({"python": ["10"], "": ["10"]}, truncated_ids={"2"})
+
+        stats = self.sync.run("python")
+
+        self.assertEqual(stats["truncated"], 1)
+        self.assertEqual(self.save_watermarks.call_args.args[1], ["1"])
+        self.assertEqual(self.save_reconciliations.call_args.args[0], ["1"])
+        self.assertEqual(self.update_closed.call_args.args[1][0], [1])
+
+    def test_budget_exhausted_keeps_watermarks(self) -> None:
+        from api_client.rate_limiter import Request_Budget_Exceeded
+
+        def iter_vacancies(*args, **kwargs):
+            raise Request_Budget_Exceeded("Исчерпан лимит запросов")
+            yield
+
+        with mock.patch.object(self.sync, "iter_vacancies", side_effect=iter_vacancies):
+            stats = self.sync.run("python")
+
+        self.assertTrue(stats["budget_exhausted"])
+        self.save_watermarks.assert_not_called()
+        self.update_closed.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
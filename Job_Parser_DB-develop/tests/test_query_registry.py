@@ -0,0 +1,107 @@
+import unittest
+
+from database.query_registry import Query_Registry
+
+SCRIPT = """
+--
+-- Общий комментарий без команды
+--
+
+--
+-- command: 1
+-- Все компании
+--
+
+SELECT employer_id, name FROM employers;
+
+--
+-- command: 5
+-- Поиск по слову
+--
+
+SELECT name, word_similarity(%(keyword)s, name) AS rank
+FROM vacancies
+WHERE name ILIKE %(pattern)s AND (word_similarity(%(keyword)s, name), vacancy_id) < (%(after_rank)s, %(after)s)
+LIMIT %(limit)s;
+"""
+
+
+class Fake_Cursor:
+    """Курсор, который запоминает выполненные запросы"""
+
+    def __init__(self, executed: list) -> None:
+        self.executed = executed
+
+    def execute(self, query: str, values: tuple | None = None) -> None:
+        self.executed.append((query, values))
+
+    def close(self) -> None:
+        pass
+
+
+class Fake_Connection:
+    """Соединение, которое создаёт Fake_Cursor"""
+
+    def __init__(self) -> None:
+        self.executed = []
+        self.committed = False
+
+    def cursor(self) -> Fake_Cursor:
+        return Fake_Cursor(self.executed)
+
+    def commit(self) -> None:
+        self.committed = True
+
+
+class Test_Query_Registry(unittest.TestCase):
+    """Разбор файла запросов, подготовка и исполнение запросов"""
+
+    def setUp(self) -> None:
+        self.registry = Query_Registry(SCRIPT)
+
+    def test_parses_commands_without_comments(self) -> None:
+        self.assertEqual(set(self.registry.queries), {"1", "5"})
+        self.assertEqual(self.registry.queries["1"], "SELECT employer_id, name FROM employers")
+        self.assertNotIn("--", self.registry.queries["5"])
+
+    def test_parameters_are_unique_in_order_of_appearance(self) -> None:
+        self.assertEqual(self.registry.parameters["1"], ())
+        self.assertEqual(self.registry.parameters["5"], ("keyword", "pattern", "after_rank", "after", "limit"))
+
+    def test_prepare_numbers_parameters(self) -> None:
+        conn = Fake_Connection()
+
+        self.registry.prepare(conn)
+
+        statements = dict((query.split()[1], query) for query, _ in conn.executed)
+        self.assertTrue(conn.committed)
+        self.assertEqual(statements["query_1"], "PREPARE query_1 AS SELECT employer_id, name FROM employers")
+        prepared = statements["query_5"]
+        self.assertNotIn("%(", prepared)
+        self.assertEqual(prepared.count("$1"), 2)
+        self.assertIn("name ILIKE $2", prepared)
+        self.assertIn("< ($3, $4)", prepared)
+        self.assertIn("LIMIT $5", prepared)
+
+    def test_execute_passes_values_in_parameter_order(self) -> None:
+        executed = []
+        parameters = {"limit": 51, "after": 0, "after_rank": 2, "pattern": "%py%", "keyword": "py"}
+
+        self.registry.execute(Fake_Cursor(executed), "5", parameters)
+
+        self.assertEqual(executed, [("EXECUTE query_5 (%s, %s, %s, %s, %s)", ("py", "%py%", 2, 0, 51))])
+
+    def test_execute_without_parameters(self) -> None:
+        executed = []
+
+        self.registry.execute(Fake_Cursor(executed), "1")
+
+        self.assertEqual(executed, [("EXECUTE query_1", None)])
+
+    def test_execute_requires_all_parameters(self) -> None:
+        with self.assertRaises(KeyError):
+            self.registry.execute(Fake_Cursor([]), "5", {"keyword": "py"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+import unittest
+
+from api_client.rate_limiter import Rate_Limit_Registry, Rate_Limiter, Request_Budget_Exceeded
+
+
+class Test_Rate_Limiter(unittest.TestCase):
+    """Ведро с токенами и подстройка частоты запросов"""
+
+    def test_rejects_non_positive_rate(self) -> None:
+        with self.assertRaises(ValueError):
+            Rate_Limiter(0)
+
+    def test_burst_is_not_delayed(self) -> None:
+        limiter = Rate_Limiter(rate=1, burst=3)
+
+        delays = [limiter._reserve() for _ in range(3)]
+
+        self.assertTrue(all(delay <= 0 for delay in delays))
+
+    def test_requests_after_burst_wait_for_tokens(self) -> None:
+        limiter = Rate_Limiter(rate=2, burst=1)
+        limiter._reserve()
+
+        second = limiter._reserve()
+        third = limiter._reserve()
+
+        self.assertAlmostEqual(second, 0.5, delta=0.05)
+        self.assertAlmostEqual(third, 1.0, delta=0.05)
+
+    def test_slow_down_and_speed_up(self) -> None:
+        limiter = Rate_Limiter(rate=10, burst=10)
+
+        limiter.slow_down()
+        self.assertEqual(limiter.rate, 5)
+        for _ in range(10):
+            limiter.slow_down()
+        self.assertEqual(limiter.rate, 10 * Rate_Limiter.min_rate_share)
+
+        for _ in range(100):
+            limiter.speed_up()
+        self.assertEqual(limiter.rate, 10)
+
+    def test_retry_after_delays_next_request(self) -> None:
+        limiter = Rate_Limiter(rate=100, burst=10)
+
+        limiter.slow_down(delay=2)
+
+        self.assertGreater(limiter._reserve(), 1.9)
+
+
+class Test_Rate_Limit_Registry(unittest.TestCase):
+    """Ограничители хостов и бюджет запросов"""
+
+    def setUp(self) -> None:
+        self.registry = Rate_Limit_Registry(limits={"api.hh.ru": (1000, 1000)}, default_limit=(500, 500))
+
+    def test_one_limiter_per_host(self) -> None:
+        limiter = self.registry.get_limiter("https://api.hh.ru/vacancies")
+
+        self.assertIs(limiter, self.registry.get_limiter("https://api.hh.ru/employers/1"))
+        self.assertEqual(limiter.max_rate, 1000)
+        self.assertEqual(self.registry.get_limiter("https://example.com").max_rate, 500)
+
+    def test_budget_is_enforced(self) -> None:
+        self.registry.set_budget(2)
+
+        self.registry.acquire("https://api.hh.ru/vacancies")
+        self.registry.acquire("https://api.hh.ru/vacancies")
+        with self.assertRaises(Request_Budget_Exceeded):
+            self.registry.acquire("https://api.hh.ru/vacancies")
+
+        self.assertEqual(self.registry.get_stats()["requests"], 2)
+
+    def test_set_budget_resets_counter(self) -> None:
+        self.registry.set_budget(1)
+        self.registry.acquire("https://api.hh.ru/vacancies")
+
+        self.registry.set_budget(1)
+        self.registry.acquire("https://api.hh.ru/vacancies")
+
+        self.registry.set_budget(None)
+        for _ in range(5):
+            self.registry.acquire("https://api.hh.ru/vacancies")
+
+    def test_report_429_slows_down_host(self) -> None:
+        url = "https://api.hh.ru/vacancies"
+
+        self.registry.report(url, 429)
+        self.registry.report(url, 200)
+
+        stats = self.registry.get_stats()
+        self.assertEqual(stats["throttled"], 1)
+        self.assertLess(stats["rates"]["api.hh.ru"], 1000)
+
+    def test_budget_error_is_request_exception(self) -> None:
+        import requests
+
+        self.assertTrue(issubclass(Request_Budget_Exceeded, requests.RequestException))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from currency.rate_provider_cbr import Rate_Provider_CBR
+
+
+class Test_Expiration(unittest.TestCase):
+    """Срок действия таблицы курсов для дат со смещением и без него"""
+
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "cbr_rates.json")
+        self.provider = Rate_Provider_CBR(self.path, client=object())
+
+    def test_date_with_offset(self) -> None:
+        published = datetime.now(timezone.utc).replace(microsecond=0)
+
+        expires_at = self.provider._get_expiration(published.isoformat())
+
+        self.assertEqual(expires_at, published + timedelta(days=1))
+
+    def test_date_without_offset_is_moscow_time(self) -> None:
+        published = datetime.now(Rate_Provider_CBR.cbr_timezone).replace(microsecond=0, tzinfo=None)
+
+        expires_at = self.provider._get_expiration(published.isoformat())
+
+        self.assertEqual(expires_at, published.replace(tzinfo=Rate_Provider_CBR.cbr_timezone) + timedelta(days=1))
+
+    def test_missing_date_uses_one_day(self) -> None:
+        expires_at = self.provider._get_expiration(None)
+
+        self.assertAlmostEqual((expires_at - datetime.now(timezone.utc)).total_seconds(), 86400, delta=5)
+
+    def test_naive_expiration_from_disk(self) -> None:
+        with open(self.path, "w", encoding="UTF-8") as file:
+            json.dump({"expires_at": "2100-01-01T00:00:00", "table": {"USD": {"Value": 90, "Nominal": 1}}}, file)
+
+        self.provider._load_from_disk()
+
+        self.assertIsNotNone(self.provider._expires_at.tzinfo)
+        self.assertTrue(self.provider._is_fresh())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from data_storage.search_planner import Search_Planner
+
+
+class Fake_Storage:
+    """Хранилище, которое вместо обращения к API сайта возвращает одну вакансию на шард"""
+
+    per_page = 50
+
+    def __init__(self, found: int) -> None:
+        self.found = found
+        self.requests = []
+
+    @staticmethod
+    def _build_vacancies_url(employer_ids: list[str]) -> str:
+        return "vacancies?" + ",".join(employer_ids)
+
+    def _get_page(self, url: str, parameters: dict) -> tuple[list[dict], int, int | None]:
+        self.requests.append((url, parameters))
+        vacancy_id = f"{url}|{parameters.get('date_from')}|{parameters.get('date_to')}"
+        return [{"id": vacancy_id}], 1, self.found
+
+    @staticmethod
+    def _iter_pages(url, keyword, number, parameters, as_vacancies, first_page):
+        yield first_page[0]
+
+
+class Test_Split(unittest.TestCase):
+    """Деление шарда по компаниям и по периоду публикации"""
+
+    def setUp(self) -> None:
+        self.planner = Search_Planner(Fake_Storage(found=0))
+
+    def test_splits_employers_in_halves(self) -> None:
+        shard = {"employer_ids": ["1", "2", "3"], "date_from": None, "date_to": None}
+
+        halves = self.planner._split(shard, None)
+
+        self.assertEqual([half["employer_ids"] for half in halves], [["1"], ["2", "3"]])
+        self.assertTrue(all(half["date_from"] is None and half["date_to"] is None for half in halves))
+
+    def test_splits_single_employer_by_period(self) -> None:
+        date_from = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        date_to = datetime(2026, 1, 3, tzinfo=timezone.utc)
+        shard = {"employer_ids": ["1"], "date_from": date_from, "date_to": date_to}
+
+        first, second = self.planner._split(shard, None)
+
+        middle = datetime(2026, 1, 2, tzinfo=timezone.utc)
+        self.assertEqual((first["date_from"], first["date_to"]), (date_from, middle))
+        self.assertEqual((second["date_from"], second["date_to"]), (middle, date_to))
+
+    def test_takes_period_from_parameters(self) -> None:
+        shard = {"employer_ids": ["1"], "date_from": None, "date_to": None}
+        parameters = {"date_from": "2026-01-01T00:00:00+0000", "date_to": "2026-01-01T04:00:00+0000"}
+
+        first, second = self.planner._split(shard, parameters)
+
+        self.assertEqual(first["date_from"], datetime(2026, 1, 1, tzinfo=timezone.utc))
+        self.assertEqual(first["date_to"], datetime(2026, 1, 1, 2, tzinfo=timezone.utc))
+        self.assertEqual(second["date_to"], datetime(2026, 1, 1, 4, tzinfo=timezone.utc))
+
+    def test_does_not_split_below_min_period(self) -> None:
+        date_from = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        shard = {"employer_ids": ["1"], "date_from": date_from, "date_to": date_from + self.planner.min_period}
+
+        self.assertEqual(self.planner._split(shard, None), [])
+
+
+class Test_Iter_Pages(unittest.TestCase):
+    """Выдача страниц шардов и отметка обрезанных результатов"""
+
+    def test_small_result_is_one_request(self) -> None:
+        storage = Fake_Storage(found=10)
+        truncated = set()
+
+        pages = list(Search_Planner(storage).iter_pages("python", ["1", "2"], truncated=truncated))
+
+        self.assertEqual(len(pages), 1)
+        self.assertEqual(len(storage.requests), 1)
+        self.assertEqual(truncated, set())
+
+    def test_reports_shards_that_cannot_be_split(self) -> None:
+        storage = Fake_Storage(found=Search_Planner.result_window + 1)
+        planner = Search_Planner(storage)
+        planner.min_period = timedelta(days=Search_Planner.search_period.days)
+        truncated = set()
+
+        with self.assertLogs("job_parser.search_planner", level="WARNING"):
+            pages = list(planner.iter_pages("python", ["1", "2"], truncated=truncated))
+
+        self.assertEqual(truncated, {"1", "2"})
+        # шард делится по компаниям, затем шард каждой компании выдаётся обрезанным
+        self.assertEqual(len(pages), 2)
+
+    def test_no_split_when_number_fits_result_window(self) -> None:
+        storage = Fake_Storage(found=Search_Planner.result_window * 10)
+        truncated = set()
+
+        list(Search_Planner(storage).iter_pages("python", ["1", "2"], number=100, truncated=truncated))
+
+        self.assertEqual(len(storage.requests), 1)
+        self.assertEqual(truncated, set())
+
+    def test_answer_without_found_raises(self) -> None:
+        import requests
+
+        storage = Fake_Storage(found=None)
+
+        with self.assertRaises(requests.RequestException):
+            list(Search_Planner(storage).iter_pages("python", ["1"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,9 +1,16 @@
-from database.db_saver import DB_Saver
-from database.db_manager import DB_Manager
+from typing import TYPE_CHECKING
+
+import requests
+
 from data_storage.data_storage_hh import Data_Storage_HH
+from instrumentation.instrumentation import Instrumentation
 from mixins.user_interaction import User_Interaction_Mixin
 from utils import basic_logger
 
+if TYPE_CHECKING:
+    from database.db_saver import DB_Saver
+    from database.write_behind import Write_Behind_Queue
+
 
 class User_Interface(User_Interaction_Mixin):
     """
@@ -21,13 +28,23 @@ class User_Interface(User_Interaction_Mixin):
         """
         Инициализатор объектов класса.
 
+        Настраивает журналирование (один раз за работу программы);
         Создаёт объект для поиска и хранения данных;
-        Создаёт объект для сохранения значений в базу данных;
         Инициализирует меню
+
+        Объекты для работы с базой данных (и модули psycopg2, prettytable) создаются и загружаются
+        при первой команде, которая к ней обращается, поэтому меню появляется сразу,
+        независимо от доступности и скорости ответа базы данных
         """
 
+        Instrumentation.configure()
+
         self.data_storage_hh = Data_Storage_HH()
-        self.database = DB_Saver()
+        # объект для сохранения значений в базу данных и очередь отложенной записи (см. свойства)
+        self._database = None
+        self._write_queue = None
+        # объект режима работы с базой данных создаётся при первом входе в режим
+        self.db_manager = None
 
         # псевдоним_команды: (описание, команда)
         self.commands = {
@@ -40,6 +57,9 @@ class User_Interface(User_Interaction_Mixin):
             "add employers":
                 ("Добавить компании в список для поиска вакансий (для добавления используется id компании)",
                  self.data_storage_hh.add_employers),
+            "add employers bulk":
+                ("Добавить сразу несколько компаний: id через запятую или путь к файлу со списком id",
+                 self.data_storage_hh.add_employers_bulk),
             "show employers":
                 ("Показать список компаний, которые используются при поиске вакансий",
                  self.data_storage_hh.show_employers_info),
@@ -53,12 +73,21 @@ class User_Interface(User_Interaction_Mixin):
             "show vacancies":
                 ("Вывести на экран информацию о найденных вакансиях",
                  self.data_storage_hh.show_vacancies_info),
+            "vacancies stats":
+                ("Показать сводку по найденным вакансиям (количество по компаниям, средняя зарплата) без базы данных",
+                 self.data_storage_hh.show_vacancies_stats),
             "clear vacancies":
                 ("Очистить список найденных вакансий",
                  self.data_storage_hh.clear_vacancies),
+            "sync vacancies":
+                ("Загрузить в базу данных только новые и обновлённые с прошлой синхронизации вакансии компаний",
+                 self.sync_vacancies),
             "save to db":
-                ("Сохранить найденные вакансии и компании в базу данных",
+                ("Сохранить найденные вакансии и компании в базу данных (запись идёт в фоне)",
                  self.save_to_db),
+            "db status":
+                ("Показать состояние фоновой записи в базу данных",
+                 self.show_db_status),
             "clear db":
                 ("Очистить существующие таблицы в базе данных",
                  self.clear_db),
@@ -82,50 +111,193 @@ class User_Interface(User_Interaction_Mixin):
         while True:
             command = self.accept_command()
             if command == "exit":
+                self._close_db()
+                Instrumentation.shutdown()
                 print("\nВсего доброго! Заходите ещё!")
                 return
             self.run_command(command)
 
+    @property
+    def database(self) -> "DB_Saver":
+        """Объект для сохранения значений в базу данных, создаётся при первом обращении"""
+
+        if self._database is None:
+            from database.db_saver import DB_Saver
+            self._database = DB_Saver()
+        return self._database
+
+    @property
+    def write_queue(self) -> "Write_Behind_Queue":
+        """
+        Очередь отложенной записи: сохранение идёт в фоне, пока пользователь продолжает работу.
+        Создаётся при первом обращении
+        """
+
+        if self._write_queue is None:
+            from database.write_behind import Write_Behind_Queue
+            self._write_queue = Write_Behind_Queue(self.database)
+        return self._write_queue
+
     # команды, связанные с базой данных
     def save_to_db(self) -> None:
         """
-        Сохраняет найденные вакансии и компании в базу данных
+        Ставит найденные компании и вакансии в очередь на сохранение в базу данных.
+        Запись выполняется в фоновом потоке, ход записи показывает команда db status.
+        Если база данных недоступна, данные в очередь не ставятся
         """
 
-        self.database.save_to_db(self.table_name_employers, self.data_storage_hh.employers)
-        self.database.save_to_db(self.table_name_vacancies, self.data_storage_hh.vacancies)
+        if not self._connect_db():
+            return
+
+        self.write_queue.submit(self.table_name_employers, self.data_storage_hh.employers)
+        self.write_queue.submit(self.table_name_vacancies, self.data_storage_hh.vacancies)
+
+        print("\nДанные поставлены в очередь на сохранение в базу данных."
+              "\nМожно продолжать работу, ход записи покажет команда\033[32m db status\033[0m.")
+
+    def show_db_status(self) -> None:
+        """Выводит на экран состояние фоновой записи в базу данных"""
+
+        status = self.write_queue.get_status()
+
+        print(f"\nОжидают записи: {status['rows_pending']} строк ({status['batches_pending']} пакетов в очереди)"
+              f"\nЗаписано: {status['rows_written']} строк за {status['seconds']} с "
+              f"({status['rows_per_second']} строк/с), из них без изменений: {status['rows_unchanged']}")
+        if status["rows_failed"]:
+            print(f"\033[31mНе удалось записать: {status['rows_failed']} строк."
+                  f"\nПоследняя ошибка: {status['last_error']}\033[0m")
+
+    def sync_vacancies(self) -> None:
+        """
+        Синхронизирует базу данных с сайтом по ключевому слову: загружает только вакансии,
+        опубликованные или обновлённые с момента предыдущей синхронизации,
+        и помечает закрытыми вакансии, пропавшие с сайта (см. Incremental_Sync)
+        """
+
+        if not self.data_storage_hh.employers:
+            print("\nСначала укажите компании для поиска командой\033[32m add employers\033[0m.")
+            return
+
+        keyword = input("\nВведите название вакансии или ключевое слово для поиска:\n").lower().strip()
+        while not keyword:
+            keyword = input("\nНевозможно выполнить синхронизацию без ключевого слова."
+                            "\nПопробуйте ещё раз или введите 'stop' для отмены:\n").lower().strip()
+            if keyword == "stop":
+                return
+
+        if not self._connect_db():
+            return
+
+        from pipeline.incremental_sync import Incremental_Sync
+
+        # синхронизация изменяет те же строки, что и фоновая запись, поэтому сначала дописывается очередь
+        self._flush_write_queue()
 
-        print("\nДанные сохранены в базу данных.")
+        print("\nПодождите минутку, синхронизирую вакансии...")
+        try:
+            stats = Incremental_Sync(self.data_storage_hh, self.database).run(keyword)
+        except requests.RequestException:
+            print(self.data_storage_hh.connection_error_message)
+            return
+
+        print(f"\nНовых и обновлённых вакансий: {stats['rows_written'] - stats['rows_unchanged']}, "
+              f"без изменений: {stats['rows_unchanged']}, "
+              f"помечено закрытыми: {stats['closed']} ({stats['seconds']} с).")
+        if stats["reconciled"]:
+            print(f"Выполнена полная сверка вакансий компаний с сайтом: {stats['reconciled']}.")
+        if stats["truncated"]:
+            print(f"\033[33mСайт выдал не все найденные вакансии компаний: {stats['truncated']}."
+                  f"\nИх вакансии не помечаются закрытыми, синхронизация повторится при следующем запуске.\033[0m")
+        if stats["budget_exhausted"]:
+            print(f"{self.data_storage_hh.budget_error_message}"
+                  f"\nСинхронизация не завершена и продолжится при следующем запуске.")
 
     def clear_db(self) -> None:
-        """Удаляет все значения из таблиц базы данных"""
+        """Удаляет все значения из таблиц базы данных, предварительно дождавшись окончания фоновой записи"""
+
+        if not self._connect_db():
+            return
 
+        self._flush_write_queue()
         self.database.clear_db()
         print("\nВсе значения были удалены из таблиц.")
 
     def enter_db(self) -> None:
         """
-        Создаёт объект класса DB_Manager и вызывает его для имитации режима взаимодействия с базой данных.
+        Вызывает объект класса DB_Manager для имитации режима взаимодействия с базой данных.
         При выходе из режима работы с базой данных, предоставляет пользователю основное меню
 
-        Закрывает открытое соединение объекта класса DB_Saver, чтобы дать объекту класса DB_Manager
-        установить своё собственное соединение.
-        При выходе из режима взаимодействия с базой данных соединение DB_Manager закрывается,
-        а соединение DB_Saver возобновляется
+        Объект DB_Manager создаётся при первом входе в режим и берёт соединения из того же пула,
+        что и DB_Saver, поэтому вход в режим и выход из него не открывают новых соединений
 
-        Результаты, полученные при запросах одной сессии режима взаимодействия с базой данных
-        записываются в файл лога (logs/query_log.log)
+        Сводки запросов одной сессии режима взаимодействия с базой данных
+        (команда, количество строк и первые строки результата) записываются в файл лога (logs/query_log.log)
         """
 
-        self.database.close_connection_db()
+        if not self._connect_db():
+            return
+
+        self._flush_write_queue()
 
-        db_manager = DB_Manager()
+        if self.db_manager is None:
+            from database.db_manager import DB_Manager
+            self.db_manager = DB_Manager()
 
-        # сюда записываются результаты запросов одной сессии режима работы с базой данных
-        results = db_manager()
+        # сюда записываются сводки запросов одной сессии режима работы с базой данных
+        results = self.db_manager()
 
-        db_manager.close_connection_db()
         basic_logger(results)
 
         self.show_menu()
-        self.database.make_connection()
+
+    # Вспомогательные методы
+    def _connect_db(self) -> bool:
+        """
+        Подключается к базе данных, если подключение ещё не выполнено (при первом подключении
+        проверяется схема таблиц). Если база данных недоступна, выводит сообщение и возвращает False
+        """
+
+        import psycopg2
+
+        try:
+            self.database.pool
+        except psycopg2.OperationalError as error:
+            print(f"\n\033[31mНе удалось подключиться к базе данных: {str(error).strip()}\033[0m")
+            return False
+        return True
+
+    def _flush_write_queue(self) -> None:
+        """Дожидается записи всех данных из очереди отложенной записи в базу данных, если очередь создавалась"""
+
+        if self._write_queue is None:
+            return
+
+        if self.write_queue.get_status()["rows_pending"]:
+            print("\nДожидаюсь окончания записи данных в базу данных...")
+        self.write_queue.flush()
+
+    def _close_db(self) -> None:
+        """Дописывает очередь отложенной записи и закрывает соединения с базой данных, если они открывались"""
+
+        if self._database is None:
+            return
+
+        from database.connection_pool import Connection_Pool
+
+        self._close_write_queue()
+        Connection_Pool.close_shared()
+
+    def _close_write_queue(self) -> None:
+        """Дожидается записи всех данных из очереди в базу данных и останавливает фоновый поток"""
+
+        if self._write_queue is None:
+            return
+
+        if self.write_queue.get_status()["rows_pending"]:
+            print("\nДожидаюсь окончания записи данных в базу данных...")
+        self.write_queue.close()
+
+        status = self.write_queue.get_status()
+        if status["rows_failed"]:
+            print(f"\033[31mНе удалось записать {status['rows_failed']} строк."
+                  f"\nПоследняя ошибка: {status['last_error']}\033[0m")
@@ -1,22 +1,18 @@
 import logging
-from logging.handlers import RotatingFileHandler
 
+from instrumentation.instrumentation import Instrumentation
 
-def basic_logger(msg, level=logging.INFO, encoding="UTF-8"):
-    format = "%(asctime)s %(levelname)s %(message)s"
-    try:
-        logger = logging.getLogger(__name__)
-        logger.setLevel(level)
-        handler = RotatingFileHandler('logs/query_log.log',
-                                      maxBytes=100_000,
-                                      backupCount=1,
-                                      encoding=encoding)
-        handler.setFormatter(logging.Formatter(format))
-        logger.addHandler(handler)
-        logger.info(f"Query:{msg}")
 
-    except PermissionError as error:
-        pass
+def basic_logger(msg, level=logging.INFO):
+    """
+    Записывает в журнал сводки SQL-запросов. Журнал настраивается один раз (Instrumentation.configure),
+    записи передаются в файл фоновым потоком, каждая сводка записывается отдельной строкой
 
-    except Exception as error:
-        print(f"\033[31mОшибка логирования: {error}\033[0m")
\ No newline at end of file
+    :param msg: сводка запроса или список сводок
+    :param level: уровень записи журнала
+    """
+
+    Instrumentation.configure()
+    logger = Instrumentation.get_logger("queries")
+    for summary in (msg if isinstance(msg, list) else [msg]):
+        logger.log(level, "Query:%s", summary)